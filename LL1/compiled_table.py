@@ -0,0 +1,49 @@
+from array import array
+
+# Casilla vacía en la tabla LL(1)
+NO_PRODUCTION = -1
+
+
+class CompiledLL1Table:
+    # Tabla LL(1) lista para un parser que solo usa enteros
+    # - cells es la matriz densa [id de no terminal - primer id de no
+    #   terminal][id de terminal] -> id de producción en un solo arreglo
+    # - rows tiene las filas de cells como listas indexadas por el id
+    #   del símbolo, None en los terminales, el parser consulta
+    #   rows[tope][terminal] sin restar ni multiplicar
+    # - production_push tiene los ids del lado derecho de cada producción
+    #   ya invertidos y sin epsilon, se agregan a la pila tal cual
+    # - production_rhs tiene los mismos ids en orden para los árboles
+    # Tiene la misma consulta get que la tabla comprimida
+    def __init__(self, grammar, table):
+        self.num_terminals = grammar.get_num_terminals()
+        self.first_non_terminal_id = grammar.first_non_terminal_id
+
+        self.cells = array('i')
+        for row in grammar.get_ll_1_rows(table):
+            self.cells.extend(row)
+
+        num_terminals = self.num_terminals
+        self.rows = (None,) * self.first_non_terminal_id + tuple(
+            self.cells[start:start + num_terminals].tolist()
+            for start in range(0, len(self.cells), num_terminals)
+        )
+
+        self.production_push = get_production_push(grammar)
+        self.production_rhs = tuple(push[::-1] for push in self.production_push)
+
+    def get(self, row, col):
+        return self.cells[row * self.num_terminals + col]
+
+    # Memoria usada por el arreglo en bytes
+    def get_size(self):
+        return len(self.cells) * self.cells.itemsize
+
+
+# Ids del lado derecho de cada producción en el orden en que
+# se agregan a la pila, invertidos y sin epsilon
+def get_production_push(grammar):
+    return tuple(
+        tuple(symbol.id for symbol in reversed(production.rhs) if symbol != grammar.epsilon_symbol)
+        for production in grammar.productions
+    )
@@ -0,0 +1,152 @@
+from array import array
+
+# Posición libre en el arreglo check
+FREE = -1
+
+
+class CompressedTable:
+    # Comprime una matriz de enteros filas x columnas
+    # - Las columnas con el mismo contenido se agrupan en una clase
+    # - Cada fila puede tener un valor por defecto y solo guarda
+    #   las casillas distintas a ese valor
+    # - Las filas se empalman en un solo arreglo con desplazamiento
+    #   por fila (row displacement), check indica a qué fila
+    #   pertenece cada posición
+    # - Las filas con las mismas casillas comparten su lugar
+    # Consultar una casilla sigue siendo O(1)
+    #
+    # empty es el valor de las casillas vacías
+    # Si use_defaults es verdadero el valor más común de la fila que
+    # cumpla can_default se vuelve el valor por defecto y también
+    # ocupa las casillas vacías de esa fila
+    def __init__(self, rows, num_cols, empty, use_defaults=False, can_default=None):
+        self.num_rows = len(rows)
+        self.num_cols = num_cols
+        self.empty = empty
+
+        # Clases de equivalencia de columnas
+        self.column_class = array('i')
+        classes = {}
+        representatives = []
+
+        for col in range(num_cols):
+            key = tuple(row[col] for row in rows)
+            if key not in classes:
+                classes[key] = len(representatives)
+                representatives.append(col)
+            self.column_class.append(classes[key])
+
+        self.num_classes = len(representatives)
+
+        # Valor por defecto y casillas que hay que guardar de cada fila
+        self.default = array('i', [empty]) * self.num_rows
+        entries = []
+
+        for num, row in enumerate(rows):
+            default = empty
+
+            if use_defaults:
+                counts = {}
+                for col in representatives:
+                    value = row[col]
+                    if value != empty and (can_default is None or can_default(value)):
+                        counts[value] = counts.get(value, 0) + 1
+                if counts:
+                    default = max(counts, key=counts.get)
+
+            self.default[num] = default
+
+            # Si la fila tiene valor por defecto tampoco guardamos
+            # las casillas vacías
+            row_entries = []
+            for class_num, col in enumerate(representatives):
+                value = row[col]
+                if value != empty and value != default:
+                    row_entries.append((class_num, value))
+            entries.append(row_entries)
+
+        # Agrupamos las filas con las mismas casillas
+        # row_class indica la fila que las representa
+        self.row_class = array('i', range(self.num_rows))
+        unique_rows = {}
+        for num, row_entries in enumerate(entries):
+            key = tuple(row_entries)
+            if key in unique_rows:
+                self.row_class[num] = unique_rows[key]
+            else:
+                unique_rows[key] = num
+
+        # Acomodamos primero las filas con más casillas
+        self.base = array('i', [0]) * self.num_rows
+        self.check = array('i')
+        self.value = array('i')
+
+        order = sorted(unique_rows.values(), key=lambda num: -len(entries[num]))
+        first_free = 0
+
+        for num in order:
+            row_entries = entries[num]
+            if not row_entries:
+                continue
+
+            # Buscamos el primer desplazamiento donde quepa la fila
+            # Solo revisamos la fila completa si su primera
+            # casilla está libre
+            first_class = row_entries[0][0]
+            base = max(0, first_free - first_class)
+            while True:
+                index = base + first_class
+                if (index >= len(self.check) or self.check[index] == FREE) and self.fits(base, row_entries):
+                    break
+                base += 1
+
+            # Crecemos los arreglos si es necesario
+            end = base + row_entries[-1][0] + 1
+            if end > len(self.check):
+                grow = end - len(self.check)
+                self.check.extend(array('i', [FREE]) * grow)
+                self.value.extend(array('i', [empty]) * grow)
+
+            for class_num, value in row_entries:
+                self.check[base + class_num] = num
+                self.value[base + class_num] = value
+
+            self.base[num] = base
+
+            while first_free < len(self.check) and self.check[first_free] != FREE:
+                first_free += 1
+
+        # Las filas repetidas usan el lugar de su representante
+        for num in range(self.num_rows):
+            self.base[num] = self.base[self.row_class[num]]
+
+        # Rellenamos para que cualquier consulta quede dentro del arreglo
+        size = max(self.base, default=0) + self.num_classes
+        if size > len(self.check):
+            grow = size - len(self.check)
+            self.check.extend(array('i', [FREE]) * grow)
+            self.value.extend(array('i', [empty]) * grow)
+
+    # Verifica si las casillas de una fila caben con el desplazamiento dado
+    def fits(self, base, row_entries):
+        check = self.check
+        size = len(check)
+
+        for class_num, _ in row_entries:
+            index = base + class_num
+            if index < size and check[index] != FREE:
+                return False
+
+        return True
+
+    # Obtiene el valor de la casilla [row][col]
+    def get(self, row, col):
+        index = self.base[row] + self.column_class[col]
+        if self.check[index] == self.row_class[row]:
+            return self.value[index]
+        return self.default[row]
+
+    # Memoria usada por los arreglos en bytes
+    def get_size(self):
+        arrays = (self.column_class, self.default, self.row_class, self.base, self.check, self.value)
+        return sum(len(values) * values.itemsize for values in arrays)
@@ -0,0 +1,395 @@
+from array import array
+from parse_tree import ParseTree
+
+# Siguiente símbolo de un item completo
+NO_SYMBOL = -1
+
+# Marca de una cadena de Leo que se está recorriendo
+LEO_PENDING = (-1, -1)
+
+# Razón por la que se agregó un item a un conjunto, se guarda
+# la primera como (razón, item anterior, item hijo)
+# - LINK_PREDICT: item con el punto al inicio, no tiene hijos
+# - LINK_SCAN: se leyó un terminal, el anterior está en el conjunto previo
+# - LINK_COMPLETE: se completó el hijo en este conjunto, el anterior
+#   está en el conjunto de origen del hijo
+# - LINK_NULLABLE: se saltó un no terminal anulable, el anterior está
+#   en este conjunto
+# - LINK_LEO: item más alto de la cadena de Leo del hijo
+LINK_PREDICT = 0
+LINK_SCAN = 1
+LINK_COMPLETE = 2
+LINK_NULLABLE = 3
+LINK_LEO = 4
+
+# Partes de un hijo pendiente en la reconstrucción del árbol
+CHILD_TERMINAL = 0
+CHILD_ITEM = 1
+CHILD_NULL = 2
+CHILD_LEO = 3
+
+
+class EarleyParser:
+    # Parser de Earley para cualquier gramática libre de contexto
+    # Usa las producciones, la tabla de símbolos y los anulables
+    # de la gramática, no necesita tabla
+    # - Cada item (producción, punto) es un entero y cada conjunto
+    #   de Earley es un arreglo plano de pares (item, origen)
+    # - Los no terminales anulables se saltan al predecirlos
+    #   (Aycock y Horspool), no hay que completar items vacíos
+    # - Las cadenas de completados de la recursión derecha se
+    #   sustituyen por el item más alto (Leo), así la recursión
+    #   derecha es lineal
+    # - Cada item guarda la primera razón por la que se agregó,
+    #   el árbol se reconstruye siguiendo esas ligas
+    # Si la gramática está aumentada con S' := S$ se agrega $ a la entrada
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.first_non_terminal_id = grammar.first_non_terminal_id
+        self.start_id = grammar.start_symbol.id
+        self.eof_id = grammar.eof_symbol.id
+        # Solo las gramáticas aumentadas esperan $
+        self.append_eof = bool(grammar.get_symbol_occurrences(grammar.eof_symbol))
+
+        nullable = grammar.analyze().nullable
+        epsilon_id = grammar.epsilon_symbol.id
+
+        # Datos de cada item indexados por su id
+        # El item E := a.Rb es el primer item de su producción más el punto
+        self.next_symbol = array('i')
+        self.item_lhs = array('i')
+        self.item_production = array('i')
+        self.item_dot = array('i')
+        # Primer item de cada producción
+        self.production_item = array('i')
+
+        for production in grammar.productions:
+            rhs = [symbol.id for symbol in production.rhs if symbol.id != epsilon_id]
+            self.production_item.append(len(self.next_symbol))
+
+            for dot in range(len(rhs) + 1):
+                self.next_symbol.append(rhs[dot] if dot < len(rhs) else NO_SYMBOL)
+                self.item_lhs.append(production.lhs.id)
+                self.item_production.append(production.id)
+                self.item_dot.append(dot)
+
+        self.num_items = len(self.next_symbol)
+
+        # id de no terminal -> primeros items de sus producciones
+        self.predictions = {}
+        for production in grammar.productions:
+            self.predictions.setdefault(production.lhs.id, []).append(self.production_item[production.id])
+
+        self.nullable = frozenset(nullable)
+
+        # id de no terminal anulable -> lado derecho de una derivación
+        # vacía, solo usa anulables resueltos antes así que no tiene ciclos
+        self.null_rhs = {}
+        changed = True
+        while changed:
+            changed = False
+            for production in grammar.productions:
+                lhs_id = production.lhs.id
+                rhs = tuple(symbol.id for symbol in production.rhs if symbol.id != epsilon_id)
+                if lhs_id not in self.null_rhs and all(id in self.null_rhs for id in rhs):
+                    self.null_rhs[lhs_id] = rhs
+                    changed = True
+
+    # Obtiene el id de terminal de un token
+    def get_token_id(self, token):
+        if isinstance(token, int):
+            return token
+        if isinstance(token, tuple):
+            return token[0]
+        return token.id
+
+    # Construye los conjuntos de Earley de la entrada
+    # Regresa (conjuntos, ligas, items en espera, ids de los tokens)
+    # - ligas: por conjunto un arreglo plano (razón, anterior, hijo)
+    #   paralelo a los pares (item, origen)
+    # - items en espera: por conjunto id de no terminal ->
+    #   [(item, origen, índice en el conjunto)]
+    # Si leo es falso se agregan todos los items completos
+    def build_sets(self, tokens, leo=True):
+        token_ids = [self.get_token_id(token) for token in tokens]
+        if self.append_eof:
+            token_ids.append(self.eof_id)
+
+        next_symbol = self.next_symbol
+        item_lhs = self.item_lhs
+        predictions = self.predictions
+        nullable = self.nullable
+        first_non_terminal_id = self.first_non_terminal_id
+        start_id = self.start_id
+        num_items = self.num_items
+        size = len(token_ids)
+
+        # Conjuntos como arreglos planos [item, origen, item, origen, ...]
+        sets = [array('i') for _ in range(size + 1)]
+        # Primera razón de cada item [razón, anterior, hijo, ...]
+        links = [array('i') for _ in range(size + 1)]
+        # Pares ya agregados de cada conjunto, item + origen * num_items
+        seen = [set() for _ in range(size + 1)]
+        # Items que esperan un no terminal en cada conjunto
+        # id de no terminal -> [(item, origen, índice)]
+        waiting = [None] * (size + 1)
+        # Items más altos de Leo en cada conjunto
+        # id de no terminal -> (item, origen) o None
+        leo_items = [None] * (size + 1)
+
+        def add(position, item, origin, link, previous, child):
+            key = item + origin * num_items
+            if key not in seen[position]:
+                seen[position].add(key)
+                items = sets[position]
+                items.append(item)
+                items.append(origin)
+                record = links[position]
+                record.append(link)
+                record.append(previous)
+                record.append(child)
+
+        # Item más alto de la cadena de Leo de un no terminal en un
+        # conjunto terminado, None si no es determinista
+        # Cada par (conjunto, símbolo) se marca antes de seguir la cadena,
+        # si la cadena regresa a un par marcado es un ciclo, por ejemplo
+        # S := A S con A anulable, y no se usa Leo en ninguno de sus pares
+        def get_leo_item(position, symbol_id):
+            chain = []
+            result = None
+            cycle = False
+
+            while True:
+                memo = leo_items[position]
+                if memo is None:
+                    memo = leo_items[position] = {}
+                elif symbol_id in memo:
+                    result = memo[symbol_id]
+                    cycle = result is LEO_PENDING
+                    break
+
+                # Un solo item espera al símbolo y el símbolo es el último
+                # El símbolo inicial en 0 también lo espera la aceptación
+                candidates = waiting[position].get(symbol_id, ())
+                if len(candidates) != 1 or next_symbol[candidates[0][0] + 1] != NO_SYMBOL or (position == 0 and symbol_id == start_id):
+                    memo[symbol_id] = None
+                    break
+
+                memo[symbol_id] = LEO_PENDING
+                item, origin, _ = candidates[0]
+                chain.append((position, symbol_id, (item + 1, origin)))
+                position = origin
+                symbol_id = item_lhs[item]
+
+            if cycle:
+                result = None
+
+            # Cada eslabón apunta al más alto de la cadena
+            for position, symbol_id, own in reversed(chain):
+                if result is None and not cycle:
+                    result = own
+                leo_items[position][symbol_id] = result
+
+            return result
+
+        # El conjunto inicial predice el símbolo inicial
+        for production_item in predictions.get(self.start_id, ()):
+            add(0, production_item, 0, LINK_PREDICT, -1, -1)
+
+        for position in range(size + 1):
+            items = sets[position]
+            position_waiting = waiting[position] = {}
+            predicted = set()
+            token_id = token_ids[position] if position < size else NO_SYMBOL
+            index = 0
+
+            while index < len(items):
+                item = items[index]
+                origin = items[index + 1]
+                entry = index >> 1
+                index += 2
+                symbol_id = next_symbol[item]
+
+                # Completar, los items vacíos ya se saltaron al predecir
+                if symbol_id == NO_SYMBOL:
+                    if origin == position:
+                        continue
+
+                    lhs_id = item_lhs[item]
+                    if leo:
+                        top = get_leo_item(origin, lhs_id)
+                        if top is not None:
+                            add(position, top[0], top[1], LINK_LEO, -1, entry)
+                            continue
+
+                    for waiting_item, waiting_origin, waiting_entry in waiting[origin].get(lhs_id, ()):
+                        add(position, waiting_item + 1, waiting_origin, LINK_COMPLETE, waiting_entry, entry)
+
+                # Predecir
+                elif symbol_id >= first_non_terminal_id:
+                    position_waiting.setdefault(symbol_id, []).append((item, origin, entry))
+
+                    if symbol_id not in predicted:
+                        predicted.add(symbol_id)
+                        for production_item in predictions.get(symbol_id, ()):
+                            add(position, production_item, position, LINK_PREDICT, -1, -1)
+
+                    # Aycock y Horspool
+                    if symbol_id in nullable:
+                        add(position, item + 1, origin, LINK_NULLABLE, entry, -1)
+
+                # Leer
+                elif symbol_id == token_id:
+                    add(position + 1, item + 1, origin, LINK_SCAN, entry, -1)
+
+            # Ya no hay items que continúen
+            if position < size and not sets[position + 1]:
+                raise SyntaxError(f"Parsing incorrecto: no se esperaba {self.grammar.symbols_by_id[token_id].name} en la posición {position}")
+
+        return sets, links, waiting, token_ids
+
+    # Índice en el último conjunto del item completo del símbolo
+    # inicial desde el origen 0, None si no existe
+    def find_accepting_item(self, sets):
+        items = sets[-1]
+        for index in range(0, len(items), 2):
+            item = items[index]
+            if items[index + 1] == 0 and self.next_symbol[item] == NO_SYMBOL and self.item_lhs[item] == self.start_id:
+                return index >> 1
+        return None
+
+    # Indica si la secuencia de tokens pertenece al lenguaje
+    # Lanza SyntaxError con la posición si no pertenece
+    def recognize(self, tokens):
+        sets, _, _, _ = self.build_sets(tokens)
+
+        if self.find_accepting_item(sets) is None:
+            raise SyntaxError("Parsing incorrecto: la entrada terminó antes de completar el símbolo inicial")
+        return True
+
+    # Parsea la secuencia de tokens y regresa el árbol de una derivación
+    # Los conjuntos se construyen con Leo, el árbol expande las cadenas
+    def parse(self, tokens):
+        sets, links, waiting, token_ids = self.build_sets(tokens)
+        entry = self.find_accepting_item(sets)
+
+        if entry is None:
+            raise SyntaxError("Parsing incorrecto: la entrada terminó antes de completar el símbolo inicial")
+
+        return self.build_tree(sets, links, waiting, entry)
+
+    # Eslabones de la cadena de Leo de un item completo hasta el item
+    # más alto (item, origen) en el orden en que se recorrieron
+    # Cada eslabón es (item en espera, origen, conjunto, índice)
+    def get_leo_chain(self, sets, waiting, position, entry, top_item, top_origin):
+        item_lhs = self.item_lhs
+        items = sets[position]
+        symbol_id = item_lhs[items[2 * entry]]
+        origin = items[2 * entry + 1]
+        chain = []
+
+        while True:
+            waiting_item, waiting_origin, waiting_entry = waiting[origin][symbol_id][0]
+            chain.append((waiting_item, waiting_origin, origin, waiting_entry))
+            if waiting_item + 1 == top_item and waiting_origin == top_origin:
+                return chain
+            origin = waiting_origin
+            symbol_id = item_lhs[waiting_item]
+
+    # Hijos de un item siguiendo sus ligas hasta el inicio de su
+    # producción, de izquierda a derecha
+    # Cada hijo es (parte, símbolo o conjunto, inicio o índice, fin)
+    def get_item_children(self, sets, links, position, entry):
+        next_symbol = self.next_symbol
+        children = []
+
+        while True:
+            record = links[position]
+            link = record[3 * entry]
+            previous = record[3 * entry + 1]
+            child = record[3 * entry + 2]
+            item = sets[position][2 * entry]
+
+            if link == LINK_PREDICT:
+                break
+
+            if link == LINK_SCAN:
+                children.append((CHILD_TERMINAL, next_symbol[item - 1], position - 1, position))
+                position -= 1
+            elif link == LINK_COMPLETE:
+                children.append((CHILD_ITEM, position, child, None))
+                position = sets[position][2 * child + 1]
+            else:
+                children.append((CHILD_NULL, next_symbol[item - 1], position, position))
+
+            entry = previous
+
+        children.reverse()
+        return children
+
+    # Reconstruye el árbol de la derivación de arriba hacia abajo
+    # con las ligas de los items, cada liga apunta a un item que se
+    # agregó antes así que el árbol siempre es finito
+    # Los items de Leo se expanden en los items de su cadena
+    def build_tree(self, sets, links, waiting, root_entry):
+        item_lhs = self.item_lhs
+        null_rhs = self.null_rhs
+
+        tree = ParseTree(self.grammar.symbols_by_id)
+        end = len(sets) - 1
+        tree.root_id = tree.add_node(self.start_id, 0, end)
+        pending = [(tree.root_id, (CHILD_ITEM, end, root_entry, None))]
+
+        while pending:
+            node, (part, first, second, third) = pending.pop()
+
+            if part == CHILD_NULL:
+                # Derivación vacía del símbolo en la posición
+                children = [(CHILD_NULL, symbol_id, second, second) for symbol_id in null_rhs[first]]
+
+            elif part == CHILD_ITEM:
+                position, entry = first, second
+                items = sets[position]
+                if links[position][3 * entry] != LINK_LEO:
+                    children = self.get_item_children(sets, links, position, entry)
+                else:
+                    # El hijo completo empieza la cadena hasta este item
+                    child = links[position][3 * entry + 2]
+                    chain = self.get_leo_chain(sets, waiting, position, child, items[2 * entry], items[2 * entry + 1])
+                    part, first, second, third = CHILD_LEO, (chain, position, child), len(chain) - 1, None
+
+            if part == CHILD_LEO:
+                # Eslabón de la cadena de Leo, su último hijo es el eslabón
+                # anterior o el item completo que empezó la cadena
+                chain, position, child = first
+                waiting_item, _, waiting_position, waiting_entry = chain[second]
+                children = self.get_item_children(sets, links, waiting_position, waiting_entry)
+                if second > 0:
+                    children.append((CHILD_LEO, first, second - 1, None))
+                else:
+                    children.append((CHILD_ITEM, position, child, None))
+
+            ids = []
+            for child in children:
+                child_part = child[0]
+                if child_part == CHILD_TERMINAL:
+                    ids.append(tree.add_node(child[1], child[2], child[3]))
+                    continue
+
+                if child_part == CHILD_ITEM:
+                    items = sets[child[1]]
+                    symbol_id = item_lhs[items[2 * child[2]]]
+                    start, child_end = items[2 * child[2] + 1], child[1]
+                elif child_part == CHILD_NULL:
+                    symbol_id, start, child_end = child[1], child[2], child[3]
+                else:
+                    chain, position, _ = child[1]
+                    waiting_item, waiting_origin, _, _ = chain[child[2]]
+                    symbol_id, start, child_end = item_lhs[waiting_item], waiting_origin, position
+
+                id = tree.add_node(symbol_id, start, child_end)
+                ids.append(id)
+                pending.append((id, child))
+            tree.set_children(node, ids)
+
+        return tree
@@ -1,26 +1,80 @@
 from symbol_grammar import Symbol
 from production import Production
+from grammar_analysis import GrammarAnalysis
+from lexer import Lexer
 
+# Identificadores reservados en la tabla de símbolos
+# $ y epsilon siempre ocupan los primeros lugares
+EOF_ID = 0
+EPSILON_ID = 1
     
 class Grammar:
     def __init__(self, terminal_symbols, non_terminal_symbols, start_symbol, productions):
-        self.terminal_symbols = [Symbol(t, True) for t in terminal_symbols]
-        self.non_terminal_symbols = [Symbol(t, False) for t in non_terminal_symbols]
+        # Tabla de símbolos nombre -> Symbol
+        self.symbols = {}
+        # Tabla de símbolos id -> Symbol
+        self.symbols_by_id = []
+        # Primer id de los no terminales, se fija al terminar
+        # de registrar los terminales
+        self.first_non_terminal_id = None
+
+        # Registramos $ y epsilon con sus identificadores reservados
+        self.eof_symbol = self.add_symbol('$', True)
+        self.epsilon_symbol = self.add_symbol('epsilon', False)
+
+        # Primero los terminales y después los no terminales
+        self.terminal_symbols = [self.add_symbol(t, True) for t in terminal_symbols]
+        self.first_non_terminal_id = len(self.symbols_by_id)
+        self.non_terminal_symbols = [self.add_symbol(t, False) for t in non_terminal_symbols]
         self.start_symbol = self.find_in_simbols(start_symbol)
-        # Creamos el símbolo epsilon para utilizarlo después
-        self.non_terminal_symbols.append(Symbol('epsilon', False))
+        # Agregamos el símbolo epsilon para utilizarlo después
+        self.non_terminal_symbols.append(self.epsilon_symbol)
         self.productions = self.get_production_from_string(productions)
+        # Índices de producciones por lado izquierdo y derecho
+        self.index_productions()
         self.first_sets = {}
         self.follow_sets = {}
-    
+        # Análisis de anulables, FIRST y FOLLOW
+        self.analysis = None
+        # Analizador léxico de los terminales
+        self.lexer = Lexer(self)
+
+    # Registra un símbolo en la tabla de símbolos y le asigna
+    # el siguiente identificador entero
+    # Si el símbolo ya existe regresa el mismo objeto
+    def add_symbol(self, name, is_terminal):
+        symbol = self.symbols.get(name)
+
+        if symbol is not None:
+            if symbol.is_terminal != is_terminal:
+                raise ValueError(f"Error: el símbolo {name} ya existe con otro tipo")
+            return symbol
+
+        # Los terminales deben tener identificadores menores
+        # a los de los no terminales
+        if is_terminal and self.first_non_terminal_id is not None:
+            raise ValueError(f"Error: no se puede agregar el terminal {name} después de los no terminales")
+
+        symbol = Symbol(name, is_terminal, len(self.symbols_by_id))
+        self.symbols[name] = symbol
+        self.symbols_by_id.append(symbol)
+        return symbol
+
     # Busca un símbolo de la gramática por su nombre
     # Si existe regresa tal símbolo, sino regresa None
     def find_in_simbols(self, name):
-        for symbol in self.terminal_symbols + self.non_terminal_symbols:
-            if symbol.name == name:
-                return symbol
-        return None        
-    
+        return self.symbols.get(name)
+
+    # Busca un símbolo de la gramática por su identificador
+    def get_symbol_by_id(self, id):
+        return self.symbols_by_id[id]
+
+    # Número de identificadores usados por terminales,
+    # incluyendo $ y epsilon
+    # Útil para construir conjuntos y tablas indexadas por id
+    def get_num_terminals(self):
+        return self.first_non_terminal_id
+
     # Aumenta la gramatica añadiendo S'
     # como símbolo inicial
     # y la producción S' -> S
@@ -41,7 +95,7 @@ class Grammar:
                 symbol_exists = False
 
         # Creamos el símbolo 
-        new_symbol = Symbol(new_symbol_name, False)
+        new_symbol = self.add_symbol(new_symbol_name, False)
         self.non_terminal_symbols.insert(0, new_symbol)
 
         # Añadimos $
@@ -56,12 +110,15 @@ class Grammar:
         # Actualizamos el símbolo inicial
         self.start_symbol = new_symbol
 
+        # Actualizamos los índices de producciones
+        self.index_productions()
+
     # Añade el símbolo $ a la gramática
     # Útil para los parsers
     def add_eof_symbol(self):
-        new_symbol = Symbol('$', is_terminal=True)
-        self.terminal_symbols.append(new_symbol)
-        return new_symbol
+        if self.eof_symbol not in self.terminal_symbols:
+            self.terminal_symbols.append(self.eof_symbol)
+        return self.eof_symbol
     
     # Dado un conjunto de cadenas del estilo "E := F t"
     # crea un objeto de Production para cada cadena
@@ -107,7 +164,7 @@ class Grammar:
             if recursive_productions:
                 # Crea E'
                 new_symbol_name = f"{symbol.name}'"
-                new_symbol = Symbol(new_symbol_name, False)
+                new_symbol = self.add_symbol(new_symbol_name, False)
                 self.non_terminal_symbols.append(new_symbol)                
                 
                 # Crear producciones E := beta E'
@@ -119,7 +176,7 @@ class Grammar:
                     new_productions.append(Production(new_symbol, rec_prod + [new_symbol]))        
 
                 # Agregamos la producción vacía E' := epsilon
-                new_productions.append(Production(new_symbol, [self.find_in_simbols('epsilon')]))
+                new_productions.append(Production(new_symbol, [self.epsilon_symbol]))
             
             else:
                 # Si no hay recursión izquierda mantenemos las mismas producciones
@@ -129,205 +186,116 @@ class Grammar:
         # Actualizamos la gramatica
         self.productions = new_productions
 
+        # Actualizamos los índices de producciones
+        self.index_productions()
+
+    # Construye los índices de producciones de la gramática
+    # - productions_by_lhs: id de símbolo -> producciones con el símbolo a la izquierda
+    # - productions_by_rhs: id de símbolo -> producciones con el símbolo a la derecha
+    # - rhs_occurrences: id de símbolo -> pares (producción, posición) donde aparece
+    # También enumera las producciones en el orden de la gramática
+    def index_productions(self):
+        # Los conjuntos calculados dejan de ser válidos
+        self.analysis = None
+
+        self.productions_by_lhs = {}
+        self.productions_by_rhs = {}
+        self.rhs_occurrences = {}
+
+        for num, production in enumerate(self.productions):
+            production.id = num
+            self.productions_by_lhs.setdefault(production.lhs.id, []).append(production)
+
+            for position, symbol in enumerate(production.rhs):
+                occurrences = self.rhs_occurrences.setdefault(symbol.id, [])
+                # Agregamos la producción una sola vez aunque
+                # el símbolo aparezca varias veces
+                if not occurrences or occurrences[-1][0] is not production:
+                    self.productions_by_rhs.setdefault(symbol.id, []).append(production)
+                occurrences.append((production, position))
+
     # Obtiene todas las producciones que tienen un símbolo E
     # en su lado izquierdo "E := ft"
     def get_productions_by_symbol_lhs(self, symbol):
-        
-        productions = []
-
-        for production in self.productions:
-            if symbol == production.lhs:
-                productions.append(production)
-
-        return productions
+        return self.productions_by_lhs.get(symbol.id, [])
     
     # Obtiene todas las producciones que tienen un símbolo E
-    # en su lado izquierdo "R := fE"
+    # en su lado derecho "R := fE"
+    # Cada producción aparece una sola vez
     def get_productions_by_symbol_rhs(self, symbol):
-        
-        productions = []
-
-        for production in self.productions:
-            rhs = production.rhs
-
-            for curr_symbol in rhs:
-                if symbol == curr_symbol:
-                    productions.append(production)
-
-        return productions
-
-    # Aplica el algoritmo para encontrar el conjunto FIRST de
-    # un símbolo no terminal
-    def get_first_set_symbol(self, symbol, visited=None):
-
-        # Creamos la lista visitados si no se ha visitado
-        # a nadie
-        if visited is None:
-            visited = set()        
-        
-        # Si el símbolo está en visitados terminamos recursión
-        if symbol in visited:
-            return set()
-
-        # Si no ha sido visitado lo agregamos a visitados
-        visited.add(symbol)        
-
-        # Si ya hemos calculado el conjunto FIRST del símbolo
-        # regresamos el conjunto y quitamos el símbolo de
-        # visitados
-        if self.first_sets[symbol]:
-            visited.remove(symbol)
-            return self.first_sets[symbol]
-        
-        # Creamos el conjunto FIRST
-        first_set = set()
-
-        # Obtenemos todos las producciones que contienen el
-        # símbolo en su lado izquierdo
-        productions_with_symbol = self.get_productions_by_symbol_lhs(symbol)
-
-        # Procesamos cada producción
-        for production in productions_with_symbol:
-                # Obtenemos su lado derecho
-                rhs = production.rhs
-                # Si es un símbolo terminal o epsilon 
-                # lo añadimos al conjunto FIRST
-                if rhs[0].is_terminal or rhs[0].name == 'epsilon':
-                    first_set.add(production.rhs[0])
-                else:
-                    # Si no hacemos recursión con el FIRST
-                    # del símbolo no terminal
-                    first_set.update(self.get_first_set_symbol(rhs[0], visited))
-        
-        # Eliminamos el simbolo
-        # de visitados
-        visited.remove(symbol)
-
-        # Actualizamos el conjunto correspondiente de la gramática
-        self.first_sets[symbol] = first_set
-
-        # Devolvemos el conjunto para la
-        # ejecución correcta de la recursión
-        return first_set
+        return self.productions_by_rhs.get(symbol.id, [])
+
+    # Obtiene los pares (producción, posición) donde el símbolo
+    # aparece en el lado derecho "R := fE" -> (R := fE, 1)
+    def get_symbol_occurrences(self, symbol):
+        return self.rhs_occurrences.get(symbol.id, [])
+
+    # Calcula los símbolos anulables y los conjuntos FIRST y FOLLOW
+    # de la gramática como bitsets sobre los ids de los terminales
+    # Solo se recalcula si cambiaron las producciones
+    def analyze(self):
+        if self.analysis is None:
+            self.analysis = GrammarAnalysis(self)
+        return self.analysis
+
+    # Indica si un símbolo puede derivar epsilon
+    def is_nullable(self, symbol):
+        return symbol.id in self.analyze().nullable
+
+    # Obtiene el conjunto FIRST de un símbolo
+    def get_first_set_symbol(self, symbol):
+        analysis = self.analyze()
+        return analysis.bits_to_symbols(analysis.get_first_bits(symbol))
+
+    # Obtiene el conjunto FIRST de una secuencia de símbolos
+    # Contiene epsilon si toda la secuencia es anulable
+    def get_first_set_sequence(self, symbols):
+        analysis = self.analyze()
+        return analysis.bits_to_symbols(analysis.get_first_bits_sequence(symbols))
 
     # Obtiene el conjunto FIRST de todos los símbolos no terminales
     # de la gramática
-    def get_first_set(self):        
-        # Creamos los conjuntos FIRST vacíos
-        for symbol in self.non_terminal_symbols:
-            if symbol != self.find_in_simbols('epsilon'):
-                self.first_sets[symbol] = []
-                
-        # Calculamos los conjuntos FIRST
-        for symbol in self.non_terminal_symbols:
-            if symbol.name != 'epsilon':
-                self.get_first_set_symbol(symbol)
-    
-    # Aplica el algoritmo para encontrar el conjunto FOLLOW de
-    # un símbolo no terminal
-    def get_follow_set_symbol(self, symbol, visited=None):
-        
-        # Creamos la lista visitados si no se ha visitado
-        # a nadie
-        if visited is None:
-            visited = set()
-        
-        # Si el símbolo está en visitados terminamos recursión
-        if symbol in visited:
-            return set()
-        
-        # Si no ha sido visitado lo agregamos a visitados
-        visited.add(symbol)
-
-        # Si ya hemos calculado el conjunto FOLLOW del símbolo
-        # regresamos el conjunto y quitamos el símbolo de
-        # visitados
-        if self.follow_sets[symbol]:
-            visited.remove(symbol)
-            return self.follow_sets[symbol]
-        
-        # Creamos el conjunto FIRST
-        follow_set = set()
+    def get_first_set(self):
+        analysis = self.analyze()
+        self.first_sets = {}
 
-        # Verificamos el símbolo inicial
-        if symbol == self.start_symbol:            
-            # Verificamos si ya existe el FOLLOW del símbolo inicial
-            start_follow = self.follow_sets[symbol]
-            
-            if not start_follow:
-                # Si no existe agregamos el símbolo $
-                # y lo agregamos a FOLLOW(S)
-                eof_symbol = self.add_eof_symbol()
-                follow_set.add(eof_symbol)
-
-        # Obtenemos todos las producciones que contienen el
-        # símbolo en su lado derecho
-        productions_with_symbol = self.get_productions_by_symbol_rhs(symbol)
-
-        # Procesamos cada producción
-        for production in productions_with_symbol:
-            # obtenemos su lado derecho
-            rhs = production.rhs
-
-            # Iteramos sobre los símbolos del lado derecho
-            for i in range(len(rhs)):
-                # Simbolo a calcular FOLLOW E'
-                if rhs[i] == symbol:
-                    # ¿E := TSE'?
-                    if i == len(rhs) - 1:
-                        # Si está al final de la producción agregamos
-                        # FOLLOW de E
-                        lhs_follow_set = self.get_follow_set_symbol(production.lhs, visited)
-                        follow_set.update(lhs_follow_set)
-                    else:
-                        # Verificamos el símbolo que sigue de E'
-                        next_symbol = rhs[i + 1]
-                        # ¿E := TSE'a?
-                        if next_symbol.is_terminal:
-                            # Si es un terminal lo añadimos a su FOLLOW
-                            follow_set.add(next_symbol)
-                        # ¿E := TSE'R?
-                        else:
-                            # Si sigue un símbolo no terminal obtenemos el
-                            # FIRST del siguiente simbolo
-                            next_symbol = rhs[i + 1]
-                            next_symbol_first_set = self.first_sets[next_symbol]
-                            epsilon_symbol = self.find_in_simbols('epsilon')
-
-                            # Agregamos todos los símbolos de FIRST al FOLLOW
-                            for curr_symbol in next_symbol_first_set:
-                                if curr_symbol != epsilon_symbol:
-                                    follow_set.add(curr_symbol)
-                            
-                            # Si el símbolo es anulable hacemos recursión
-                            # sobre el símbolo siguiente y lo añadimos a FOLLOW
-                            if epsilon_symbol in next_symbol_first_set:
-                                follow_set.update(self.get_follow_set_symbol(next_symbol, visited))
-        # Eliminamos el simbolo
-        # de visitados
-        visited.remove(symbol)
-        
-        # Actualizamos el conjunto correspondiente de la gramática
-        self.follow_sets[symbol] = follow_set
+        for symbol in analysis.get_non_terminals():
+            self.first_sets[symbol] = analysis.bits_to_symbols(analysis.first_bits[symbol.id])
 
-        # Devolvemos el conjunto para la
-        # ejecución correcta de la recursión
-        return follow_set
+    # Obtiene el conjunto FOLLOW de un símbolo no terminal
+    def get_follow_set_symbol(self, symbol):
+        analysis = self.analyze()
+        return analysis.bits_to_symbols(analysis.follow_bits.get(symbol.id, 0))
 
     # Obtiene el conjunto FOLLOW de todos los símbolos no terminales
     # de la gramática
     def get_follow_set(self):
-        # Creamos los conjuntos FOLLOW vacíos
-        for symbol in self.non_terminal_symbols: 
-            if symbol != self.find_in_simbols('epsilon'):
-                self.follow_sets[symbol] = set()
-        
-        # Obtenemos el conjunto FOLLOW de cada símbolo
-        # excepto epsilon
-        for symbol in self.non_terminal_symbols:
-            if symbol.name != 'epsilon':
-                self.get_follow_set_symbol(symbol)
+        # FOLLOW(S) contiene $
+        self.add_eof_symbol()
+
+        analysis = self.analyze()
+        self.follow_sets = {}
+
+        for symbol in analysis.get_non_terminals():
+            self.follow_sets[symbol] = analysis.bits_to_symbols(analysis.follow_bits[symbol.id])
     
+    # Crea un parser de Earley para la gramática, acepta cualquier
+    # gramática libre de contexto aunque tenga conflictos
+    # El módulo se importa aquí para que Grammar no dependa de él
+    def get_earley_parser(self):
+        from earley_parser import EarleyParser
+        return EarleyParser(self)
+
+    # Genera los tokens de un texto con el analizador léxico
+    # como tuplas (id de terminal, posición inicial, lexema)
+    def tokenize(self, text):
+        return self.lexer.tokenize(text)
+
+    # Convierte un texto en la lista de símbolos terminales
+    # que reciben los parsers
+    def get_symbols_from_string(self, text):
+        return [self.symbols_by_id[terminal_id] for terminal_id, _, _ in self.lexer.tokenize(text)]
+
     # Imprime el objeto de una forma presentable
     def __repr__(self) -> str:
         output = (
@@ -1,13 +1,31 @@
-import copy, re, csv
+from array import array
 from grammar import Grammar
+from compressed_table import CompressedTable
+from trace_sink import CsvTraceSink, BinaryTraceSink
+from parse_trace import ParseTrace, TRACE_FULL
+from parse_tree import ParseTree, NO_NODE
+from semantic_actions import SemanticActions
+from stream_parser import LL1StreamParser
+from compiled_table import CompiledLL1Table, NO_PRODUCTION, get_production_push
+from table_cache import get_grammar_fingerprint, get_cache_path, save_tables, load_tables, restore_grammar
+
+# Directorio donde se guardan las tablas compiladas
+DEFAULT_CACHE_DIR = '__tablecache__'
 
 class GrammarLL1(Grammar):
 
+    # Olvida la tabla compilada cada vez que cambian las producciones
+    def index_productions(self):
+        super().index_productions()
+        # Diccionario con el que se compiló compiled_table
+        self.compiled_source = None
+        self.compiled_table = None
+
     # Construye la tabla de parsing LL(1)
     def construct_ll_1_table(self):
         # Guardamos la gramática original para utilizarla
         # en el archivo de la salida
-        original_grammar = copy.deepcopy(self)
+        original_grammar = str(self)
 
         # Eliminamos recursion izquierda
         self.remove_left_recursion()
@@ -16,6 +34,7 @@ class GrammarLL1(Grammar):
         # símbolo no terminal
         self.get_first_set()
         self.get_follow_set()
+        analysis = self.analyze()
 
         # Creamos la tabla como un diccionario
         table = {}
@@ -40,35 +59,20 @@ class GrammarLL1(Grammar):
 
                 # Procesamos cada producción
                 for production in productions_with_symbol:
-                    # Obtenemos su lado derecho
-                    rhs = production.rhs
-                    # Obtenemos el primer símbolo
-                    # del lado derecho
-                    first_symbol = rhs[0]
-                    
-                    if first_symbol.is_terminal:
-                        # Si es terminal llenamos [E,t] con la
-                        # producción correspondiente
-                        table[symbol][first_symbol] = production
-                    elif first_symbol.name == 'epsilon':
-                        # Si es una producción E := epsilon
-                        # obtenemos FOLLOW del símbolo
-                        follow_symbol = self.follow_sets[symbol]
-                        
-                        # Y llenamos [E,t_i] con la producción correspondiente
-                        # donde t_i pertenece a FOLLOW(E)
-                        for curr_symbol in follow_symbol:
+                    # Obtenemos FIRST de todo su lado derecho
+                    # E := R alpha -> FIRST(R alpha)
+                    first_bits = analysis.get_first_bits_sequence(production.rhs)
+
+                    # Llenamos en [E,t_i] con la producción correspondiente
+                    # donde t_i pertenece a FIRST(R alpha) excepto epsilon
+                    for curr_symbol in analysis.bits_to_symbols(first_bits & ~analysis.epsilon_bit):
+                        table[symbol][curr_symbol] = production
+
+                    # Si el lado derecho es anulable, E := epsilon,
+                    # llenamos [E,t_i] donde t_i pertenece a FOLLOW(E)
+                    if first_bits & analysis.epsilon_bit:
+                        for curr_symbol in analysis.bits_to_symbols(analysis.follow_bits[symbol.id]):
                             table[symbol][curr_symbol] = production
-                    else:
-                        # Si es una producción E := R alpha
-                        # Obtenemos FIRST(R)
-                        first_next = self.first_sets[first_symbol]
-
-                        # Llenamos en [E,t_i] con la producción correspondiente
-                        # donde t_i pertenece a FOLLOW(e) excepto epsilon
-                        for curr_symbol in first_next:
-                            if curr_symbol.name != 'epsilon':
-                                table[symbol][curr_symbol] = production
         
         # Guardamos los resultados en un
         # archivo para poder leer mejor
@@ -77,7 +81,7 @@ class GrammarLL1(Grammar):
         with open(file_name, 'w', encoding='utf-8') as file:
             file.write('Gramatica original')
             file.write("\n" + "\n")
-            file.write(str(original_grammar))
+            file.write(original_grammar)
             file.write("\n" + "\n")
             file.write('Gramatica sin recursion izquierda')
             file.write("\n" + "\n")
@@ -99,117 +103,296 @@ class GrammarLL1(Grammar):
         
         return table
 
-    def parse_ll_1_string(self, input, table):
+    # Comprime la tabla LL(1) como una matriz de ids de producción
+    # indexada por [id de no terminal - primer id de no terminal][id de terminal]
+    # Si default_productions es verdadero cada no terminal usa su producción
+    # más común en las casillas vacías, el error se detecta al comparar
+    # el siguiente terminal
+    def compress_ll_1_table(self, table, default_productions=False):
+        rows = self.get_ll_1_rows(table)
+        return CompressedTable(rows, self.get_num_terminals(), NO_PRODUCTION, use_defaults=default_productions)
+
+    # Convierte la tabla LL(1) en filas de ids de producción
+    # indexadas por [id de no terminal - primer id de no terminal][id de terminal]
+    def get_ll_1_rows(self, table):
+        num_terminals = self.get_num_terminals()
+        rows = []
+
+        for id in range(self.first_non_terminal_id, len(self.symbols_by_id)):
+            row = [NO_PRODUCTION] * num_terminals
+            sub_table = table.get(self.get_symbol_by_id(id), {})
+
+            for symbol, production in sub_table.items():
+                if production:
+                    row[symbol.id] = production.id
+
+            rows.append(row)
+
+        return rows
+
+    # Obtiene la tabla LL(1) de la cache si ya fue construida
+    # para esta gramática, si no la construye y la guarda
+    # Al cargarla la gramática queda sin recursión izquierda
+    # igual que al construirla
+    def load_or_build_ll_1_table(self, cache_dir=DEFAULT_CACHE_DIR):
+        fingerprint = get_grammar_fingerprint(self, 'll1')
+        path = get_cache_path(cache_dir, 'll1', fingerprint)
+
+        cached = load_tables(path, fingerprint)
+        if cached is not None:
+            meta, arrays = cached
+            restore_grammar(self, meta['grammar'])
+            return self.get_ll_1_table_from_rows(arrays['table'], meta['values']['num_terminals'])
+
+        table = self.construct_ll_1_table()
+        num_terminals = self.get_num_terminals()
+        cells = array('i')
+        for row in self.get_ll_1_rows(table):
+            cells.extend(row)
+
+        save_tables(path, fingerprint, 'll1', self, {'table': cells}, {'num_terminals': num_terminals})
+        return table
+
+    # Reconstruye la tabla LL(1) como diccionario a partir de
+    # las filas de ids de producción guardadas de forma contigua
+    def get_ll_1_table_from_rows(self, cells, num_terminals):
+        table = {}
+
+        for symbol_nt in self.non_terminal_symbols:
+            if symbol_nt.name != 'epsilon':
+                table[symbol_nt] = {}
+                offset = (symbol_nt.id - self.first_non_terminal_id) * num_terminals
+
+                for symbol_ts in self.terminal_symbols:
+                    production_id = cells[offset + symbol_ts.id]
+                    table[symbol_nt][symbol_ts] = self.productions[production_id] if production_id != NO_PRODUCTION else {}
+
+        return table
+
+    # Crea un parser LL(1) que recibe los tokens por partes
+    # con feed o de un iterador con parse
+    # actions es un SemanticActions opcional para evaluar mientras se parsea
+    def get_ll_1_parser(self, table, trace: ParseTrace | None = None, build_tree=False, actions: SemanticActions | None = None):
+        return LL1StreamParser(self, table, trace, build_tree, actions)
+
+    # Convierte los pasos registrados de un parsing LL(1) en filas
+    # Cada paso es la tupla (id del tope de la pila, id de terminal,
+    # id de producción), la producción es -1 si el tope es terminal
+    # o si no existe la producción
+    # Si el registro está completo se reconstruye la pila, si no
+    # solo se muestra cada paso
+    def get_ll_1_trace_rows(self, trace: ParseTrace):
+        symbols_by_id = self.symbols_by_id
+
+        if not trace.is_complete():
+            return [
+                [symbols_by_id[terminal_id].name, symbols_by_id[top].name, str(self.productions[production_id]) if production_id != NO_PRODUCTION else '']
+                for top, terminal_id, production_id in trace.steps
+            ]
+
+        stack = [self.eof_symbol, self.start_symbol]
+        rows = []
+
+        for top, terminal_id, production_id in trace.steps:
+            rows.append([symbols_by_id[terminal_id].name, ' '.join(symbol.name for symbol in stack)])
+            stack.pop()
+
+            if production_id != NO_PRODUCTION:
+                stack.extend(symbol for symbol in reversed(self.productions[production_id].rhs) if symbol != self.epsilon_symbol)
+
+        return rows
+
+    # Encabezado de las filas de los pasos registrados
+    def get_ll_1_trace_header(self, trace: ParseTrace):
+        if trace.is_complete():
+            return ['Current Symbol', 'Stack']
+        return ['Current Symbol', 'Top', 'Production']
+
+    # Abre un archivo para escribir los pasos de muchos documentos
+    # trace_format es 'csv' o 'binary'
+    # El formato binario guarda la huella de la gramática para
+    # verificarla al leerlo, por eso la tabla ya debe estar construida
+    def open_ll_1_trace_sink(self, file_name, trace_format='csv'):
+        if trace_format == 'csv':
+            return CsvTraceSink(file_name, self.get_ll_1_trace_header, self.get_ll_1_trace_rows)
+        if trace_format == 'binary':
+            return BinaryTraceSink(file_name, get_grammar_fingerprint(self, 'll1'))
+        raise ValueError(f"Error: formato de pasos {trace_format} inválido")
+
+    # Compila la tabla LL(1) en una matriz densa de ids de producción
+    # con los lados derechos ya invertidos y sin epsilon
+    def compile_ll_1_table(self, table):
+        return CompiledLL1Table(self, table)
+
+    # Parsea una lista de símbolos terminales
+    # table puede ser el diccionario, la tabla compilada o la comprimida,
+    # el diccionario se compila la primera vez que se usa
+    # La pila es una lista de ids sin epsilon, cada paso compara enteros
+    # trace indica qué pasos se registran, sin trace no se registra nada
+    # Si build_tree es verdadero regresa el árbol de sintaxis concreta
+    # de la gramática sin recursión izquierda
+    def parse_ll_1_string(self, input, table, trace: ParseTrace | None = None, build_tree=False):
+        # Consultas a la tabla de enteros
+        rows = None
+        if isinstance(table, CompressedTable):
+            get_production_id = table.get
+            production_push = get_production_push(self)
+        else:
+            if not isinstance(table, CompiledLL1Table):
+                # Reutilizamos la compilación del mismo diccionario
+                if self.compiled_source is not table:
+                    self.compiled_source = table
+                    self.compiled_table = self.compile_ll_1_table(table)
+                table = self.compiled_table
+            rows = table.rows
+            production_push = table.production_push
+
+        first_non_terminal_id = self.first_non_terminal_id
+        symbols_by_id = self.symbols_by_id
 
         # Agregamos $ al final del input
-        input.append(self.find_in_simbols('$'))
+        input.append(self.eof_symbol)
 
-        # Stack
+        # Stack de ids
         # Simulamos producción S' -> S$
-        stack = [self.find_in_simbols('$'),self.start_symbol]
+        stack = [self.eof_symbol.id, self.start_symbol.id]
+
+        # Registro de los pasos, None si está apagado
+        record = None
+        if trace is not None:
+            trace.start()
+            record = trace.get_recorder()
 
-        # Guardamos cada paso
-        # del parsing
-        parsing_steps = []
+        # Árbol y pila de nodos, tiene un nodo por cada símbolo
+        # de la pila
+        tree = None
+        if build_tree:
+            tree = ParseTree(symbols_by_id)
+            tree.root_id = tree.add_node(self.start_symbol.id)
+            nodes = [NO_NODE, tree.root_id]
+            production_rhs = tuple(push[::-1] for push in production_push)
 
         # Consumimos un símbolo
-        for curr_symbol in input:
-            
+        for position, curr_symbol in enumerate(input):
+            terminal_id = curr_symbol.id
+
             # Operamos hasta que podamos pasar
             # al siguiente símbolo
             while True:
-                # Para guardar en archivo
-                stack_representation = ' '.join([sym.name for sym in stack])
-                parsing_steps.append([curr_symbol.name, stack_representation])
-                
                 # Sacamos el tope de la pila
                 top = stack.pop()
-                
-                # Si vemos epsilon continuamos
-                if top.name == 'epsilon':
-                    continue
-                
+
                 # Si es terminal veríficamos que suceda n = n
                 # sino lanzamos un error pues no se pudo parsear
                 # el input
-                if top.is_terminal:
-                    if top.name == curr_symbol.name:
+                if top < first_non_terminal_id:
+                    if record is not None:
+                        record((top, terminal_id, NO_PRODUCTION))
+
+                    if top == terminal_id:
+                        # $ no tiene nodo en el árbol
+                        if tree is not None and top != self.eof_symbol.id:
+                            node = nodes.pop()
+                            tree.start[node] = position
+                            tree.end[node] = position + 1
+
                         # Avanzamos al siguiente símbolo
                         break
                     else:
-                        raise SyntaxError(f"Error: {top.name} != {curr_symbol.name}")
+                        raise SyntaxError(f"Error: {symbols_by_id[top].name} != {curr_symbol.name}")
 
                 # Obtenemos la producción correspondiente en la tabla
-                production = table[top][curr_symbol]
+                if rows is not None:
+                    production_id = rows[top][terminal_id]
+                else:
+                    production_id = get_production_id(top - first_non_terminal_id, terminal_id)
+
+                if record is not None:
+                    record((top, terminal_id, production_id))
 
                 # Si la producción no existe lanzamos un error pues no 
                 # se pudo parsear el input
-                if not production:
-                    raise SyntaxError(f"Error: no existe la producción para {curr_symbol.name} con {top.name} en la tabla LL(1)")
+                if production_id == NO_PRODUCTION:
+                    raise SyntaxError(f"Error: no existe la producción para {curr_symbol.name} con {symbols_by_id[top].name} en la tabla LL(1)")
 
-                # Invertimos el orden de la producción
-                rhs = production.rhs[::-1]
+                # Agregamos al stack el lado derecho ya invertido
+                stack.extend(production_push[production_id])
 
-                # Agregamos al stack 
-                stack.extend(rhs)
+                if tree is not None:
+                    children = tree.expand(nodes.pop(), production_rhs[production_id], position)
+                    nodes.extend(reversed(children))
 
         # Si el stack no está vacío al final no se pudo parsear el input
-        if stack != []:
-            raise SyntaxError(f"Parsing incorrecto: Input = {input}, Stack no vacía {stack}")
-        
-        # Para guardar en documento
-        stack_representation = ' '.join([sym.name for sym in stack])
-        parsing_steps.append([curr_symbol.name, stack_representation])
-        
-        # Guardamos los resultados en un archivo
-        csv_filename = 'parsing_ll1_results.csv'
-        
-        with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-            csv_writer = csv.writer(csvfile, delimiter=',', quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerow(['Current Symbol', 'Stack'])
-        
-            # Agregar cada paso del proceso de parsing
-            for step in parsing_steps:
-                csv_writer.writerow(step)
+        if stack:
+            raise SyntaxError(f"Parsing incorrecto: Input = {input}, Stack no vacía {[symbols_by_id[id] for id in stack]}")
+
+        if trace is not None:
+            trace.finish(True)
         
-        print(f"Parsing correcto: Input = {input}, Stack vacío {stack}")
+        print(f"Parsing correcto: Input = {input}, Stack vacío []")
 
-grammar = GrammarLL1(['+','*','-','/','n', '(', ')'], ['E','T','F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
+        if tree is not None:
+            tree.compute_spans()
+            return tree
 
-strings_to_parse = [
-    "10+12/3",
-    "10+",
-    "3*(2+4)/5",
-    "3*4+"
-]
+if __name__ == '__main__':
+    grammar = GrammarLL1(['+','*','-','/','n', '(', ')'], ['E','T','F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
 
-tokens_to_parse = []
+    strings_to_parse = [
+        "10+12/3",
+        "10+",
+        "3*(2+4)/5",
+        "3*4+"
+    ]
 
-for string in strings_to_parse:
-    # Usamos una regex para parsear enteros y flotantes 
-    # dentro de una cadena de texto
-    pattern = re.compile(r'(\d+(\.\d+)?)|([+\-*/()])')
-    tokens = [match.group() for match in pattern.finditer(string)]
+    # Los números enteros y flotantes son el terminal n
+    # los demás terminales se reconocen con su nombre
+    grammar.lexer.add_regex('n', r'\d+(\.\d+)?')
+    grammar.lexer.add_ignore(r'\s+')
 
-    string_tokens = []
+    tokens_to_parse = []
 
-    # Procesamos los tokens y buscamos su símbolo
-    # dentro de la gramática
-    for token in tokens:
-        if token.isdigit():
-            # 10 -> n
-            string_tokens.append(grammar.find_in_simbols('n'))
-        else:
-            string_tokens.append(grammar.find_in_simbols(token))
-    
-    tokens_to_parse.append(string_tokens)
-
-# Parsing con LL(1)
-# Guardara los datos de la gramatica en un archivo ll1_results.txt
-# y los parsing correctos en un archivo parsing_results.csv
-table = grammar.construct_ll_1_table()
-for string_tokens in tokens_to_parse:
-    try:
-        grammar.parse_ll_1_string(string_tokens, table)
-    except Exception as e:
-        print(f"{e}")
\ No newline at end of file
+    for string in strings_to_parse:
+        try:
+            tokens_to_parse.append(grammar.get_symbols_from_string(string))
+        except SyntaxError as e:
+            print(f"{e}")
+
+    # Parsing con LL(1)
+    # Guardara los datos de la gramatica en un archivo ll1_results.txt
+    # y los parsing correctos en un archivo parsing_results.csv
+    # Solo se construye la tabla y se escribe ll1_results.txt la primera vez,
+    # después se carga la tabla de la cache
+    table = grammar.load_or_build_ll_1_table()
+    # Los pasos de los parsing correctos se guardan en
+    # parsing_ll1_results.csv, el archivo se abre una sola vez
+    trace = ParseTrace(TRACE_FULL)
+    with grammar.open_ll_1_trace_sink('parsing_ll1_results.csv') as sink:
+        for num, string_tokens in enumerate(tokens_to_parse):
+            try:
+                grammar.parse_ll_1_string(string_tokens, table, trace)
+                sink.write(num, trace, True)
+            except Exception as e:
+                print(f"{e}")
+
+    # Evaluamos las expresiones mientras se parsean
+    # Las acciones son de la gramática sin recursión izquierda, E' recibe
+    # el operando izquierdo así que su valor es una función
+    actions = SemanticActions().add_token_value('n', float)
+    actions.add_action("E := T E'", lambda t, rest: rest(t))
+    actions.add_action("E' := + T E'", lambda _, t, rest: lambda left: rest(left + t))
+    actions.add_action("E' := - T E'", lambda _, t, rest: lambda left: rest(left - t))
+    actions.add_action("E' := epsilon", lambda: lambda left: left)
+    actions.add_action("T := F T'", lambda f, rest: rest(f))
+    actions.add_action("T' := * F T'", lambda _, f, rest: lambda left: rest(left * f))
+    actions.add_action("T' := / F T'", lambda _, f, rest: lambda left: rest(left / f))
+    actions.add_action("T' := epsilon", lambda: lambda left: left)
+    actions.add_action('F := ( E )', lambda _, e, __: e)
+
+    parser = grammar.get_ll_1_parser(table, actions=actions)
+    for string in strings_to_parse:
+        try:
+            parser.parse(grammar.tokenize(string))
+            print(f"{string} = {parser.value}")
+        except SyntaxError as e:
+            print(f"{e}")
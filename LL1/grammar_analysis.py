@@ -0,0 +1,223 @@
+import sys
+
+# Aplica el algoritmo digraph de DeRemer y Pennello
+# Dada una relación R entre nodos y un conjunto base F'(x)
+# calcula F(x) = F'(x) ∪ ⋃{ F(y) | x R y }
+# Recorre las componentes fuertemente conexas en orden topológico
+# de forma iterativa, los conjuntos son enteros usados como bitsets
+def digraph(nodes, relation, base):
+    infinity = sys.maxsize
+    depth = {}
+    result = {}
+    stack = []
+
+    for start in nodes:
+        if start in depth:
+            continue
+
+        # Pila de trabajo con (nodo, profundidad, sucesores pendientes)
+        stack.append(start)
+        depth[start] = len(stack)
+        result[start] = base.get(start, 0)
+        work = [(start, depth[start], iter(relation.get(start, ())))]
+
+        while work:
+            x, d, successors = work[-1]
+
+            for y in successors:
+                # Si no ha sido visitado bajamos a ese nodo
+                if y not in depth:
+                    stack.append(y)
+                    depth[y] = len(stack)
+                    result[y] = base.get(y, 0)
+                    work.append((y, depth[y], iter(relation.get(y, ()))))
+                    break
+
+                depth[x] = min(depth[x], depth[y])
+                result[x] |= result[y]
+            else:
+                # Terminamos con el nodo x
+                work.pop()
+
+                # Si x es la raíz de su componente todos los nodos
+                # de la componente comparten el mismo conjunto
+                if depth[x] == d:
+                    while True:
+                        top = stack.pop()
+                        depth[top] = infinity
+                        result[top] = result[x]
+                        if top == x:
+                            break
+
+                # Propagamos al nodo que nos visitó
+                if work:
+                    parent = work[-1][0]
+                    depth[parent] = min(depth[parent], depth[x])
+                    result[parent] |= result[x]
+
+    return result
+
+# Recorre los ids de un bitset de menor a mayor
+def iterate_bits(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class GrammarAnalysis:
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.epsilon_bit = 1 << grammar.epsilon_symbol.id
+
+        # Ids de los símbolos anulables
+        self.nullable = set()
+        # id de no terminal -> bitset de ids de terminales
+        # El bit de epsilon indica que el símbolo es anulable
+        self.first_bits = {}
+        self.follow_bits = {}
+
+        self.compute_nullable()
+        self.compute_first()
+        self.compute_follow()
+
+    # No terminales de la gramática sin contar epsilon
+    def get_non_terminals(self):
+        epsilon_symbol = self.grammar.epsilon_symbol
+        return [symbol for symbol in self.grammar.non_terminal_symbols if symbol != epsilon_symbol]
+
+    # Calcula los símbolos anulables con una lista de trabajo
+    # Cada producción lleva la cuenta de los símbolos de su lado
+    # derecho que aún no sabemos si son anulables
+    def compute_nullable(self):
+        grammar = self.grammar
+        epsilon_id = grammar.epsilon_symbol.id
+
+        nullable = {epsilon_id}
+        pending = {}
+        worklist = []
+
+        for production in grammar.productions:
+            count = sum(1 for symbol in production.rhs if symbol.id != epsilon_id)
+            pending[production.id] = count
+
+            # E := epsilon
+            if count == 0 and production.lhs.id not in nullable:
+                nullable.add(production.lhs.id)
+                worklist.append(production.lhs)
+
+        while worklist:
+            symbol = worklist.pop()
+
+            # Cada aparición del símbolo reduce la cuenta de su producción
+            for production, _ in grammar.get_symbol_occurrences(symbol):
+                pending[production.id] -= 1
+
+                if pending[production.id] == 0 and production.lhs.id not in nullable:
+                    nullable.add(production.lhs.id)
+                    worklist.append(production.lhs)
+
+        self.nullable = nullable
+
+    # Bitset FIRST de un símbolo cualquiera
+    def get_first_bits(self, symbol):
+        if symbol.is_terminal:
+            return 1 << symbol.id
+        if symbol.id == self.grammar.epsilon_symbol.id:
+            return self.epsilon_bit
+        return self.first_bits.get(symbol.id, 0)
+
+    # Bitset FIRST de una secuencia de símbolos
+    # Contiene epsilon si toda la secuencia es anulable
+    def get_first_bits_sequence(self, symbols):
+        bits = 0
+
+        for symbol in symbols:
+            bits |= self.get_first_bits(symbol) & ~self.epsilon_bit
+            if symbol.id not in self.nullable:
+                return bits
+
+        return bits | self.epsilon_bit
+
+    # Calcula FIRST de cada no terminal
+    # A depende de B si A := αBβ con α anulable
+    def compute_first(self):
+        grammar = self.grammar
+        epsilon_id = grammar.epsilon_symbol.id
+
+        base = {}
+        relation = {}
+        non_terminals = self.get_non_terminals()
+
+        for symbol in non_terminals:
+            base[symbol.id] = 0
+            relation[symbol.id] = []
+
+        for production in grammar.productions:
+            lhs_id = production.lhs.id
+
+            for symbol in production.rhs:
+                if symbol.is_terminal:
+                    base[lhs_id] |= 1 << symbol.id
+                    break
+
+                if symbol.id != epsilon_id:
+                    relation[lhs_id].append(symbol.id)
+
+                if symbol.id not in self.nullable:
+                    break
+
+        first_bits = digraph([symbol.id for symbol in non_terminals], relation, base)
+
+        # Agregamos epsilon a los no terminales anulables
+        for id in first_bits:
+            if id in self.nullable:
+                first_bits[id] |= self.epsilon_bit
+
+        self.first_bits = first_bits
+
+    # Calcula FOLLOW de cada no terminal
+    # FOLLOW(B) contiene FIRST(β) si A := αBβ
+    # y B depende de A si β es anulable
+    def compute_follow(self):
+        grammar = self.grammar
+        epsilon_id = grammar.epsilon_symbol.id
+
+        base = {}
+        relation = {}
+        non_terminals = self.get_non_terminals()
+
+        for symbol in non_terminals:
+            base[symbol.id] = 0
+            relation[symbol.id] = []
+
+        # FOLLOW(S) contiene $
+        base[grammar.start_symbol.id] = 1 << grammar.eof_symbol.id
+
+        for production in grammar.productions:
+            rhs = production.rhs
+            lhs_id = production.lhs.id
+
+            # Recorremos de derecha a izquierda llevando
+            # FIRST del sufijo β
+            suffix_bits = self.epsilon_bit
+
+            for symbol in reversed(rhs):
+                if not symbol.is_terminal and symbol.id != epsilon_id:
+                    base[symbol.id] |= suffix_bits & ~self.epsilon_bit
+
+                    if suffix_bits & self.epsilon_bit:
+                        relation[symbol.id].append(lhs_id)
+
+                symbol_bits = self.get_first_bits(symbol)
+
+                if symbol.id in self.nullable:
+                    suffix_bits |= symbol_bits & ~self.epsilon_bit
+                else:
+                    suffix_bits = symbol_bits
+
+        self.follow_bits = digraph([symbol.id for symbol in non_terminals], relation, base)
+
+    # Convierte un bitset en el conjunto de símbolos correspondiente
+    def bits_to_symbols(self, bits):
+        return {self.grammar.get_symbol_by_id(id) for id in iterate_bits(bits)}
@@ -0,0 +1,229 @@
+import re
+
+# Tamaño de los bloques leídos de un archivo o socket
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Id de las reglas que se ignoran, como espacios en blanco
+IGNORE = -1
+
+# Caracteres que dejamos sin procesar al final de cada bloque
+# hasta leer el siguiente, por si un token continúa en él
+# Debe ser mayor que el token más largo que pueda partirse
+MAX_TOKEN_LOOKAHEAD = 1024
+
+
+class LexerRule:
+    def __init__(self, terminal_id, pattern, is_literal, priority, order):
+        self.terminal_id = terminal_id
+        self.pattern = pattern
+        self.is_literal = is_literal
+        self.priority = priority
+        # Orden de declaración para desempatar
+        self.order = order
+
+    # Llave para elegir entre dos reglas que reconocen
+    # la misma longitud, gana la mayor
+    def get_rank(self):
+        return (self.priority, self.is_literal, -self.order)
+
+
+class Lexer:
+    # Analizador léxico de los terminales de una gramática
+    # Cada terminal se declara como literal o como expresión regular
+    # y todas las reglas se compilan en una sola expresión maestra
+    # Se elige la coincidencia más larga y en caso de empate la regla
+    # con mayor prioridad, las literales y por último la primera declarada
+    def __init__(self, grammar):
+        self.grammar = grammar
+        # Texto de la literal -> regla
+        self.literals = {}
+        self.regex_rules = []
+        self.master = None
+        self.groups = []
+        # Reglas que se prueban con su propia expresión, (expresión, regla)
+        self.separate_rules = []
+        self.literal_group = None
+
+    def add_rule(self, terminal_name, pattern, is_literal, priority):
+        if terminal_name is None:
+            terminal_id = IGNORE
+        else:
+            symbol = self.grammar.find_in_simbols(terminal_name)
+            if symbol is None or not symbol.is_terminal:
+                raise ValueError(f"Error: {terminal_name} no es un terminal de la gramática")
+            terminal_id = symbol.id
+
+        rule = LexerRule(terminal_id, pattern, is_literal, priority, len(self.literals) + len(self.regex_rules))
+
+        if is_literal:
+            if pattern in self.literals:
+                raise ValueError(f"Error: la literal {pattern} ya está declarada")
+            self.literals[pattern] = rule
+        else:
+            self.regex_rules.append(rule)
+
+        # Hay que volver a compilar
+        self.master = None
+        return rule
+
+    # Declara un terminal que se reconoce con un texto fijo
+    # Si no se indica el texto se usa el nombre del terminal
+    def add_literal(self, terminal_name, text=None, priority=0):
+        return self.add_rule(terminal_name, terminal_name if text is None else text, True, priority)
+
+    # Declara un terminal que se reconoce con una expresión regular
+    def add_regex(self, terminal_name, pattern, priority=0):
+        return self.add_rule(terminal_name, pattern, False, priority)
+
+    # Declara una expresión regular que se descarta, como espacios
+    def add_ignore(self, pattern):
+        return self.add_rule(None, pattern, False, 0)
+
+    # Compila todas las reglas en una sola expresión regular
+    # Cada regla va en una búsqueda hacia adelante opcional, así con
+    # una sola llamada a match obtenemos hasta dónde llega cada regla
+    # Las literales van juntas en un grupo ordenadas de la más larga a
+    # la más corta para obtener la literal más larga
+    # Las reglas con grupos o con banderas globales como (?i) no se
+    # pueden pegar en la expresión maestra, los grupos cambiarían de
+    # número y de nombre, y se prueban con su propia expresión
+    def compile(self):
+        # Los terminales sin declarar se reconocen con su nombre
+        declared = {rule.terminal_id for rule in self.literals.values()}
+        declared.update(rule.terminal_id for rule in self.regex_rules)
+
+        for symbol in self.grammar.terminal_symbols:
+            if symbol.id not in declared and symbol != self.grammar.eof_symbol and symbol.name not in self.literals:
+                self.add_literal(symbol.name)
+
+        parts = []
+        self.groups = []
+        self.separate_rules = []
+        self.literal_group = None
+        group = 0
+        default_flags = re.compile('').flags
+
+        if self.literals:
+            group += 1
+            self.literal_group = group
+            alternatives = '|'.join(re.escape(text) for text in sorted(self.literals, key=len, reverse=True))
+            parts.append(f"(?:(?=({alternatives})))?")
+
+        for rule in self.regex_rules:
+            try:
+                pattern = re.compile(rule.pattern)
+            except re.error as e:
+                raise ValueError(f"Error: la expresión regular {rule.pattern!r} no es válida: {e}")
+
+            if pattern.groups or pattern.flags != default_flags:
+                self.separate_rules.append((pattern, rule))
+                continue
+
+            group += 1
+            self.groups.append((group, rule))
+            parts.append(f"(?:(?=({rule.pattern})))?")
+
+        self.master = re.compile(''.join(parts))
+        return self
+
+    # Busca el mejor token en la posición dada
+    # Regresa (regla, fin) o None si ninguna regla reconoce algo
+    def match(self, text, position):
+        result = self.master.match(text, position)
+        best_rule = None
+        best_end = position
+
+        if self.literal_group is not None:
+            end = result.end(self.literal_group)
+            if end > best_end:
+                best_rule = self.literals[result.group(self.literal_group)]
+                best_end = end
+
+        for group, rule in self.groups:
+            end = result.end(group)
+            if end > best_end or (end == best_end and end > position and rule.get_rank() > best_rule.get_rank()):
+                best_rule = rule
+                best_end = end
+
+        for pattern, rule in self.separate_rules:
+            found = pattern.match(text, position)
+            if found is None:
+                continue
+            end = found.end()
+            if end > best_end or (end == best_end and end > position and rule.get_rank() > best_rule.get_rank()):
+                best_rule = rule
+                best_end = end
+
+        if best_rule is None:
+            return None
+
+        return best_rule, best_end
+
+    # Genera los tokens de un texto como tuplas
+    # (id de terminal, posición inicial, lexema)
+    def tokenize(self, text, offset=0):
+        if self.master is None:
+            self.compile()
+
+        position = 0
+        size = len(text)
+
+        while position < size:
+            found = self.match(text, position)
+
+            if found is None:
+                raise SyntaxError(f"Error léxico: carácter inesperado {text[position]!r} en la posición {offset + position}")
+
+            rule, end = found
+
+            if rule.terminal_id != IGNORE:
+                yield (rule.terminal_id, offset + position, text[position:end])
+
+            position = end
+
+    # Genera los tokens de una secuencia de bloques de texto
+    # Solo guarda en memoria el bloque actual y el token que quedó
+    # incompleto al final del bloque anterior
+    def tokenize_chunks(self, chunks):
+        if self.master is None:
+            self.compile()
+
+        buffer = ''
+        offset = 0
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+
+            buffer += chunk
+            position = 0
+            size = len(buffer)
+
+            while size - position > MAX_TOKEN_LOOKAHEAD:
+                found = self.match(buffer, position)
+
+                if found is None:
+                    raise SyntaxError(f"Error léxico: carácter inesperado {buffer[position]!r} en la posición {offset + position}")
+
+                rule, end = found
+
+                # Si la coincidencia llega cerca del final del bloque el
+                # token puede continuar en el siguiente, esperamos más texto
+                if size - end < MAX_TOKEN_LOOKAHEAD:
+                    break
+
+                if rule.terminal_id != IGNORE:
+                    yield (rule.terminal_id, offset + position, buffer[position:end])
+
+                position = end
+
+            buffer = buffer[position:]
+            offset += position
+
+        # El resto se procesa como texto completo
+        yield from self.tokenize(buffer, offset)
+
+    # Genera los tokens de un archivo o socket leyendo por bloques
+    # Para sockets se puede usar socket.makefile('r')
+    def tokenize_file(self, file, chunk_size=DEFAULT_CHUNK_SIZE):
+        return self.tokenize_chunks(iter(lambda: file.read(chunk_size), ''))
@@ -0,0 +1,59 @@
+from collections import deque
+
+# Niveles de registro de los pasos del parsing
+# - TRACE_OFF: no se registra nada
+# - TRACE_FAILURES: solo los últimos pasos en un buffer circular y
+#   solo se conservan si el parsing falla
+# - TRACE_FULL: todos los pasos
+TRACE_OFF = 0
+TRACE_FAILURES = 1
+TRACE_FULL = 2
+
+TRACE_LEVELS = {'off': TRACE_OFF, 'failures': TRACE_FAILURES, 'full': TRACE_FULL}
+
+# Pasos que se conservan con TRACE_FAILURES
+DEFAULT_TRACE_SIZE = 64
+
+
+class ParseTrace:
+    # Pasos de un parsing como tuplas de enteros, cada parser decide
+    # qué guarda en la tupla y cómo se muestra
+    # Solo se convierten a texto al escribirlos
+    def __init__(self, level=TRACE_FULL, size=DEFAULT_TRACE_SIZE):
+        if level not in TRACE_LEVELS.values():
+            raise ValueError(f"Error: nivel de registro {level} inválido")
+
+        self.level = level
+        self.size = size
+        self.steps = deque(maxlen=size) if level == TRACE_FAILURES else []
+
+    # Crea un registro con pasos ya guardados, por ejemplo
+    # los leídos de un archivo
+    @classmethod
+    def from_steps(cls, steps, complete):
+        trace = cls(TRACE_FULL if complete else TRACE_FAILURES, max(len(steps), 1))
+        trace.steps.extend(steps)
+        return trace
+
+    # Función para registrar un paso o None si el registro está apagado
+    # Los parsers la guardan en una variable local y solo la llaman
+    # si no es None, así con el registro apagado no hay costo por paso
+    def get_recorder(self):
+        if self.level == TRACE_OFF:
+            return None
+        return self.steps.append
+
+    # Se llama al iniciar el parsing de una cadena
+    def start(self):
+        self.steps.clear()
+
+    # Se llama al terminar el parsing de una cadena
+    # Con TRACE_FAILURES los pasos de un parsing correcto se descartan
+    def finish(self, accepted):
+        if accepted and self.level == TRACE_FAILURES:
+            self.steps.clear()
+
+    # Indica si los pasos comienzan desde el inicio del parsing
+    # y se puede reconstruir la pila
+    def is_complete(self):
+        return self.level == TRACE_FULL
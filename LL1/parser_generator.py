@@ -0,0 +1,293 @@
+import re
+import sys
+from array import array
+from grammar_LL1 import GrammarLL1
+from compiled_table import NO_PRODUCTION
+
+# Bytes por línea de los arreglos en el módulo generado
+BYTES_PER_LINE = 48
+
+# Código del parser generado
+# No depende de Grammar ni de la tabla como diccionario
+PARSER_TEMPLATE = '''# Parser LL(1) generado con parser_generator.py
+# No editar, volver a generar si cambia la gramática
+import sys
+from array import array
+
+# Tabla de símbolos, el índice es el id del símbolo
+SYMBOLS = {symbols!r}
+
+# Nombre de terminal -> id
+TERMINALS = {terminals!r}
+
+EOF_ID = {eof_id}
+START_ID = {start_id}
+NUM_TERMINALS = {num_terminals}
+FIRST_NON_TERMINAL_ID = {first_non_terminal_id}
+
+def _unpack(data):
+    values = array('i')
+    values.frombytes(data)
+    if sys.byteorder != {byteorder!r}:
+        values.byteswap()
+    return values
+
+# Tabla LL(1) [id de no terminal - FIRST_NON_TERMINAL_ID][id de terminal]
+# con el id de la producción o -1 si la casilla está vacía
+TABLE = _unpack(
+{table}
+)
+
+# Ids del lado derecho de cada producción en el orden
+# en que se agregan a la pila, invertidos y sin epsilon
+PRODUCTION_PUSH = {production_push!r}
+
+# Parsea una secuencia de ids de terminales sin incluir $
+# Regresa True si la cadena pertenece al lenguaje
+# o lanza SyntaxError con la posición del error
+def parse(tokens):
+    table = TABLE
+    production_push = PRODUCTION_PUSH
+    num_terminals = NUM_TERMINALS
+    first_non_terminal_id = FIRST_NON_TERMINAL_ID
+
+    stack = [EOF_ID, START_ID]
+    position = 0
+    tokens = iter(tokens)
+
+    while stack:
+        token = next(tokens, EOF_ID)
+
+        while True:
+            top = stack.pop()
+
+            # Terminal, debe coincidir con el token
+            if top < first_non_terminal_id:
+                if top == token:
+                    break
+                raise SyntaxError(f"Parsing incorrecto: {{SYMBOLS[top]}} != {{SYMBOLS[token]}} en la posición {{position}}")
+
+            production_id = table[(top - first_non_terminal_id) * num_terminals + token]
+            if production_id < 0:
+                raise SyntaxError(f"Parsing incorrecto: no existe la producción para {{SYMBOLS[token]}} con {{SYMBOLS[top]}} en la posición {{position}}")
+
+            stack.extend(production_push[production_id])
+
+        position += 1
+
+    return True
+
+# Parsea una secuencia de nombres de terminales
+def parse_names(names):
+    return parse(TERMINALS[name] for name in names)
+'''
+
+# Código del parser descendente recursivo generado
+# Cada no terminal es una función que recibe la posición del token
+# actual y regresa la posición después de su lado derecho
+DESCENT_TEMPLATE = '''# Parser descendente recursivo LL(1) generado con parser_generator.py
+# No editar, volver a generar si cambia la gramática
+
+# Tabla de símbolos, el índice es el id del símbolo
+SYMBOLS = {symbols!r}
+
+# Nombre de terminal -> id
+TERMINALS = {terminals!r}
+
+EOF_ID = {eof_id}
+
+{functions}
+# Parsea una secuencia de ids de terminales sin incluir $
+# Regresa True si la cadena pertenece al lenguaje
+# o lanza SyntaxError con la posición del error
+def parse(tokens):
+    tokens = list(tokens)
+    tokens.append(EOF_ID)
+
+    position = {start_function}(tokens, 0)
+    if tokens[position] != EOF_ID:
+        raise SyntaxError(f"Parsing incorrecto: $ != {{SYMBOLS[tokens[position]]}} en la posición {{position}}")
+
+    return True
+
+# Parsea una secuencia de nombres de terminales
+def parse_names(names):
+    return parse(TERMINALS[name] for name in names)
+'''
+
+# Nombres globales que define DESCENT_TEMPLATE
+DESCENT_TEMPLATE_NAMES = ('SYMBOLS', 'TERMINALS', 'EOF_ID', 'parse', 'parse_names')
+
+# Convierte un arreglo de enteros en una literal de bytes
+# partida en varias líneas
+def format_bytes(values):
+    data = array('i', values).tobytes()
+    lines = []
+
+    for start in range(0, len(data), BYTES_PER_LINE):
+        lines.append('    ' + repr(data[start:start + BYTES_PER_LINE]))
+
+    return '\n'.join(lines) if lines else "    b''"
+
+# Genera el código de un módulo independiente con la tabla LL(1)
+def generate_ll_1_parser(grammar: GrammarLL1, table):
+    cells = array('i')
+    for row in grammar.get_ll_1_rows(table):
+        cells.extend(row)
+
+    production_push = tuple(
+        tuple(symbol.id for symbol in reversed(production.rhs) if symbol != grammar.epsilon_symbol)
+        for production in grammar.productions
+    )
+
+    return PARSER_TEMPLATE.format(
+        symbols=tuple(symbol.name for symbol in grammar.symbols_by_id),
+        terminals={symbol.name: symbol.id for symbol in grammar.terminal_symbols},
+        eof_id=grammar.eof_symbol.id,
+        start_id=grammar.start_symbol.id,
+        num_terminals=grammar.get_num_terminals(),
+        first_non_terminal_id=grammar.first_non_terminal_id,
+        byteorder=sys.byteorder,
+        table=format_bytes(cells),
+        production_push=production_push,
+    )
+
+# Escribe el módulo generado en un archivo
+def write_ll_1_parser(grammar: GrammarLL1, table, file_name):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        file.write(generate_ll_1_parser(grammar, table))
+
+# Nombre de la función de cada no terminal en el parser descendente
+# E' -> parse_E_, si el nombre ya está usado por otro no terminal o por
+# el módulo generado se le agrega el id del símbolo
+def get_function_names(grammar: GrammarLL1):
+    names = {}
+    used = set(DESCENT_TEMPLATE_NAMES)
+
+    for id in range(grammar.first_non_terminal_id, len(grammar.symbols_by_id)):
+        name = 'parse_' + re.sub(r'\W', '_', grammar.symbols_by_id[id].name)
+        while name in used:
+            name = f"{name}_{id}"
+        used.add(name)
+        names[id] = name
+
+    return names
+
+# Condición de Python que compara el token con los ids de terminales
+def format_condition(terminal_ids):
+    if len(terminal_ids) == 1:
+        return f"token == {terminal_ids[0]}"
+    return f"token in {tuple(terminal_ids)!r}"
+
+# Genera el código de una función del parser descendente
+# Las alternativas se eligen con una cadena de if sobre el id del token
+# con los terminales de la fila del no terminal en la tabla LL(1)
+# Si alguna alternativa termina con el mismo no terminal, E' := + T E',
+# la función es un ciclo while y esa llamada final se vuelve continue
+def generate_descent_function(grammar: GrammarLL1, symbol_id, row, function_names):
+    symbols_by_id = grammar.symbols_by_id
+    epsilon_id = grammar.epsilon_symbol.id
+    first_non_terminal_id = grammar.first_non_terminal_id
+    symbol_name = symbols_by_id[symbol_id].name
+
+    # id de producción -> terminales con los que se elige, en orden
+    alternatives = {}
+    for terminal_id, production_id in enumerate(row):
+        if production_id != NO_PRODUCTION:
+            alternatives.setdefault(production_id, []).append(terminal_id)
+
+    productions = [grammar.productions[production_id] for production_id in sorted(alternatives)]
+    is_loop = any(production.rhs[-1].id == symbol_id for production in productions)
+
+    lines = [
+        f"# {symbol_name} := {' '.join(symbol.name for symbol in production.rhs)}"
+        for production in grammar.get_productions_by_symbol_lhs(symbols_by_id[symbol_id])
+    ]
+    # Sin producciones, como S en S := S b después de remove_left_recursion,
+    # la función solo lanza el error
+    if not lines:
+        lines.append(f"# {symbol_name} no tiene producciones")
+    lines.append(f"def {function_names[symbol_id]}(tokens, position):")
+
+    # Sangría del cuerpo, un nivel más dentro del while
+    indent = '        ' if is_loop else '    '
+    if is_loop:
+        lines.append('    while True:')
+    lines.append(f"{indent}token = tokens[position]")
+
+    for num, production in enumerate(productions):
+        keyword = 'if' if num == 0 else 'elif'
+        lines.append(f"{indent}{keyword} {format_condition(alternatives[production.id])}:")
+
+        rhs = [symbol.id for symbol in production.rhs if symbol.id != epsilon_id]
+        tail_call = is_loop and rhs and rhs[-1] == symbol_id
+        if tail_call:
+            rhs = rhs[:-1]
+
+        body = []
+        for position, id in enumerate(rhs):
+            if id >= first_non_terminal_id:
+                body.append(f"position = {function_names[id]}(tokens, position)")
+                continue
+
+            # El primer terminal ya se comparó al elegir la alternativa
+            if position > 0:
+                body.append(f"if tokens[position] != {id}:")
+                body.append(f"    raise SyntaxError(f\"Parsing incorrecto: {symbols_by_id[id].name} != {{SYMBOLS[tokens[position]]}} en la posición {{position}}\")")
+            body.append('position += 1')
+
+        if tail_call:
+            body.append('continue')
+        elif body and body[-1].startswith('position = '):
+            # La última llamada regresa la posición directamente
+            body[-1] = body[-1].replace('position = ', 'return ', 1)
+        else:
+            body.append('return position')
+        lines.extend(f"{indent}    {line}" for line in body)
+
+    lines.append(f"{indent}raise SyntaxError(f\"Parsing incorrecto: no existe la producción para {{SYMBOLS[token]}} con {symbol_name} en la posición {{position}}\")")
+
+    return '\n'.join(lines) + '\n'
+
+# Genera el código de un parser descendente recursivo con la tabla LL(1)
+# Cada no terminal es una función que elige su alternativa con el id
+# del token, sin pila explícita ni consultas a la tabla
+# La recursión derecha que deja remove_left_recursion se vuelve un ciclo,
+# solo los paréntesis anidados agregan llamadas
+def generate_ll_1_descent_parser(grammar: GrammarLL1, table):
+    function_names = get_function_names(grammar)
+    rows = grammar.get_ll_1_rows(table)
+
+    functions = []
+    for id in range(grammar.first_non_terminal_id, len(grammar.symbols_by_id)):
+        functions.append(generate_descent_function(grammar, id, rows[id - grammar.first_non_terminal_id], function_names))
+
+    return DESCENT_TEMPLATE.format(
+        symbols=tuple(symbol.name for symbol in grammar.symbols_by_id),
+        terminals={symbol.name: symbol.id for symbol in grammar.terminal_symbols},
+        eof_id=grammar.eof_symbol.id,
+        functions='\n'.join(functions),
+        start_function=function_names[grammar.start_symbol.id],
+    )
+
+# Escribe el parser descendente generado en un archivo
+def write_ll_1_descent_parser(grammar: GrammarLL1, table, file_name):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        file.write(generate_ll_1_descent_parser(grammar, table))
+
+if __name__ == '__main__':
+    # Uso: python parser_generator.py [archivo de salida] [--descent]
+    # Con --descent genera el parser descendente recursivo
+    descent = '--descent' in sys.argv
+    arguments = [argument for argument in sys.argv[1:] if argument != '--descent']
+    file_name = arguments[0] if arguments else ('ll1_descent_generated.py' if descent else 'll1_parser_generated.py')
+
+    grammar = GrammarLL1(['+','*','-','/','n', '(', ')'], ['E','T','F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
+
+    table = grammar.load_or_build_ll_1_table()
+    if descent:
+        write_ll_1_descent_parser(grammar, table, file_name)
+    else:
+        write_ll_1_parser(grammar, table, file_name)
+
+    print(f"Parser generado en {file_name}")
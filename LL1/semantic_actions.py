@@ -0,0 +1,72 @@
+# Acción por defecto de las producciones sin acción
+# Como en yacc el valor es el del primer símbolo, $$ = $1
+def default_action(*values):
+    return values[0] if values else None
+
+
+class SemanticActions:
+    # Acciones semánticas de una gramática
+    # - Cada producción puede tener una función que recibe los valores
+    #   de su lado derecho, sin contar epsilon, y regresa el valor del
+    #   lado izquierdo
+    # - Cada terminal puede tener una función que convierte el lexema
+    #   del token en su valor, sin función el valor es el lexema
+    # Las producciones se declaran con texto, "E := E + T", y se
+    # resuelven a una lista indexada por id de producción al crear
+    # el parser, así cada reducción es una sola llamada
+    def __init__(self):
+        # (lado izquierdo, lado derecho) -> función
+        self.actions = {}
+        # Nombre de terminal -> función
+        self.token_values = {}
+
+    # Obtiene la llave de una producción en texto
+    # "E := E + T" -> ('E', ('E', '+', 'T'))
+    def get_key(self, production):
+        lhs, rhs = production.split(' := ')
+        if ' | ' in rhs:
+            raise ValueError(f"Error: la acción de {production} debe ser de una sola producción")
+        return (lhs.strip(), tuple(rhs.split()))
+
+    # Agrega la acción de una producción
+    def add_action(self, production, action):
+        self.actions[self.get_key(production)] = action
+        return self
+
+    # Agrega la función que convierte el lexema de un terminal
+    def add_token_value(self, terminal_name, convert):
+        self.token_values[terminal_name] = convert
+        return self
+
+    # Resuelve las acciones a una tupla indexada por id de producción
+    # Las producciones sin acción usan default_action
+    def get_dispatch(self, grammar):
+        dispatch = [default_action] * len(grammar.productions)
+        found = set()
+
+        for production in grammar.productions:
+            key = (production.lhs.name, tuple(symbol.name for symbol in production.rhs))
+            action = self.actions.get(key)
+            if action is not None:
+                dispatch[production.id] = action
+                found.add(key)
+
+        for lhs, rhs in self.actions:
+            if (lhs, rhs) not in found:
+                raise ValueError(f"Error: la producción {lhs} := {' '.join(rhs)} no existe en la gramática")
+
+        return tuple(dispatch)
+
+    # Funciones de conversión indexadas por id de terminal
+    # None si el valor es el lexema
+    def get_token_converters(self, grammar):
+        converters = [None] * grammar.get_num_terminals()
+
+        for name, convert in self.token_values.items():
+            symbol = grammar.find_in_simbols(name)
+            if symbol is None or not symbol.is_terminal:
+                raise ValueError(f"Error: {name} no es un terminal de la gramática")
+            converters[symbol.id] = convert
+
+        return tuple(converters)
+
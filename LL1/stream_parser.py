@@ -0,0 +1,213 @@
+from compressed_table import CompressedTable
+from compiled_table import CompiledLL1Table, NO_PRODUCTION, get_production_push
+from parse_tree import ParseTree, NO_NODE
+
+
+class LL1StreamParser:
+    # Parser LL(1) que conserva su estado entre llamadas
+    # - Modo push: se llama feed(token) o feed_many(tokens) conforme
+    #   llegan los tokens y al final finish()
+    # - Modo pull: parse(tokens) consume cualquier iterador, por
+    #   ejemplo el generador del analizador léxico
+    # Solo guarda la pila, los tokens no se guardan
+    #
+    # Un token puede ser un Symbol, el id de un terminal o la tupla
+    # (id de terminal, posición, lexema) del analizador léxico
+    # table puede ser el diccionario de la tabla LL(1), la versión
+    # compilada o la comprimida
+    # La pila es una lista de ids de símbolos sin epsilon y la tabla
+    # compilada se consulta con enteros
+    # trace es opcional y registra las tuplas
+    # (id del tope de la pila, id de terminal, id de producción)
+    # Si build_tree es verdadero se construye el árbol de sintaxis
+    # concreta en self.tree a partir de las expansiones, el árbol es
+    # de la gramática sin recursión izquierda
+    # actions es un SemanticActions opcional, cada producción llama a su
+    # acción cuando termina de reconocer su lado derecho y el resultado
+    # queda en self.value
+    # Las acciones son de la gramática sin recursión izquierda
+    def __init__(self, grammar, table, trace=None, build_tree=False, actions=None):
+        self.grammar = grammar
+        self.trace = trace
+        self.build_tree = build_tree
+        self.eof_id = grammar.eof_symbol.id
+        self.start_id = grammar.start_symbol.id
+        self.first_non_terminal_id = grammar.first_non_terminal_id
+        self.num_terminals = grammar.get_num_terminals()
+
+        # Filas de ids de producción, None con la tabla comprimida
+        self.rows = None
+        if isinstance(table, CompressedTable):
+            self.get_production_id = table.get
+            self.production_push = get_production_push(grammar)
+        else:
+            # Convertimos el diccionario en la matriz densa
+            if not isinstance(table, CompiledLL1Table):
+                table = CompiledLL1Table(grammar, table)
+            self.rows = table.rows
+            self.get_production_id = table.get
+            self.production_push = table.production_push
+
+        # Los mismos ids en orden para crear los nodos del árbol
+        self.production_rhs = tuple(push[::-1] for push in self.production_push)
+
+        # Acciones indexadas por id de producción
+        # Con acciones se agrega debajo del lado derecho una marca
+        # -(id + 1) que indica que la producción se completó
+        self.dispatch = None
+        if actions is not None:
+            self.dispatch = actions.get_dispatch(grammar)
+            self.token_converters = actions.get_token_converters(grammar)
+            self.production_len = tuple(len(push) for push in self.production_push)
+            self.production_push = tuple((-1 - production_id,) + push for production_id, push in enumerate(self.production_push))
+
+        self.reset()
+
+    # Regresa el parser al estado inicial para otra cadena
+    def reset(self):
+        # Simulamos producción S' -> S$
+        self.stack = [self.eof_id, self.start_id]
+        # Número de tokens consumidos
+        self.position = 0
+        self.accepted = False
+        # Pila de valores de las acciones y valor del símbolo inicial
+        self.values = []
+        self.value = None
+
+        # Árbol y pila de nodos paralela a la pila de símbolos
+        self.tree = None
+        self.nodes = None
+        if self.build_tree:
+            self.tree = ParseTree(self.grammar.symbols_by_id)
+            self.tree.root_id = self.tree.add_node(self.start_id)
+            self.nodes = [NO_NODE, self.tree.root_id]
+
+        if self.trace is not None:
+            self.trace.start()
+
+    # Obtiene el id de terminal de un token
+    def get_token_id(self, token):
+        if isinstance(token, int):
+            return token
+        if isinstance(token, tuple):
+            return token[0]
+        return token.id
+
+    # Obtiene el valor de un token para las acciones
+    # Es el lexema convertido con la función de su terminal,
+    # los tokens sin texto usan el nombre del terminal
+    def get_token_value(self, token, token_id):
+        if isinstance(token, tuple):
+            value = token[2]
+        else:
+            value = self.grammar.symbols_by_id[token_id].name
+
+        convert = self.token_converters[token_id]
+        return convert(value) if convert is not None else value
+
+    # Consume un token
+    def feed(self, token):
+        self.feed_many((token,))
+
+    # Consume una secuencia de tokens
+    # Si llega $ se termina el parsing
+    def feed_many(self, tokens):
+        if self.accepted:
+            raise SyntaxError("Error: el parser ya llegó al final de la cadena")
+
+        stack = self.stack
+        get_production_id = self.get_production_id
+        rows = self.rows
+        get_token_id = self.get_token_id
+        production_push = self.production_push
+        first_non_terminal_id = self.first_non_terminal_id
+        eof_id = self.eof_id
+        symbols_by_id = self.grammar.symbols_by_id
+        # Registro de los pasos, None si está apagado
+        record = self.trace.get_recorder() if self.trace is not None else None
+        tree = self.tree
+        nodes = self.nodes
+        dispatch = self.dispatch
+        values = self.values
+        production_len = self.production_len if dispatch is not None else None
+
+        for token in tokens:
+            token_id = get_token_id(token)
+
+            # Operamos hasta que podamos pasar
+            # al siguiente token
+            while True:
+                top = stack.pop()
+
+                # Si es terminal veríficamos que suceda n = n
+                if top < first_non_terminal_id:
+                    # Marca de producción completa, aplicamos su acción
+                    # a los valores de su lado derecho
+                    if top < 0:
+                        production_id = -1 - top
+                        r_num = production_len[production_id]
+                        if r_num:
+                            args = values[-r_num:]
+                            del values[-r_num:]
+                            values.append(dispatch[production_id](*args))
+                        else:
+                            values.append(dispatch[production_id]())
+                        continue
+
+                    if record is not None:
+                        record((top, token_id, NO_PRODUCTION))
+
+                    if top == token_id:
+                        if tree is not None and token_id != eof_id:
+                            node = nodes.pop()
+                            tree.start[node] = self.position
+                            tree.end[node] = self.position + 1
+                        if dispatch is not None and token_id != eof_id:
+                            values.append(self.get_token_value(token, token_id))
+                        break
+                    stack.append(top)
+                    raise SyntaxError(f"Error: {symbols_by_id[top].name} != {symbols_by_id[token_id].name} en la posición {self.position}")
+
+                if rows is not None:
+                    production_id = rows[top][token_id]
+                else:
+                    production_id = get_production_id(top - first_non_terminal_id, token_id)
+
+                if record is not None:
+                    record((top, token_id, production_id))
+
+                if production_id == NO_PRODUCTION:
+                    stack.append(top)
+                    raise SyntaxError(f"Error: no existe la producción para {symbols_by_id[token_id].name} con {symbols_by_id[top].name} en la tabla LL(1) en la posición {self.position}")
+
+                stack.extend(production_push[production_id])
+
+                if tree is not None:
+                    children = tree.expand(nodes.pop(), self.production_rhs[production_id], self.position)
+                    nodes.extend(reversed(children))
+
+            self.position += 1
+
+            if token_id == eof_id:
+                self.accepted = True
+                if dispatch is not None and values:
+                    self.value = values[-1]
+                if tree is not None:
+                    tree.compute_spans()
+                return
+
+    # Indica el final de la entrada
+    # Regresa True si la cadena pertenece al lenguaje
+    def finish(self):
+        if not self.accepted:
+            self.feed_many((self.eof_id,))
+
+        if self.trace is not None:
+            self.trace.finish(True)
+        return True
+
+    # Parsea una secuencia completa de tokens desde el estado inicial
+    def parse(self, tokens):
+        self.reset()
+        self.feed_many(tokens)
+        return self.finish()
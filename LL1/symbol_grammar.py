@@ -1,7 +1,10 @@
 class Symbol:
-    def __init__(self, name, is_terminal):
+    def __init__(self, name, is_terminal, id=None):
         self.name = name
         self.is_terminal = is_terminal
+        # Identificador entero asignado por la tabla
+        # de símbolos de la gramática
+        self.id = id
 
     def __repr__(self):
-        return self.name
\ No newline at end of file
+        return self.name
@@ -0,0 +1,90 @@
+import io
+import itertools
+import contextlib
+import pytest
+from grammar_LL1 import GrammarLL1
+from compiled_table import CompiledLL1Table
+
+GRAMMARS = [
+    (['+', '*', '-', '/', 'n', '(', ')'], ['E', 'T', 'F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n']),
+    (['x', ','], ['L', 'R'], 'L', ['L := x R', 'R := , x R | epsilon']),
+]
+
+# Terminales de las cadenas que se prueban con cada gramática
+ALPHABETS = [['n', '+', '*', '(', ')'], ['x', ',']]
+
+
+def build_table(grammar_args, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    grammar = GrammarLL1(*grammar_args)
+    with contextlib.redirect_stdout(io.StringIO()):
+        table = grammar.construct_ll_1_table()
+    return grammar, table
+
+
+def accepts(parse):
+    try:
+        parse()
+    except SyntaxError:
+        return False
+    return True
+
+
+# Cada casilla de la tabla compilada es la de las filas densas
+@pytest.mark.parametrize('grammar_args', GRAMMARS)
+def test_compiled_cells(grammar_args, tmp_path, monkeypatch):
+    grammar, table = build_table(grammar_args, tmp_path, monkeypatch)
+    compiled = grammar.compile_ll_1_table(table)
+    rows = grammar.get_ll_1_rows(table)
+    first_non_terminal_id = grammar.first_non_terminal_id
+
+    assert len(compiled.rows) == len(grammar.symbols_by_id)
+    assert compiled.rows[:first_non_terminal_id] == (None,) * first_non_terminal_id
+    for num, row in enumerate(rows):
+        assert [compiled.get(num, terminal_id) for terminal_id in range(len(row))] == row
+        assert compiled.rows[num + first_non_terminal_id] == row
+
+    epsilon_id = grammar.epsilon_symbol.id
+    for production in grammar.productions:
+        rhs = tuple(symbol.id for symbol in production.rhs if symbol.id != epsilon_id)
+        assert compiled.production_rhs[production.id] == rhs
+        assert compiled.production_push[production.id] == rhs[::-1]
+
+
+# El diccionario, la tabla compilada y el parser por flujo aceptan
+# las mismas cadenas que el parser de Earley
+@pytest.mark.parametrize('grammar_args, terminals', list(zip(GRAMMARS, ALPHABETS)))
+def test_compiled_parse(grammar_args, terminals, tmp_path, monkeypatch):
+    grammar, table = build_table(grammar_args, tmp_path, monkeypatch)
+    compiled = grammar.compile_ll_1_table(table)
+    stream_parser = grammar.get_ll_1_parser(compiled)
+    recognizer = grammar.get_earley_parser()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for length in range(7):
+            for names in itertools.product(terminals, repeat=length):
+                tokens = [grammar.symbols[name] for name in names]
+                expected = accepts(lambda: recognizer.recognize(tokens))
+
+                assert accepts(lambda: grammar.parse_ll_1_string(list(tokens), compiled)) == expected, names
+                assert accepts(lambda: grammar.parse_ll_1_string(list(tokens), table)) == expected, names
+                assert accepts(lambda: stream_parser.parse(tokens)) == expected, names
+
+
+# El diccionario se compila una sola vez y se vuelve a compilar
+# si cambia la tabla
+def test_compiled_table_reuse(tmp_path, monkeypatch):
+    grammar, table = build_table(GRAMMARS[0], tmp_path, monkeypatch)
+    tokens = [grammar.symbols[name] for name in 'n + n'.split()]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        grammar.parse_ll_1_string(list(tokens), table)
+        compiled = grammar.compiled_table
+        grammar.parse_ll_1_string(list(tokens), table)
+        assert grammar.compiled_table is compiled
+        assert isinstance(compiled, CompiledLL1Table)
+
+        other = dict(table)
+        grammar.parse_ll_1_string(list(tokens), other)
+        assert grammar.compiled_source is other
+        assert grammar.compiled_table is not compiled
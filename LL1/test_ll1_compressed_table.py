@@ -0,0 +1,86 @@
+import io
+import random
+import itertools
+import contextlib
+import pytest
+from grammar_LL1 import GrammarLL1
+from compressed_table import CompressedTable
+from compiled_table import NO_PRODUCTION
+
+EXPRESSION_GRAMMAR = (['+', '*', '-', '/', 'n', '(', ')'], ['E', 'T', 'F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
+
+
+# Matriz con filas y columnas repetidas, valores >= 0 y -1 como vacío
+def random_rows(seed):
+    generator = random.Random(seed)
+    num_cols = generator.randint(1, 12)
+    rows = []
+    for _ in range(generator.randint(1, 15)):
+        if rows and generator.random() < 0.3:
+            rows.append(list(generator.choice(rows)))
+            continue
+        rows.append([generator.choice([-1, -1, -1, 0, 1, 2]) for _ in range(num_cols)])
+
+    duplicate = generator.randrange(num_cols)
+    for row in rows:
+        row.append(row[duplicate])
+    return rows, num_cols + 1
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_compressed_table_cells(seed):
+    rows, num_cols = random_rows(seed)
+
+    table = CompressedTable(rows, num_cols, -1)
+    for num, row in enumerate(rows):
+        assert [table.get(num, col) for col in range(num_cols)] == row
+
+    # Con valor por defecto solo cambian las casillas vacías
+    table = CompressedTable(rows, num_cols, -1, use_defaults=True)
+    for num, row in enumerate(rows):
+        default = table.default[num]
+        assert default == -1 or default in row
+        for col, value in enumerate(row):
+            assert table.get(num, col) == (value if value != -1 else default)
+
+
+# Las filas repetidas comparten su lugar en el arreglo
+def test_compressed_table_shared_rows():
+    rows = [[1, -1, 2], [-1, 3, -1], [1, -1, 2], [-1, 3, -1]]
+    table = CompressedTable(rows, 3, -1)
+
+    assert list(table.row_class) == [0, 1, 0, 1]
+    assert table.base[2] == table.base[0] and table.base[3] == table.base[1]
+    assert [[table.get(num, col) for col in range(3)] for num in range(4)] == rows
+
+
+def accepts(grammar, table, names):
+    try:
+        grammar.parse_ll_1_string([grammar.symbols[name] for name in names], table)
+    except SyntaxError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize('default_productions', [False, True])
+def test_compress_ll_1_table(default_productions, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    grammar = GrammarLL1(*EXPRESSION_GRAMMAR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        table = grammar.construct_ll_1_table()
+    compressed = grammar.compress_ll_1_table(table, default_productions)
+    rows = grammar.get_ll_1_rows(table)
+
+    for num, row in enumerate(rows):
+        default = compressed.default[num]
+        assert default == NO_PRODUCTION or (default_productions and default in row)
+        for terminal_id, production_id in enumerate(row):
+            # Las casillas vacías toman la producción por defecto
+            assert compressed.get(num, terminal_id) == (production_id if production_id != NO_PRODUCTION else default)
+
+    # La producción por defecto solo retrasa el error, se aceptan
+    # las mismas cadenas
+    terminals = ['n', '+', '*', '(', ')']
+    for length in range(6):
+        for names in itertools.product(terminals, repeat=length):
+            assert accepts(grammar, compressed, names) == accepts(grammar, table, names), names
@@ -0,0 +1,94 @@
+import pytest
+from grammar import Grammar
+from lexer import MAX_TOKEN_LOOKAHEAD
+
+
+def make_grammar(terminals):
+    return Grammar(terminals, ['S'], 'S', [f"S := {terminals[0]}"])
+
+
+def get_tokens(grammar, text):
+    return [(grammar.symbols_by_id[terminal_id].name, lexeme) for terminal_id, _, lexeme in grammar.tokenize(text)]
+
+
+# Gana la coincidencia más larga aunque otra regla se declare antes
+def test_longest_match():
+    grammar = make_grammar(['=', '==', 'id'])
+    grammar.lexer.add_regex('id', r'[a-z]+')
+    grammar.lexer.add_ignore(r'\s+')
+
+    assert get_tokens(grammar, 'a == b = c') == [('id', 'a'), ('==', '=='), ('id', 'b'), ('=', '='), ('id', 'c')]
+
+
+# Con la misma longitud gana la prioridad, luego la literal
+# y por último la regla declarada primero
+def test_priority():
+    grammar = make_grammar(['if', 'id', 'word'])
+    grammar.lexer.add_regex('id', r'[a-z]+')
+    grammar.lexer.add_regex('word', r'[a-z]+', priority=1)
+    grammar.lexer.add_ignore(r'\s+')
+
+    assert get_tokens(grammar, 'if ifx') == [('word', 'if'), ('word', 'ifx')]
+
+
+def test_literal_beats_regex():
+    grammar = make_grammar(['if', 'id'])
+    grammar.lexer.add_regex('id', r'[a-z]+')
+    grammar.lexer.add_ignore(r'\s+')
+
+    assert get_tokens(grammar, 'if iff') == [('if', 'if'), ('id', 'iff')]
+
+
+def test_unexpected_character():
+    grammar = make_grammar(['id'])
+    grammar.lexer.add_regex('id', r'[a-z]+')
+
+    with pytest.raises(SyntaxError):
+        list(grammar.tokenize('ab?'))
+
+
+# Los tokens partidos entre dos bloques se reconocen completos
+def test_chunk_boundaries():
+    grammar = make_grammar(['n', '+'])
+    grammar.lexer.add_regex('n', r'\d+')
+    grammar.lexer.add_ignore(r'\s+')
+    text = ' + '.join(str(number) for number in range(5000))
+
+    expected = list(grammar.tokenize(text))
+    for chunk_size in (1, 7, MAX_TOKEN_LOOKAHEAD + 3):
+        chunks = [text[start:start + chunk_size] for start in range(0, len(text), chunk_size)]
+        assert list(grammar.lexer.tokenize_chunks(chunks)) == expected
+
+
+# Reglas con grupos, referencias y banderas globales se prueban
+# con su propia expresión y no con la expresión maestra
+def test_backreference():
+    grammar = make_grammar(['pair', 'id'])
+    grammar.lexer.add_regex('pair', r'(a)\1')
+    grammar.lexer.add_regex('id', r'[b-z]+')
+
+    assert get_tokens(grammar, 'aabb') == [('pair', 'aa'), ('id', 'bb')]
+
+
+def test_inline_flags():
+    grammar = make_grammar(['id', 'n'])
+    grammar.lexer.add_regex('id', r'(?i)[a-z]+')
+    grammar.lexer.add_regex('n', r'\d+')
+
+    assert get_tokens(grammar, 'AbC12') == [('id', 'AbC'), ('n', '12')]
+
+
+def test_repeated_group_names():
+    grammar = make_grammar(['string', 'char'])
+    grammar.lexer.add_regex('string', r'(?P<quote>")[^"]*(?P=quote)')
+    grammar.lexer.add_regex('char', r"(?P<quote>')[^']?(?P=quote)")
+
+    assert get_tokens(grammar, '"ab"\'c\'') == [('string', '"ab"'), ('char', "'c'")]
+
+
+def test_invalid_regex():
+    grammar = make_grammar(['id'])
+    grammar.lexer.add_regex('id', r'[a-z')
+
+    with pytest.raises(ValueError):
+        list(grammar.tokenize('a'))
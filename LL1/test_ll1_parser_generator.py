@@ -0,0 +1,48 @@
+import io
+import contextlib
+import pytest
+from grammar_LL1 import GrammarLL1
+from parser_generator import generate_ll_1_descent_parser
+
+
+def build_descent_parser(grammar):
+    with contextlib.redirect_stdout(io.StringIO()):
+        table = grammar.construct_ll_1_table()
+
+    module = {}
+    exec(generate_ll_1_descent_parser(grammar, table), module)
+    return module
+
+
+# Un no terminal llamado names no puede reemplazar a parse_names
+def test_descent_function_names(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    grammar = GrammarLL1(['x', ','], ['names', 'parse'], 'names', ['names := x parse', 'parse := , x parse | epsilon'])
+    module = build_descent_parser(grammar)
+
+    assert module['parse_names'](['x', ',', 'x'])
+    assert f"parse_names_{grammar.symbols['names'].id}" in module
+    assert 'parse_parse' in module
+
+
+# La recursión derecha que deja remove_left_recursion es un ciclo
+def test_descent_right_recursion_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    grammar = GrammarLL1(['+', 'n'], ['E'], 'E', ['E := E + n | n'])
+    module = build_descent_parser(grammar)
+
+    assert module['parse_names'](['n'] + ['+', 'n'] * 20000)
+
+
+# S := S b y S := S se quedan sin producciones de S al quitar la recursión
+# izquierda, parse_S debe existir y rechazar la cadena
+def test_descent_no_productions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for productions in (['S := S b'], ['S := S']):
+        grammar = GrammarLL1(['b'], ['S'], 'S', productions)
+        module = build_descent_parser(grammar)
+
+        assert 'parse_S' in module
+        for names in ([], ['b'], ['b', 'b']):
+            with pytest.raises(SyntaxError):
+                module['parse_names'](names)
@@ -0,0 +1,49 @@
+import argparse, csv, json, sys
+from batch_parse import DEFAULT_GRAMMAR, build_grammar
+from grammar_LL1 import DEFAULT_CACHE_DIR
+from table_cache import get_grammar_fingerprint
+from parse_trace import ParseTrace
+from trace_sink import BinaryTraceReader
+
+# Muestra los pasos de documentos guardados en un archivo binario
+# escrito con batch_parse.py --trace-format binary
+# Solo se leen del archivo los pasos de los documentos pedidos
+def main():
+    parser = argparse.ArgumentParser(description='Muestra los pasos LL(1) de un archivo binario')
+    parser.add_argument('trace_file', help='archivo binario de pasos')
+    parser.add_argument('documents', type=int, nargs='*', help='número de cada documento desde 0, sin números muestra cuántos hay')
+    parser.add_argument('-g', '--grammar', help='archivo JSON con la gramática usada al parsear')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    description = DEFAULT_GRAMMAR
+    if args.grammar:
+        with open(args.grammar, encoding='utf-8') as file:
+            description = json.load(file)
+
+    reader = BinaryTraceReader(args.trace_file)
+
+    if not args.documents:
+        print(f"Documentos: {reader.num_documents}")
+        return
+
+    # La tabla define las producciones con las que se registraron los pasos
+    grammar = build_grammar(description)
+    grammar.load_or_build_ll_1_table(args.cache_dir)
+
+    if get_grammar_fingerprint(grammar, 'll1') != reader.fingerprint:
+        raise ValueError("Error: el archivo de pasos pertenece a otra gramática")
+
+    writer = csv.writer(sys.stdout, delimiter=',', quoting=csv.QUOTE_MINIMAL)
+
+    for num in args.documents:
+        steps, accepted, complete = reader.get_document(num)
+        trace = ParseTrace.from_steps(steps, complete)
+        print(f"# Documento {num}: {'aceptado' if accepted else 'rechazado'}, {len(steps)} pasos")
+        writer.writerow(grammar.get_ll_1_trace_header(trace))
+        writer.writerows(grammar.get_ll_1_trace_rows(trace))
+
+    reader.close()
+
+if __name__ == '__main__':
+    main()
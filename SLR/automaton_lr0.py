@@ -1,7 +1,5 @@
-from utils.canonical_item import Item
-from utils.production import Production
+from collections import deque
 from utils.state import State
-from utils.symbol_grammar import Symbol
 #from grammar_SLR import GrammarSLR
 
 class AutomatonLR0():
@@ -17,63 +15,61 @@ class AutomatonLR0():
         # Obtenemos el primer símbolo y producción de la gramática
         grammar_first_symbol = self.grammar.start_symbol
         grammar_first_production = (self.grammar.get_productions_by_symbol_lhs(grammar_first_symbol))[0]
-
-        # Cremamos una nueva producción para no modificar la original
-        first_production = Production(
-            Symbol(grammar_first_symbol.name, False),
-            [Symbol(symbol.name, symbol.is_terminal) for symbol in grammar_first_production.rhs]
-        )
         
         # Construimos I_0
-        i_0 = Item(first_production)
+        i_0 = self.grammar.get_item(grammar_first_production)
 
         # Construimos S_0
         # Aplicando cerradura al primer item
-        current_id = 0
-        s_0 = State(self.grammar.closure([i_0]), current_id)
+        s_0 = State(self.grammar.closure([i_0]), 0, kernel=[i_0])
 
         # Lista de estados
         states = [s_0] 
 
         # Lista de id para evitar incluir estados duplicados
-        unique_states = {s_0.get_items(): current_id}
-        current_id += 1
-
-        # Creamos los estados recursivamente
-        added = True
-
-        # Obtenemos los simbolos de la gramática
-        terminals = self.grammar.terminal_symbols
-        non_terminals = self.grammar.non_terminal_symbols
-        epsilon_symbol = self.grammar.find_in_simbols("epsilon")
-        non_terminals.remove(epsilon_symbol)
-
-        while added:
-            added = False
-            # Verificamos cada estado en la lista 
-            for state in states:
-                # Iteramos sobre cada simbolo
-                for symbol in terminals + non_terminals:
-                    # Obtenemos los items canónicos al hacer GOTO con el símbolo
-                    new_items = self.grammar.goto_operation(state, Symbol(symbol.name, symbol in terminals))
-
-                    # Si obtenemos items con el símbolo
-                    if new_items:
-                        # Creamos un nuevo estado
-                        new_state = State(new_items, current_id)
-                        
-                        # Verificamos si el estado ya ha sido creado
-                        items = new_state.get_items()
-
-                        if items not in unique_states:
-                            # Si no ha sido agregado lo agremamos xd
-                            unique_states[items] = current_id
-                            states.append(new_state)
-                            current_id += 1
-                            added = True
-                        
-                        # Agregamos sus transiciones 
-                        state.transitions[symbol] = unique_states[items]
+        unique_states = {s_0.get_items(): s_0.id}
+
+        # Cola de estados por expandir
+        # Cada estado se expande una sola vez
+        pending = deque([s_0])
+
+        epsilon_symbol = self.grammar.epsilon_symbol
+
+        while pending:
+            state = pending.popleft()
+
+            # Agrupamos los items por el símbolo que sigue al punto
+            # en una sola pasada, E := a.Rb -> R: [E := aR.b]
+            kernels = {}
+
+            for item in state.items:
+                rhs = item.production.rhs
+                # E := aR. omitimos
+                if item.dot_position < len(rhs):
+                    symbol = rhs[item.dot_position]
+                    # No hay transiciones con epsilon
+                    if symbol == epsilon_symbol:
+                        continue
+                    kernels.setdefault(symbol, []).append(self.grammar.get_item(item.production, item.dot_position+1))
+
+            # Procesamos los símbolos en el orden de la tabla de símbolos
+            for symbol in sorted(kernels, key=lambda symbol: symbol.id):
+                # Creamos un nuevo estado con la cerradura del kernel
+                kernel = kernels[symbol]
+                new_state = State(self.grammar.closure(kernel), len(states), kernel=kernel)
+
+                # Verificamos si el estado ya ha sido creado
+                items = new_state.get_items()
+
+                if items not in unique_states:
+                    # Si no ha sido agregado lo agregamos y lo
+                    # encolamos para expandirlo después
+                    unique_states[items] = new_state.id
+                    states.append(new_state)
+                    pending.append(new_state)
+                
+                # Agregamos sus transiciones 
+                state.transitions[symbol] = unique_states[items]
 
         return states
 
@@ -83,7 +79,7 @@ class AutomatonLR0():
         for state in self.states:
             for item in state.items:
                 rhs = item.production.rhs
-                if rhs[item.dot_position-1].name == "$":
+                if item.dot_position > 0 and rhs[item.dot_position-1].name == "$":
                     state.is_final = True
 
     # Obtiene todos los estados que tienen una 
@@ -0,0 +1,136 @@
+import time
+from collections import deque
+from utils.state import StateLR1
+from automaton_lr0 import AutomatonLR0
+
+class AutomatonLR1(AutomatonLR0):
+    # Autómata LR(1) cuyos items llevan un bitset de terminales
+    # Si merge es verdadero un kernel nuevo se une a un estado con el
+    # mismo núcleo LR(0) cuando son débilmente compatibles (Pager), así
+    # el número de estados queda cerca del de LALR sin sus conflictos
+    # Si merge es falso solo se unen kernels idénticos, LR(1) canónico
+    def __init__(self, grammar, merge=True):
+        self.merge = merge
+
+        start = time.perf_counter()
+        super().__init__(grammar)
+        # Tiempo de construcción en segundos
+        self.build_time = time.perf_counter() - start
+
+    # Dos kernels con el mismo núcleo son débilmente compatibles si
+    # para cada par de items i, j no se mezclan sus terminales, o
+    # ya compartían terminales en alguno de los dos kernels
+    def is_compatible(self, old, new):
+        if not self.merge:
+            return old == new
+
+        ids = list(old)
+        for num, i in enumerate(ids):
+            for j in ids[num + 1:]:
+                if (new[i] & old[j]) or (new[j] & old[i]):
+                    if not (old[i] & old[j]) and not (new[i] & new[j]):
+                        return False
+        return True
+
+    def construct_states(self):
+        grammar = self.grammar
+        epsilon_symbol = grammar.epsilon_symbol
+
+        # Kernel inicial S' := .S$ sin terminales, $ está en la producción
+        start_production = grammar.get_productions_by_symbol_lhs(grammar.start_symbol)[0]
+        start_item = grammar.get_item(start_production)
+
+        # Kernels como diccionarios id de item -> bitset
+        kernels = [{start_item.id: 0}]
+        # Núcleo LR(0) -> ids de estados con ese núcleo
+        by_core = {frozenset(kernels[0]): [0]}
+        closures = [None]
+        transitions = [{}]
+
+        pending = deque([0])
+        queued = {0}
+
+        # Busca un estado compatible con el kernel y le agrega sus
+        # terminales o crea un estado nuevo
+        # Si el estado crece se vuelve a expandir para propagar
+        def add_kernel(kernel):
+            core = frozenset(kernel)
+
+            for id in by_core.get(core, ()):
+                old = kernels[id]
+                if self.is_compatible(old, kernel):
+                    changed = False
+                    for item_id, bits in kernel.items():
+                        if bits & ~old[item_id]:
+                            old[item_id] |= bits
+                            changed = True
+
+                    if changed and id not in queued:
+                        queued.add(id)
+                        pending.append(id)
+                    return id
+
+            id = len(kernels)
+            kernels.append(dict(kernel))
+            closures.append(None)
+            transitions.append({})
+            by_core.setdefault(core, []).append(id)
+            queued.add(id)
+            pending.append(id)
+            return id
+
+        while pending:
+            id = pending.popleft()
+            queued.discard(id)
+
+            closure = grammar.closure_lr1(kernels[id])
+            closures[id] = closure
+
+            # Agrupamos los items por el símbolo que sigue al punto
+            # E := a.Rb, L -> R: {E := aR.b: L}
+            next_kernels = {}
+            for item_id, bits in closure.items():
+                item = grammar.canonical_items[item_id]
+                rhs = item.production.rhs
+                if item.dot_position < len(rhs):
+                    symbol = rhs[item.dot_position]
+                    if symbol == epsilon_symbol:
+                        continue
+                    kernel = next_kernels.setdefault(symbol, {})
+                    next_id = grammar.get_item(item.production, item.dot_position + 1).id
+                    kernel[next_id] = kernel.get(next_id, 0) | bits
+
+            state_transitions = {}
+            for symbol in sorted(next_kernels, key=lambda symbol: symbol.id):
+                state_transitions[symbol] = add_kernel(next_kernels[symbol])
+            transitions[id] = state_transitions
+
+        return self.renumber_states(kernels, closures, transitions)
+
+    # Crea los estados alcanzables desde el inicial numerados en orden
+    # Un estado puede quedar sin transiciones hacia él si al crecer sus
+    # predecesores cambiaron de estado destino
+    def renumber_states(self, kernels, closures, transitions):
+        new_ids = {0: 0}
+        order = [0]
+        pending = deque([0])
+
+        while pending:
+            id = pending.popleft()
+            for to_state in transitions[id].values():
+                if to_state not in new_ids:
+                    new_ids[to_state] = len(order)
+                    order.append(to_state)
+                    pending.append(to_state)
+
+        canonical_items = self.grammar.canonical_items
+        states = []
+        for id in order:
+            closure = closures[id]
+            items = [canonical_items[item_id] for item_id in closure]
+            kernel = [canonical_items[item_id] for item_id in kernels[id]]
+            state = StateLR1(items, new_ids[id], closure, kernel=kernel)
+            state.transitions = {symbol: new_ids[to_state] for symbol, to_state in transitions[id].items()}
+            states.append(state)
+
+        return states
@@ -0,0 +1,199 @@
+import argparse, json, os, sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from utils.parse_trace import ParseTrace, TRACE_LEVELS, DEFAULT_TRACE_SIZE
+from grammar_SLR import GrammarSLR, DEFAULT_CACHE_DIR
+
+# Gramática usada si no se indica un archivo
+DEFAULT_GRAMMAR = {
+    'terminals': ['+','*','-','/','n', '(', ')'],
+    'non_terminals': ['E','T','F'],
+    'start': 'E',
+    'productions': ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'],
+    # Terminales reconocidos con expresiones regulares
+    # los demás se reconocen con su nombre
+    'regex': {'n': r'\d+(\.\d+)?'},
+    'ignore': [r'\s+'],
+}
+
+# Documentos por tarea enviada a un proceso
+DEFAULT_BATCH_SIZE = 1000
+
+# Parser de cada proceso, se crea una sola vez en init_worker
+worker_parser = None
+worker_grammar = None
+
+# Construye la gramática y su analizador léxico a partir
+# de la descripción en diccionario
+def build_grammar(description):
+    grammar = GrammarSLR(description['terminals'], description['non_terminals'], description['start'], description['productions'])
+    grammar.augment_grammar()
+
+    for terminal, pattern in description.get('regex', {}).items():
+        grammar.lexer.add_regex(terminal, pattern)
+    for pattern in description.get('ignore', []):
+        grammar.lexer.add_ignore(pattern)
+
+    return grammar
+
+# Inicializa un proceso: carga la tabla de la cache
+# y crea el parser que usará para todos sus documentos
+def init_worker(description, cache_dir, trace_level, trace_size):
+    global worker_parser, worker_grammar
+
+    worker_grammar = build_grammar(description)
+    table = worker_grammar.load_or_build_slr_table(cache_dir)
+    worker_parser = worker_grammar.get_slr_parser(table, ParseTrace(trace_level, trace_size))
+
+# Parsea un documento y regresa su resultado
+def parse_document(parser, grammar, text):
+    result = {'accepted': True, 'error': None, 'position': None}
+
+    try:
+        parser.parse(grammar.tokenize(text))
+    except SyntaxError as e:
+        result['accepted'] = False
+        result['error'] = str(e)
+        result['position'] = parser.position
+
+    # Pasos registrados como tuplas, con TRACE_FAILURES solo quedan
+    # si falló, se convierten a texto en el proceso principal
+    if parser.trace is not None:
+        result['trace'] = (list(parser.trace.steps), parser.trace.is_complete())
+
+    return result
+
+# Parsea un lote de documentos en el proceso actual
+def parse_batch(documents):
+    return [parse_document(worker_parser, worker_grammar, text) for text in documents]
+
+# Lee los documentos de un archivo
+# Regresa tuplas (id, texto), el id es el número de línea o
+# el campo id del objeto en JSONL
+# En JSONL cada línea es una cadena o un objeto con el campo text
+def read_documents(file, input_format):
+    for line_number, line in enumerate(file, 1):
+        line = line.rstrip('\r\n')
+
+        if input_format == 'lines':
+            yield line_number, line
+            continue
+
+        if not line.strip():
+            continue
+
+        document = json.loads(line)
+        if isinstance(document, str):
+            yield line_number, document
+        else:
+            yield document.get('id', line_number), document['text']
+
+# Agrupa los documentos en lotes
+def get_batches(documents, batch_size):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# Parsea los lotes en varios procesos
+# Regresa los resultados en el orden de la entrada, a lo más hay
+# max_in_flight lotes enviados sin haber escrito sus resultados
+# La tabla ya debe estar en la cache para que los procesos la carguen
+def parse_batches(batches, grammar, table, description, cache_dir, workers, max_in_flight, trace_level, trace_size):
+    if workers == 1:
+        parser = grammar.get_slr_parser(table, ParseTrace(trace_level, trace_size))
+        for batch in batches:
+            yield batch, [parse_document(parser, grammar, text) for _, text in batch]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(description, cache_dir, trace_level, trace_size)) as executor:
+        pending = deque()
+
+        for batch in batches:
+            if len(pending) >= max_in_flight:
+                done_batch, future = pending.popleft()
+                yield done_batch, future.result()
+
+            pending.append((batch, executor.submit(parse_batch, [text for _, text in batch])))
+
+        while pending:
+            done_batch, future = pending.popleft()
+            yield done_batch, future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description='Parsing SLR de muchos documentos en paralelo')
+    parser.add_argument('input', help='archivo de entrada, - para stdin')
+    parser.add_argument('-o', '--output', default='-', help='archivo JSONL de salida, - para stdout')
+    parser.add_argument('-f', '--format', choices=['lines', 'jsonl'], default='lines', help='un documento por línea o JSONL')
+    parser.add_argument('-g', '--grammar', help='archivo JSON con la gramática')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='número de procesos')
+    parser.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='documentos por tarea')
+    parser.add_argument('--max-in-flight', type=int, default=None, help='lotes enviados sin escribir, por defecto 2 por proceso')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--trace', choices=list(TRACE_LEVELS), default='off', help='pasos que se agregan a cada resultado')
+    parser.add_argument('--trace-size', type=int, default=DEFAULT_TRACE_SIZE, help='pasos que se conservan con --trace failures')
+    parser.add_argument('--trace-file', help='archivo donde se escriben los pasos en lugar de la salida JSONL')
+    parser.add_argument('--trace-format', choices=['csv', 'binary'], default='csv', help='formato del archivo de pasos')
+    args = parser.parse_args()
+
+    if args.trace_file and args.trace == 'off':
+        parser.error('--trace-file requiere --trace failures o full')
+
+    description = DEFAULT_GRAMMAR
+    if args.grammar:
+        with open(args.grammar, encoding='utf-8') as file:
+            description = json.load(file)
+
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = args.max_in_flight or 2 * workers
+
+    input_file = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output_file = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    # La tabla se construye una vez antes de crear los procesos
+    # así todos la cargan de la cache
+    grammar = build_grammar(description)
+    table = grammar.load_or_build_slr_table(args.cache_dir)
+
+    # Los pasos se escriben en un solo archivo abierto una vez
+    sink = grammar.open_slr_trace_sink(args.trace_file, args.trace_format) if args.trace_file else None
+
+    accepted = 0
+    total = 0
+
+    try:
+        batches = get_batches(read_documents(input_file, args.format), args.batch_size)
+
+        for batch, results in parse_batches(batches, grammar, table, description, args.cache_dir, workers, max_in_flight, TRACE_LEVELS[args.trace], args.trace_size):
+            lines = []
+            for (id, _), result in zip(batch, results):
+                accepted += result['accepted']
+
+                if 'trace' in result:
+                    trace = ParseTrace.from_steps(*result.pop('trace'))
+                    # En el formato binario se escriben todos los documentos
+                    # para que su número sea su lugar en la entrada
+                    if sink is not None:
+                        sink.write(id, trace, result['accepted'])
+                    elif trace.steps:
+                        result['trace'] = grammar.get_slr_trace_rows(trace)
+
+                lines.append(json.dumps({'id': id, **result}, ensure_ascii=False))
+            total += len(batch)
+            output_file.write('\n'.join(lines) + '\n')
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+        if sink is not None:
+            sink.close()
+
+    print(f"Documentos: {total}, aceptados: {accepted}, rechazados: {total - accepted}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
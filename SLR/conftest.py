@@ -0,0 +1,27 @@
+import pytest
+from grammar_LALR import GrammarLALR
+from grammar_LR1 import GrammarLR1
+from automaton_lr0 import AutomatonLR0
+from automaton_lr1 import AutomatonLR1
+
+
+# Las tablas escriben su archivo de resultados en el directorio actual
+@pytest.fixture(autouse=True)
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+# Aumenta la gramática y construye la tabla según su clase,
+# LALR(1), LR(1) o SLR
+def construct_table(grammar):
+    grammar.augment_grammar()
+    if isinstance(grammar, GrammarLALR):
+        return grammar.construct_lalr_table(AutomatonLR0(grammar))
+    if isinstance(grammar, GrammarLR1):
+        return grammar.construct_lr1_table(AutomatonLR1(grammar))
+    return grammar.construct_slr_table(AutomatonLR0(grammar))
+
+
+@pytest.fixture
+def build_table():
+    return construct_table
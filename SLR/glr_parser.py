@@ -0,0 +1,194 @@
+from utils.parse_table import ERROR, SHIFT, REDUCE, ACCEPT, ACTION_BITS, ACTION_MASK
+from utils.sppf import SPPF
+
+
+class GSSNode:
+    # Nodo de la pila con estructura de grafo
+    # Cada arista va a un nodo anterior y tiene el nodo del SPPF
+    # del símbolo que se leyó entre los dos
+    __slots__ = ('state', 'level', 'edges')
+
+    def __init__(self, state, level):
+        self.state = state
+        # Posición de la entrada donde se creó el nodo
+        self.level = level
+        # Lista de (nodo anterior, id de nodo del SPPF)
+        self.edges = []
+
+
+class GLRParser:
+    # Parser GLR sobre una tabla SLR, LALR(1) o LR(1)
+    # Las casillas con conflictos tienen todas sus acciones en
+    # table.conflicts, el parser sigue todas a la vez
+    # - Los caminos comparten sus prefijos en una pila con estructura
+    #   de grafo (GSS), hay un solo nodo por estado en cada posición
+    # - El resultado es un bosque compartido y empacado (SPPF) con
+    #   todas las derivaciones de la entrada
+    # En las partes sin conflictos solo hay un nodo en el frente de la
+    # pila y cada acción es una consulta a la tabla
+    #
+    # Un token puede ser un Symbol, el id de un terminal o la tupla
+    # (id de terminal, posición, lexema) del analizador léxico
+    def __init__(self, grammar, table):
+        self.grammar = grammar
+        self.eof_id = grammar.eof_symbol.id
+        # El símbolo inicial antes de aumentar la gramática, S' := S$
+        self.root_symbol_id = grammar.productions[0].rhs[0].id
+
+        self.get_action = table.get_action
+        self.get_goto = table.get_goto
+        self.conflicts = table.conflicts
+        self.production_len = table.production_len
+        self.production_lhs = table.production_lhs
+
+    # Obtiene el id de terminal de un token
+    def get_token_id(self, token):
+        if isinstance(token, int):
+            return token
+        if isinstance(token, tuple):
+            return token[0]
+        return token.id
+
+    # Todas las acciones de una casilla
+    def get_actions(self, state, terminal_id):
+        actions = self.conflicts.get((state, terminal_id))
+        if actions is not None:
+            return actions
+
+        action = self.get_action(state, terminal_id)
+        return (action,) if action != ERROR else ()
+
+    # Genera los caminos de length aristas que salen de node
+    # Regresa (nodo final, ids del SPPF de los símbolos en orden)
+    # Si edge no es None solo se generan los caminos que pasan por esa arista
+    def get_paths(self, node, length, edge=None):
+        if length == 0:
+            if edge is None:
+                yield node, ()
+            return
+
+        # (nodo, ids del SPPF invertidos, ya pasó por edge)
+        pending = [(node, (), edge is None)]
+
+        while pending:
+            current, children, crossed = pending.pop()
+
+            if len(children) == length:
+                if crossed:
+                    yield current, children[::-1]
+                continue
+
+            for current_edge in current.edges:
+                pending.append((current_edge[0], children + (current_edge[1],), crossed or current_edge is edge))
+
+    # Parsea una secuencia de tokens sin $
+    # Regresa el SPPF con todas las derivaciones o lanza SyntaxError
+    # con la posición donde ya no quedó ningún camino
+    def parse(self, tokens):
+        get_token_id = self.get_token_id
+        eof_id = self.eof_id
+
+        forest = SPPF(self.grammar.symbols_by_id)
+        # id de estado -> nodo de la posición actual
+        frontier = {0: GSSNode(0, 0)}
+        position = 0
+
+        token_ids = [get_token_id(token) for token in tokens]
+        # $ se lee una vez para el shift y otra para aceptar
+        token_ids.append(eof_id)
+        token_ids.append(eof_id)
+
+        for token_id in token_ids:
+            shifts, accepted = self.reduce_all(frontier, token_id, position, forest)
+
+            if accepted:
+                forest.root_id = forest.find_node(self.root_symbol_id, 0, position - 1)
+                return forest
+
+            if not shifts:
+                raise SyntaxError(f"Parsing incorrecto: no existe la acción para {self.grammar.symbols_by_id[token_id].name} en la posición {position}")
+
+            # Todos los shift de la posición crean nodos de la siguiente
+            terminal_node = forest.get_node(token_id, position, position + 1)
+            position += 1
+            next_frontier = {}
+
+            for node, state in shifts:
+                target = next_frontier.get(state)
+                if target is None:
+                    target = GSSNode(state, position)
+                    next_frontier[state] = target
+                target.edges.append((node, terminal_node))
+
+            frontier = next_frontier
+
+        raise SyntaxError(f"Parsing incorrecto: no se llegó al estado de aceptación en la posición {position}")
+
+    # Aplica todas las reducciones posibles en la posición actual
+    # El frente crece con los nodos de los GOTO
+    # Regresa los shift pendientes (nodo, estado) y si se aceptó
+    def reduce_all(self, frontier, token_id, position, forest):
+        get_actions = self.get_actions
+        get_goto = self.get_goto
+        production_len = self.production_len
+        production_lhs = self.production_lhs
+
+        shifts = []
+        accepted = False
+        # Reducciones pendientes (nodo, producción, arista o None)
+        # Con arista solo se siguen los caminos que pasan por ella
+        pending = []
+
+        # Clasifica las acciones de un nodo nuevo del frente
+        def add_actions(node):
+            nonlocal accepted
+
+            for action in get_actions(node.state, token_id):
+                kind = action & ACTION_MASK
+                if kind == SHIFT:
+                    shifts.append((node, action >> ACTION_BITS))
+                elif kind == REDUCE:
+                    pending.append((node, action >> ACTION_BITS, None))
+                elif kind == ACCEPT:
+                    accepted = True
+
+        for node in list(frontier.values()):
+            add_actions(node)
+
+        while pending:
+            node, production_id, edge = pending.pop()
+            length = production_len[production_id]
+            lhs_id = production_lhs[production_id]
+
+            for ancestor, children in self.get_paths(node, length, edge):
+                sppf_id = forest.get_node(lhs_id, ancestor.level, position)
+                forest.add_packed(sppf_id, production_id, children)
+
+                state = get_goto(ancestor.state, lhs_id)
+                target = frontier.get(state)
+
+                if target is None:
+                    target = GSSNode(state, position)
+                    target.edges.append((ancestor, sppf_id))
+                    frontier[state] = target
+                    add_actions(target)
+                    continue
+
+                # Si ya existe la arista el nodo del SPPF es el mismo,
+                # solo se agregó una alternativa
+                if any(parent is ancestor for parent, _ in target.edges):
+                    continue
+
+                # Arista nueva a un nodo existente (Farshi), las reducciones
+                # que ya se hicieron desde cualquier nodo del frente pueden
+                # tener caminos nuevos que pasan por ella, por ejemplo desde
+                # los GOTO de reducciones vacías construidos sobre target
+                new_edge = (ancestor, sppf_id)
+                target.edges.append(new_edge)
+
+                for frontier_node in list(frontier.values()):
+                    for action in get_actions(frontier_node.state, token_id):
+                        if action & ACTION_MASK == REDUCE and production_len[action >> ACTION_BITS] > 0:
+                            pending.append((frontier_node, action >> ACTION_BITS, new_edge))
+
+        return shifts, accepted
@@ -0,0 +1,137 @@
+import time
+from grammar_SLR import GrammarSLR, DEFAULT_CACHE_DIR
+from utils.grammar_analysis import digraph
+from automaton_lr0 import AutomatonLR0
+
+class GrammarLALR(GrammarSLR):
+    # Tabla LALR(1) sobre el mismo autómata LR(0) que SLR
+    # Los terminales de cada reducción se calculan con el algoritmo
+    # de DeRemer y Pennello en lugar de usar FOLLOW, así la tabla
+    # tiene los mismos estados que SLR y menos conflictos
+    # Se parsea con los mismos parsers que SLR
+    results_file = 'lalr_results.txt'
+
+    def __init__(self, terminal_symbols, non_terminal_symbols, start_symbol, productions):
+        super().__init__(terminal_symbols, non_terminal_symbols, start_symbol, productions)
+        # (id de estado, id de producción) -> bitset de terminales
+        self.lookaheads = {}
+
+    # Calcula los terminales de cada reducción del autómata
+    # Trabaja sobre las transiciones (p, A) de estados con no terminales
+    # - DR(p, A): terminales que se pueden leer después de A
+    # - (p, A) reads (r, C) si p -A-> r -C-> y C es anulable
+    # - (p, A) includes (p', B) si B := βAγ, p' -β-> p y γ es anulable
+    # - (q, A := ω) lookback (p, A) si p -ω-> q
+    # Read = digraph(reads, DR), Follow = digraph(includes, Read) y
+    # LA(q, A := ω) es la unión de Follow(p, A) con (p, A) en lookback
+    def compute_lalr_lookaheads(self, lr0_automaton: AutomatonLR0):
+        analysis = self.analyze()
+        nullable = analysis.nullable
+        epsilon_id = self.epsilon_symbol.id
+        states = lr0_automaton.states
+
+        # Transiciones de estado con ids de símbolo
+        # id de estado -> {id de símbolo: id de estado}
+        goto = [{symbol.id: to_state for symbol, to_state in state.transitions.items()} for state in states]
+
+        # Enumeramos las transiciones con no terminales
+        # (p, id de A) -> número de transición
+        transitions = {}
+        for state in states:
+            for symbol_id in goto[state.id]:
+                if symbol_id >= self.first_non_terminal_id:
+                    transitions[(state.id, symbol_id)] = len(transitions)
+
+        direct_read = {}
+        reads = {}
+        for (state_id, symbol_id), num in transitions.items():
+            to_state = goto[state_id][symbol_id]
+            bits = 0
+            successors = []
+
+            for next_id in goto[to_state]:
+                if next_id < self.first_non_terminal_id:
+                    bits |= 1 << next_id
+                elif next_id in nullable:
+                    successors.append(transitions[(to_state, next_id)])
+
+            direct_read[num] = bits
+            reads[num] = successors
+
+        read = digraph(range(len(transitions)), reads, direct_read)
+
+        # Recorremos cada producción desde los estados con
+        # transición en su lado izquierdo para obtener includes y lookback
+        includes = {num: [] for num in transitions.values()}
+        lookback = {}
+
+        for (state_id, lhs_id), num in transitions.items():
+            for production in self.productions_by_lhs.get(lhs_id, ()):
+                rhs = [symbol.id for symbol in production.rhs if symbol.id != epsilon_id]
+                current = state_id
+
+                for position, symbol_id in enumerate(rhs):
+                    # B := βAγ con γ anulable
+                    if symbol_id >= self.first_non_terminal_id and all(id in nullable for id in rhs[position + 1:]):
+                        includes[transitions[(current, symbol_id)]].append(num)
+                    current = goto[current][symbol_id]
+
+                lookback.setdefault((current, production.id), []).append(num)
+
+        follow = digraph(range(len(transitions)), includes, read)
+
+        self.lookaheads = {}
+        for key, nums in lookback.items():
+            bits = 0
+            for num in nums:
+                bits |= follow[num]
+            self.lookaheads[key] = bits
+
+        return self.lookaheads
+
+    # Bitset de los terminales con los que se reduce un item
+    # La producción S' := S$ solo acepta con $
+    def get_reduce_lookahead(self, state, item):
+        if item.production.lhs == self.start_symbol:
+            return 1 << self.eof_symbol.id
+        return self.lookaheads.get((state.id, item.production.id), 0)
+
+    # Construye la tabla LALR(1) con el autómata LR(0)
+    # Los resultados legibles se guardan en lalr_results.txt
+    def construct_lalr_table(self, lr0_automaton: AutomatonLR0):
+        self.compute_lalr_lookaheads(lr0_automaton)
+        return self.construct_slr_table(lr0_automaton)
+
+    # Obtiene la tabla LALR(1) de la cache si ya fue construida
+    # para esta gramática, si no la construye y la guarda
+    def load_or_build_lalr_table(self, cache_dir=DEFAULT_CACHE_DIR):
+        return self.load_or_build_table('lalr', lambda: self.construct_lalr_table(AutomatonLR0(self)), cache_dir)
+
+if __name__ == '__main__':
+    # Gramática de asignaciones, es LALR(1) pero no SLR
+    # pues = está en FOLLOW(R)
+    description = (['=', '*', 'id'], ['S', 'L', 'R'], 'S', ['S := L = R | R', 'L := * R | id', 'R := L'])
+    grammar = GrammarLALR(*description)
+    grammar.augment_grammar()
+    grammar.lexer.add_ignore(r'\s+')
+
+    start = time.perf_counter()
+    automaton = AutomatonLR0(grammar)
+    lalr_table = grammar.construct_lalr_table(automaton)
+    elapsed = time.perf_counter() - start
+
+    # La misma gramática con SLR para comparar los conflictos
+    slr_grammar = GrammarSLR(*description)
+    slr_grammar.augment_grammar()
+    slr_table = slr_grammar.construct_slr_table(AutomatonLR0(slr_grammar))
+
+    print(f"Estados: {len(automaton.states)}, construcción LALR(1) en {elapsed:.6f} s")
+    print(f"Conflictos SLR: {len(slr_table.conflicts)}, conflictos LALR(1): {len(lalr_table.conflicts)}")
+
+    for string in ["id = * id", "* id", "id ="]:
+        try:
+            parser = grammar.get_slr_parser(lalr_table)
+            parser.parse(grammar.tokenize(string))
+            print(f"{string}: aceptada")
+        except SyntaxError as e:
+            print(f"{string}: {e}")
@@ -0,0 +1,107 @@
+from grammar_SLR import GrammarSLR, DEFAULT_CACHE_DIR
+from automaton_lr0 import AutomatonLR0
+from automaton_lr1 import AutomatonLR1
+
+class GrammarLR1(GrammarSLR):
+    # Tabla LR(1) con unión de estados de Pager
+    # Los items llevan sus terminales como bitsets y los estados con
+    # el mismo núcleo se unen si son débilmente compatibles
+    # Se parsea con los mismos parsers que SLR
+    results_file = 'lr1_results.txt'
+
+    # Reinicia los terminales precalculados de cada item
+    # cada vez que cambian las producciones de la gramática
+    def index_productions(self):
+        super().index_productions()
+        # id de item E := a.Rb -> (FIRST(b) sin epsilon, b es anulable)
+        self.item_follow = {}
+
+    # Terminales que siguen al no terminal después del punto
+    # E := a.Rb -> (FIRST(b) sin epsilon, b es anulable)
+    def get_item_follow(self, item):
+        follow = self.item_follow.get(item.id)
+
+        if follow is None:
+            analysis = self.analyze()
+            bits = analysis.get_first_bits_sequence(item.production.rhs[item.dot_position + 1:])
+            follow = (bits & ~analysis.epsilon_bit, bool(bits & analysis.epsilon_bit))
+            self.item_follow[item.id] = follow
+
+        return follow
+
+    # Cerradura LR(1) de un kernel id de item -> bitset
+    # E := a.Rb, L agrega R := .alpha con FIRST(b) y L si b es anulable
+    # Los terminales se propagan con una lista de trabajo hasta
+    # que ningún item crece
+    def closure_lr1(self, kernel):
+        canonical_items = self.canonical_items
+        closure = dict(kernel)
+        pending = list(kernel)
+
+        while pending:
+            item = canonical_items[pending.pop()]
+            rhs = item.production.rhs
+
+            # E := aR. omitimos
+            if item.dot_position >= len(rhs):
+                continue
+
+            next_symbol = rhs[item.dot_position]
+            if next_symbol.is_terminal or next_symbol == self.epsilon_symbol:
+                continue
+
+            first, nullable = self.get_item_follow(item)
+            lookahead = first | closure[item.id] if nullable else first
+
+            for production in self.get_productions_by_symbol_lhs(next_symbol):
+                new_id = self.get_item(production, 0).id
+                bits = closure.get(new_id, 0)
+
+                if new_id not in closure or lookahead & ~bits:
+                    closure[new_id] = bits | lookahead
+                    pending.append(new_id)
+
+        return closure
+
+    # Bitset de los terminales con los que se reduce un item
+    # La producción S' := S$ solo acepta con $
+    def get_reduce_lookahead(self, state, item):
+        if item.production.lhs == self.start_symbol:
+            return 1 << self.eof_symbol.id
+        return state.lookaheads[item.id]
+
+    # Construye la tabla LR(1) con el autómata LR(1)
+    # Los resultados legibles se guardan en lr1_results.txt
+    def construct_lr1_table(self, lr1_automaton: AutomatonLR1):
+        return self.construct_slr_table(lr1_automaton)
+
+    # Obtiene la tabla LR(1) de la cache si ya fue construida
+    # para esta gramática, si no construye el autómata y la tabla
+    def load_or_build_lr1_table(self, cache_dir=DEFAULT_CACHE_DIR):
+        return self.load_or_build_table('lr1', lambda: self.construct_lr1_table(AutomatonLR1(self)), cache_dir)
+
+if __name__ == '__main__':
+    # Gramática LR(1) que no es LALR(1), al unir los estados de
+    # A := c. y B := c. aparece un conflicto reduce/reduce
+    grammar = GrammarLR1(['a', 'b', 'c', 'd', 'e'], ['S', 'A', 'B'], 'S', ['S := a A d | b B d | a B e | b A e', 'A := c', 'B := c'])
+    grammar.augment_grammar()
+    grammar.lexer.add_ignore(r'\s+')
+
+    lr0_automaton = AutomatonLR0(grammar)
+    canonical = AutomatonLR1(grammar, merge=False)
+    merged = AutomatonLR1(grammar)
+
+    print(f"Estados LR(0): {len(lr0_automaton.states)}")
+    print(f"Estados LR(1) canónico: {len(canonical.states)} en {canonical.build_time:.6f} s")
+    print(f"Estados LR(1) con unión de Pager: {len(merged.states)} en {merged.build_time:.6f} s")
+
+    table = grammar.construct_lr1_table(merged)
+    print(f"Conflictos LR(1): {len(table.conflicts)}")
+
+    for string in ["a c d", "b c d", "a c e", "b c e", "a c"]:
+        try:
+            parser = grammar.get_slr_parser(table)
+            parser.parse(grammar.tokenize(string))
+            print(f"{string}: aceptada")
+        except SyntaxError as e:
+            print(f"{string}: {e}")
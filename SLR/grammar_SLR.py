@@ -1,52 +1,147 @@
-import re, copy, csv
-from collections import deque
+from collections import OrderedDict
 from utils.grammar import Grammar
+from utils.grammar_analysis import digraph, iterate_bits
 from utils.canonical_item import Item
 from utils.symbol_grammar import Symbol
 from utils.state import State
+from utils.table_cache import get_grammar_fingerprint, get_cache_path, save_tables, load_tables
+from utils.trace_sink import CsvTraceSink, BinaryTraceSink
+from utils.parse_trace import ParseTrace, TRACE_FULL
+from utils.parse_tree import ParseTree
+from utils.semantic_actions import SemanticActions, default_action
+from utils.parse_table import ParseTable, CompressedParseTable, encode_action, format_action, ERROR, SHIFT, REDUCE, ACCEPT, ACTION_BITS, ACTION_MASK
 from automaton_lr0 import AutomatonLR0
+from stream_parser import SLRStreamParser
+from glr_parser import GLRParser
+
+# Directorio donde se guardan las tablas compiladas
+DEFAULT_CACHE_DIR = '__tablecache__'
+
+# Asociatividades de las declaraciones de precedencia
+LEFT = 'left'
+RIGHT = 'right'
+NONASSOC = 'nonassoc'
+
+# Acción legible de un paso registrado
+# Las casillas vacías solo aparecen en el paso donde falla el parsing
+def format_trace_action(action):
+    return format_action(action) if action != ERROR else 'error'
 
 class GrammarSLR(Grammar):
+    # Número máximo de cerraduras guardadas en la cache
+    closure_cache_size = 4096
+    # Archivo con los resultados legibles de la tabla
+    results_file = 'slr_results.txt'
 
     def __init__(self, terminal_symbols, non_terminal_symbols, start_symbol, productions):
         super().__init__(terminal_symbols, non_terminal_symbols, start_symbol, productions)
         self.enum_productions = {}
+        # Declaraciones de precedencia como en yacc
+        # nombre de terminal -> (nivel, asociatividad)
+        # Los niveles mayores tienen más precedencia
+        self.precedence = {}
+        # (lado izquierdo, lado derecho) -> nombre con la precedencia
+        # de la producción, como %prec en yacc
+        self.production_precedence = {}
+
+    # Reinicia la cerradura precalculada cada vez
+    # que cambian las producciones de la gramática
+    def index_productions(self):
+        super().index_productions()
+        # id de no terminal -> items E := .alpha que introduce
+        self.closure_items = None
+        # Cache LRU kernel -> cerradura
+        self.closure_cache = OrderedDict()
+
+        # Items canónicos internados
+        # El id del item E := a.R es el inicio de su producción
+        # más la posición del punto
+        self.item_offsets = []
+        offset = 0
+        for production in self.productions:
+            self.item_offsets.append(offset)
+            offset += len(production.rhs) + 1
+        self.canonical_items = [None] * offset
+
+    # Obtiene el único item (producción, punto) de la gramática
+    # Lo crea la primera vez que se solicita
+    def get_item(self, production, dot_position=0):
+        id = self.item_offsets[production.id] + dot_position
+        item = self.canonical_items[id]
+
+        if item is None:
+            item = Item(production, dot_position, id)
+            self.canonical_items[id] = item
+
+        return item
+
+    # Precalcula para cada no terminal los items que agrega
+    # a la cerradura, E := a.R agrega R := .alpha y de forma
+    # transitiva los items de los no terminales al inicio de alpha
+    def prepare_closure(self):
+        non_terminals = [symbol for symbol in self.non_terminal_symbols if symbol != self.epsilon_symbol]
+
+        # R introduce a S si R := S beta
+        base = {}
+        relation = {}
+        for symbol in non_terminals:
+            base[symbol.id] = 1 << symbol.id
+            relation[symbol.id] = []
+
+        for production in self.productions:
+            first_symbol = production.rhs[0]
+            if not first_symbol.is_terminal and first_symbol != self.epsilon_symbol:
+                relation[production.lhs.id].append(first_symbol.id)
+
+        introduced = digraph([symbol.id for symbol in non_terminals], relation, base)
+
+        # Creamos los items de cada no terminal una sola vez
+        self.closure_items = {}
+        for symbol in non_terminals:
+            items = []
+            for id in iterate_bits(introduced[symbol.id]):
+                for production in self.get_productions_by_symbol_lhs(self.get_symbol_by_id(id)):
+                    items.append(self.get_item(production, 0))
+            self.closure_items[symbol.id] = items
 
     # Obtenemos la cerradura de un item
     # E := a.R
+    # La cerradura es el kernel más la unión de los items
+    # precalculados de cada no terminal que sigue a un punto
     def closure(self, items: list[Item]):
-        closure = set(items)
-        added = True
-        while added:
-            added = False
-            new_items = set()
-
-            closure_list = list(closure)
-
-            # Iteramos sobre todos los items del estado
-            for item in closure_list:
-                # Si podemos mover el punto operamos
-                # E := a.R | E := a.a continuamos
-                # E := aR. omitimos
-                if item.dot_position < len(item.production.rhs):
-                    rhs = item.production.rhs
-                    dot_position = item.dot_position
-                    next_symbol = rhs[dot_position]
-                    # Si es un no terminal continuamos
-                    # E := a.R
-                    if not next_symbol.is_terminal:
-                        for production in self.productions:
-                            lhs = production.lhs
-                            # Si el lado izquierdo coincide con el símbolo agregamos
-                            # las producciones a la cerradura
-                            if lhs.name == next_symbol.name:
-                                # Creamos un nuevo item canónico
-                                new_item = Item(production, 0)
-                                # Verificamos si el item ya ha sido creado
-                                if not any(curr_item.is_equal(new_item) for curr_item in closure):
-                                    new_items.add(new_item)
-                                    added = True
-                closure.update(new_items)
+        if self.closure_items is None:
+            self.prepare_closure()
+
+        # Identificamos el kernel por los ids de sus items
+        kernel = frozenset(items)
+        key = frozenset(item.id for item in kernel)
+
+        # Si ya calculamos la cerradura de este kernel la reutilizamos
+        cache = self.closure_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        closure = set(kernel)
+        expanded = set()
+
+        for item in kernel:
+            # E := aR. omitimos
+            if item.dot_position < len(item.production.rhs):
+                next_symbol = item.production.rhs[item.dot_position]
+                # Si es un no terminal agregamos sus items
+                # E := a.R
+                if not next_symbol.is_terminal and next_symbol.id not in expanded:
+                    expanded.add(next_symbol.id)
+                    closure.update(self.closure_items.get(next_symbol.id, ()))
+
+        closure = frozenset(closure)
+
+        # Guardamos en la cache y descartamos la menos usada
+        cache[key] = closure
+        if len(cache) > self.closure_cache_size:
+            cache.popitem(last=False)
+
         return closure
     
     # Operacion GOTO
@@ -69,58 +164,130 @@ class GrammarSLR(Grammar):
                 if item.production.rhs[item.dot_position].name == symbol.name:
                     # Construimos y agregamos el siguiente item con la misma producción
                     # pero moviendo el punto en una posición
-                    next_items.add(Item(item.production, item.dot_position+1))
+                    next_items.add(self.get_item(item.production, item.dot_position+1))
         
         return self.closure(next_items)
+
+    # Declara un nivel de precedencia, %left, %right o %nonassoc
+    # Cada llamada tiene más precedencia que las anteriores
+    # Los nombres pueden no ser terminales para usarlos con
+    # set_production_precedence, como UMINUS
+    def add_precedence(self, associativity, names):
+        if associativity not in (LEFT, RIGHT, NONASSOC):
+            raise ValueError(f"Error: asociatividad {associativity} inválida")
+
+        level = len(set(level for level, _ in self.precedence.values())) + 1
+        for name in names:
+            self.precedence[name] = (level, associativity)
+        return self
+
+    # Fija la precedencia de una producción "E := - E" con la
+    # de un nombre declarado, como %prec en yacc
+    def set_production_precedence(self, production, name):
+        if name not in self.precedence:
+            raise ValueError(f"Error: {name} no tiene precedencia declarada")
+
+        lhs, rhs = production.split(' := ')
+        self.production_precedence[(lhs.strip(), tuple(rhs.split()))] = name
+        return self
+
+    # Precedencia (nivel, asociatividad) de una producción o None
+    # Es la indicada con set_production_precedence o la del último
+    # terminal de su lado derecho con precedencia
+    def get_production_precedence(self, production):
+        name = self.production_precedence.get((production.lhs.name, tuple(symbol.name for symbol in production.rhs)))
+        if name is not None:
+            return self.precedence[name]
+
+        for symbol in reversed(production.rhs):
+            if symbol.is_terminal and symbol.name in self.precedence:
+                return self.precedence[symbol.name]
+        return None
+
+    # Guarda una reducción en la tabla
+    # Si la casilla tiene un shift y ambos tienen precedencia
+    # se resuelve el conflicto como en yacc
+    # - Gana la de mayor nivel
+    # - En el mismo nivel left reduce, right hace shift y nonassoc
+    #   deja la casilla vacía
+    # Sin precedencia se registra el conflicto y, como en yacc, se
+    # queda el shift
+    # Si la casilla tiene otra reducción se registra el conflicto y,
+    # como en yacc, se queda la producción declarada primero
+    def set_reduce_action(self, table, state_id, terminal_id, production, production_precedence):
+        action = encode_action(REDUCE, production.id)
+        current = table.get_action(state_id, terminal_id)
+        terminal_precedence = self.precedence.get(self.symbols_by_id[terminal_id].name)
+
+        if current & ACTION_MASK == REDUCE:
+            table.set_action(state_id, terminal_id, action)
+            if current >> ACTION_BITS < production.id:
+                table.replace_action(state_id, terminal_id, current)
+            return
+
+        if current & ACTION_MASK != SHIFT:
+            table.set_action(state_id, terminal_id, action)
+            return
+
+        if production_precedence is None or terminal_precedence is None:
+            table.set_action(state_id, terminal_id, action)
+            table.replace_action(state_id, terminal_id, current)
+            return
+
+        production_level, _ = production_precedence
+        terminal_level, associativity = terminal_precedence
+
+        if production_level > terminal_level or (production_level == terminal_level and associativity == LEFT):
+            table.replace_action(state_id, terminal_id, action)
+        elif production_level == terminal_level and associativity == NONASSOC:
+            table.replace_action(state_id, terminal_id, ERROR)
+
+    # Bitset de los terminales con los que se reduce un item
+    # E := aR. en un estado, en SLR es FOLLOW(E)
+    def get_reduce_lookahead(self, state, item):
+        return self.analyze().follow_bits[item.production.lhs.id]
     
     def construct_slr_table(self, lr0_automaton: AutomatonLR0):
         # Guardamos la gramática original para utilizarla
         # en el archivo de la salida
-        grammar = copy.deepcopy(self)
+        grammar = str(self)
 
         # Calculamos FOLLOW y FIRST de cada símbolo
         self.get_first_set()
         self.get_follow_set()
+        analysis = self.analyze()
 
-        # Creamos la tabla como un diccionario
-        table = {}
-
-        symbols = self.terminal_symbols + self.non_terminal_symbols
-
-        # Construimos la tabla SLR vacía
-        for state in lr0_automaton.states:
-            table[state.id] = {}
+        # Creamos las tablas ACTION y GOTO vacías
+        # indexadas por estado e id de símbolo
+        table = ParseTable(
+            len(lr0_automaton.states),
+            self.get_num_terminals(),
+            len(self.symbols_by_id) - self.first_non_terminal_id,
+            self.first_non_terminal_id
+        )
 
-            for symbol in symbols:
-                # Ignoramos S' pues siempre
-                # comenzamos en el estado 0
-                if symbol.name != self.start_symbol.name:
-                    table[state.id][symbol.name] = {}
+        # Enumeramos las producciones 
+        productions_num = {}
+        for production in self.productions:
+            productions_num["r" + str(production.id)] = production
+        self.enum_productions = productions_num
+        table.set_productions(self.productions, self.epsilon_symbol)
 
         # Llenamos la tabla
 
         # Obtenemos los estados que tienen producciones
         # con el punto al final, E := EdR.
         dot_end_states = lr0_automaton.find_dot_end_states()
-
-        # Enumeramos las producciones 
-        productions_num = {}
-        p_num = 0
-        for production in self.productions:
-            productions_num["r" + str(p_num)] = production
-            p_num += 1
-        self.enum_productions = productions_num
         
         # Iteramos sobre todos los estados
         for state in lr0_automaton.states:
             # Iteramos sobre las transiciones del estado
             # GOTO(S_i,symbol) -> S_j 
             for symbol,to_state in state.transitions.items():
-                symbol_grammar = self.find_in_simbols(symbol.name)
-                if symbol_grammar.is_terminal:
-                    table[state.id][symbol.name] = "s" + str(to_state)
+                if symbol.is_terminal:
+                    table.set_action(state.id, symbol.id, encode_action(SHIFT, to_state))
                     continue
-                table[state.id][symbol.name] = "g" + str(to_state)
+                table.set_goto(state.id, symbol.id, to_state)
             
             # Verificamos si el estado contiene producciones
             # E -> EdR.
@@ -130,33 +297,40 @@ class GrammarSLR(Grammar):
                 # cumplen la condición
                 items = dot_end_states[state.id]
                 for item in items:
-                    # Buscamos la producción dentro de la 
-                    # gramática original enumerada
-                    for num,production in productions_num.items():
-                        if production.is_equal(item.production):
-                            # Obtenemos el follow del símbolo
-                            # izquierdo de la producción
-                            follow = self.follow_sets[production.lhs]
-
-                            # Rellenamos en la tabla con el follow y
-                            # la reducción
-                            for symbol in follow:
-                                
-                                # Ubicamos la casilla de aceptación
-                                if state.is_final and symbol.name == "$":
-                                    table[state.id][symbol.name] = "a"
-                                    continue
-                                
-                                # Rellenamos con la fila con la reducción
-                                table[state.id][symbol.name] = num
+                    # El item conoce el número de su producción
+                    production = item.production
+                    production_precedence = self.get_production_precedence(production)
+
+                    # Obtenemos los terminales de la reducción,
+                    # el follow del símbolo izquierdo de la producción
+                    follow = self.get_reduce_lookahead(state, item)
+
+                    # Rellenamos en la tabla con el follow y
+                    # la reducción
+                    for terminal_id in iterate_bits(follow):
+                        
+                        # Ubicamos la casilla de aceptación
+                        if state.is_final and terminal_id == self.eof_symbol.id:
+                            table.set_action(state.id, terminal_id, encode_action(ACCEPT))
+                            continue
+                        
+                        # Rellenamos con la fila con la reducción
+                        # resolviendo shift/reduce con las precedencias
+                        self.set_reduce_action(table, state.id, terminal_id, production, production_precedence)
+
         # Guardamos los resultados en un
         # archivo para poder leer mejor
-        file_name = 'slr_results.txt'
+        file_name = self.results_file
+
+        # Columnas de la tabla legible
+        # Ignoramos S' pues siempre comenzamos en el estado 0
+        # y epsilon pues no tiene transiciones
+        non_terminals = [symbol for symbol in self.non_terminal_symbols if symbol != self.start_symbol and symbol != self.epsilon_symbol]
 
         with open(file_name, 'w', encoding='utf-8') as file:
             file.write('Gramatica')
             file.write("\n" + "\n")
-            file.write(str(grammar))
+            file.write(grammar)
             file.write("\n" + "\n")
             file.write('Conjuntos FIRST')
             file.write("\n")
@@ -168,160 +342,283 @@ class GrammarSLR(Grammar):
             file.write("\n" + "\n")
             file.write('Tabla LL(1)')
             file.write("\n")    
-            for symbol, sub_table in table.items():
-                file.write(f"{symbol}: {sub_table}")
+            for state in lr0_automaton.states:
+                sub_table = table.get_readable_row(state.id, self.terminal_symbols, non_terminals)
+                file.write(f"{state.id}: {sub_table}")
                 file.write("\n")
 
         return table
 
-    def parse_slr_string(self, input, table):
+    # Obtiene la tabla SLR de la cache si ya fue construida
+    # para esta gramática, si no construye el autómata LR(0)
+    # y la tabla y las guarda en la cache
+    def load_or_build_slr_table(self, cache_dir=DEFAULT_CACHE_DIR):
+        return self.load_or_build_table('slr', lambda: self.construct_slr_table(AutomatonLR0(self)), cache_dir)
+
+    # Obtiene la tabla de un motor LR de la cache o la construye
+    # con build y la guarda, build no recibe argumentos y construye
+    # su propio autómata, solo se llama si la tabla no está en la cache
+    def load_or_build_table(self, engine, build, cache_dir=DEFAULT_CACHE_DIR):
+        fingerprint = get_grammar_fingerprint(self, engine)
+        path = get_cache_path(cache_dir, engine, fingerprint)
+
+        cached = load_tables(path, fingerprint)
+        if cached is not None:
+            meta, arrays = cached
+            table = ParseTable.from_cache_data(arrays, meta['values'])
+            self.enum_productions = {"r" + str(production.id): production for production in self.productions}
+            return table
+
+        table = build()
+        arrays, values = table.get_cache_data()
+        save_tables(path, fingerprint, engine, self, arrays, values)
+        return table
+
+    # Quita de la tabla las reducciones de producciones unitarias como
+    # E := T y F := n, los parsers pasan directo al estado del GOTO final
+    # Las producciones con acción en actions se siguen reduciendo para
+    # conservar su resultado, las demás pasan el valor sin cambios
+    # Los árboles construidos con esta tabla no tienen esos nodos
+    # Regresa una tabla nueva y el número de transiciones cambiadas
+    def eliminate_unit_reductions(self, table: ParseTable, actions: SemanticActions | None = None):
+        keep = set()
+        if actions is not None:
+            keep = {production_id for production_id, action in enumerate(actions.get_dispatch(self)) if action is not default_action}
+        return table.bypass_unit_reductions(keep)
+
+    # Crea un parser SLR que recibe los tokens por partes
+    # con feed o de un iterador con parse
+    # actions es un SemanticActions opcional para evaluar mientras se parsea
+    def get_slr_parser(self, table: ParseTable | CompressedParseTable, trace: ParseTrace | None = None, build_tree=False, actions: SemanticActions | None = None):
+        return SLRStreamParser(self, table, trace, build_tree, actions)
+
+    # Crea un parser GLR que sigue todas las acciones de las casillas
+    # con conflictos y regresa el bosque de todas las derivaciones
+    def get_glr_parser(self, table: ParseTable | CompressedParseTable):
+        return GLRParser(self, table)
+
+    # Convierte los pasos registrados de un parsing SLR en filas
+    # Cada paso es la tupla (estado, id de terminal, acción)
+    # Si el registro está completo se reconstruyen las pilas de estados
+    # y símbolos, si no solo se muestra cada paso
+    def get_slr_trace_rows(self, trace: ParseTrace):
+        symbols_by_id = self.symbols_by_id
+
+        if not trace.is_complete():
+            return [[str(state), symbols_by_id[terminal_id].name, format_trace_action(action)] for state, terminal_id, action in trace.steps]
+
+        production_len = [sum(1 for symbol in production.rhs if symbol != self.epsilon_symbol) for production in self.productions]
+        eof_id = self.eof_symbol.id
+        states = []
+        stack = []
+        rows = []
+        # El estado del primer paso y del paso siguiente a un reduce
+        # no está en la pila, es el inicial o el del GOTO
+        push_state = True
+
+        for state, terminal_id, action in trace.steps:
+            if push_state:
+                states.append(state)
+                push_state = False
+
+            rows.append([' '.join(str(state) for state in states), ' '.join(symbol.name for symbol in stack), symbols_by_id[terminal_id].name, format_trace_action(action)])
+
+            kind = action & ACTION_MASK
+            target = action >> ACTION_BITS
+
+            if kind == SHIFT:
+                states.append(target)
+                if terminal_id != eof_id:
+                    stack.append(symbols_by_id[terminal_id])
+
+            elif kind == REDUCE:
+                r_num = production_len[target]
+                if r_num:
+                    del states[-r_num:]
+                    del stack[-r_num:]
+                stack.append(self.productions[target].lhs)
+                push_state = True
+
+        return rows
+
+    # Encabezado de las filas de los pasos registrados
+    def get_slr_trace_header(self, trace: ParseTrace):
+        if trace.is_complete():
+            return ['Estados', 'Stack', 'Current Symbol', 'Action']
+        return ['Estado', 'Current Symbol', 'Action']
+
+    # Abre un archivo para escribir los pasos de muchos documentos
+    # trace_format es 'csv' o 'binary'
+    # El formato binario guarda la huella de la gramática para
+    # verificarla al leerlo, por eso la tabla ya debe estar construida
+    def open_slr_trace_sink(self, file_name, trace_format='csv'):
+        if trace_format == 'csv':
+            return CsvTraceSink(file_name, self.get_slr_trace_header, self.get_slr_trace_rows)
+        if trace_format == 'binary':
+            return BinaryTraceSink(file_name, get_grammar_fingerprint(self, 'slr'))
+        raise ValueError(f"Error: formato de pasos {trace_format} inválido")
+
+    # Parsea una lista de símbolos terminales
+    # trace indica qué pasos se registran, sin trace no se registra nada
+    # Si build_tree es verdadero regresa el árbol de sintaxis concreta
+    def parse_slr_string(self, input, table: ParseTable | CompressedParseTable, trace: ParseTrace | None = None, build_tree=False):
         # Agregamos $ al final del input
         input.append(self.find_in_simbols('$'))
+        eof_id = self.eof_symbol.id
+
+        # Consultas a las tablas de enteros
+        # La tabla puede ser densa o comprimida
+        get_action = table.get_action
+        get_goto = table.get_goto
+        production_len = table.production_len
+        production_lhs = table.production_lhs
+
+        # Registro de los pasos, None si está apagado
+        record = None
+        if trace is not None:
+            trace.start()
+            record = trace.get_recorder()
 
         # Stack para estados
         # Comenzamos en el estado inicial
-        states = deque()
-        states.append(0)
+        states = [0]
         # Stack de símbolos
-        stack = deque()
-        # Stack de acciones
-        parsing_steps = []
+        stack = []
+        # Árbol y pila de nodos paralela al stack de símbolos
+        tree = ParseTree(self.symbols_by_id) if build_tree else None
+        nodes = []
 
         # Consumimos un símbolo
-        for curr_symbol in input:
+        for position, curr_symbol in enumerate(input):
+            terminal_id = curr_symbol.id
 
             # Operamos hasta que podamos pasar
             # al siguiente punto
             while True:
                 last_state = states[-1]
-                action = table.get(last_state, {}).get(curr_symbol.name)
+                action = get_action(last_state, terminal_id)
 
-                # Para guardar en archivo
-                stack_representation = ' '.join([sym.name for sym in stack])
-                states_representation = ' '.join([str(state) for state in states])
-                parsing_steps.append([states_representation, stack_representation, curr_symbol.name, action])
+                if record is not None:
+                    record((last_state, terminal_id, action))
 
-                # Si no encontramos una acción el parsing falló
-                if action == {}:                    
-                    raise SyntaxError(f"Parsing incorrrecto: Input = {input} no existe la producción para {curr_symbol.name} con el estado {last_state}")
-
-                # a -> accepts
-                if action[0] == "a":
-                    break
-                
-                # g -> goto
-                elif action[0] == "g":
-                    # Agregamos el estado al stack de estados
-                    state_id = int(action[1:])
-                    states.append(state_id)
-                    continue
+                kind = action & ACTION_MASK
 
                 # s -> shift
-                elif action[0] == "s":
+                if kind == SHIFT:
+                    # Agregamos el estado al stack de estados
+                    states.append(action >> ACTION_BITS)
 
                     # Verificamos si vemos el símbolo de $ antes de un shift
                     # y lo dejamos en el input para poder seguir transitando
-                    if curr_symbol.name == "$":
-                        state_id = int(action[1:])
-                        states.append(state_id)
+                    if terminal_id == eof_id:
                         continue
 
-                    # Agregamos el estado al stack de estados
-                    state_id = int(action[1:])
-                    states.append(state_id)
                     # Agregamos el símbolo al stack de símbolos
                     stack.append(curr_symbol)
+                    if tree is not None:
+                        nodes.append(tree.add_node(terminal_id, position, position + 1))
                     # Continuamos al siguiente símbolo
                     break
 
                 # r -> reduce
-                elif action[0] == "r":
+                elif kind == REDUCE:
                     # Calculamos los elementos a sacar del stack
-                    production = self.enum_productions[action]
-                    r_num = len(production.rhs)
+                    production_id = action >> ACTION_BITS
+                    r_num = production_len[production_id]
 
                     # Eliminamos los elementos necesarios del stack
-                    for _ in range(r_num):
-                        stack.pop()
-                        states.pop()
+                    if r_num:
+                        del stack[-r_num:]
+                        del states[-r_num:]
                     
                     # Agregamos el símbolo al stack de símbolos
-                    stack.append(production.lhs)
+                    lhs_id = production_lhs[production_id]
+                    stack.append(self.symbols_by_id[lhs_id])
 
                     # Verificamos el estado a donde transitar
-                    go_to = table[states[-1]][stack[-1].name]
-                    go_to = int(go_to[1:])
-                    
-                    # Agregamos el estado al stack de estado
-                    states.append(go_to)
-                    continue
-                
-                else:
-                    raise SyntaxError(f"Parsing incorrecto: Input = {input} Acción inválida {action}")
-        
-        # Para guardar en documento
-        stack_representation = ' '.join([sym.name for sym in stack])
-        states_representation = ' '.join([str(state) for state in states])
-        parsing_steps.append([states_representation, stack_representation, curr_symbol.name, action])
-
-        # Guardamos los resultados en un archivo
-        csv_filename = 'parsing_slr_results.csv'
-        
-        with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-            csv_writer = csv.writer(csvfile, delimiter=',', quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerow(['Estados', 'Stack', 'Current Symbol', 'Action'])
-        
-            # Agregar cada paso del proceso de parsing
-            for step in parsing_steps:
-                csv_writer.writerow(step)
+                    # y lo agregamos al stack de estados
+                    states.append(get_goto(states[-1], lhs_id))
 
-        print(f"Parsing correcto: Input = {input} se llegó al estado de aceptación")
+                    if tree is not None:
+                        tree.reduce(nodes, lhs_id, r_num, position)
+                    continue
 
-grammar = GrammarSLR(['+','*','-','/','n', '(', ')'], ['E','T','F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
-# Aumentamos la gramática
-grammar.augment_grammar()
-
-# Procesamos las cadenas a parsear
-strings_to_parse = [
-    "10+12/3",
-    "10+",
-    "3*(2+4)/5",
-    "3*4+"
-]
-
-tokens_to_parse = []
-
-for string in strings_to_parse:
-    # Usamos una regex para parsear enteros y flotantes 
-    # dentro de una cadena de texto
-    pattern = re.compile(r'(\d+(\.\d+)?)|([+\-*/()])')
-    tokens = [match.group() for match in pattern.finditer(string)]
-
-    string_tokens = []
-
-    # Procesamos los tokens y buscamos su símbolo
-    # dentro de la gramática
-    for token in tokens:
-        if token.isdigit():
-            # 10 -> n
-            string_tokens.append(grammar.find_in_simbols('n'))
-        else:
-            string_tokens.append(grammar.find_in_simbols(token))
-    
-    tokens_to_parse.append(string_tokens)
+                # a -> accepts
+                elif kind == ACCEPT:
+                    break
 
-# Creamos el automata LR(0)
-lr0_automaton = AutomatonLR0(grammar)
+                # Si no encontramos una acción el parsing falló
+                else:
+                    raise SyntaxError(f"Parsing incorrrecto: Input = {input} no existe la producción para {curr_symbol.name} con el estado {last_state}")
 
-# Construimos la tabla SLR
-slr_table = grammar.construct_slr_table(lr0_automaton)
+        if trace is not None:
+            trace.finish(True)
 
-"""for row,column in slr_table.items():
-    print(row, column)"""
+        print(f"Parsing correcto: Input = {input} se llegó al estado de aceptación")
 
-# Procesamos las tokens
-for string_tokens in tokens_to_parse:
-    try:
-        grammar.parse_slr_string(string_tokens, slr_table)
-    except Exception as e:
-        print(f"{e}")
\ No newline at end of file
+        if tree is not None:
+            tree.root_id = nodes[-1]
+            return tree
+
+if __name__ == '__main__':
+    grammar = GrammarSLR(['+','*','-','/','n', '(', ')'], ['E','T','F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
+    # Aumentamos la gramática
+    grammar.augment_grammar()
+
+    # Procesamos las cadenas a parsear
+    strings_to_parse = [
+        "10+12/3",
+        "10+",
+        "3*(2+4)/5",
+        "3*4+"
+    ]
+
+    # Los números enteros y flotantes son el terminal n
+    # los demás terminales se reconocen con su nombre
+    grammar.lexer.add_regex('n', r'\d+(\.\d+)?')
+    grammar.lexer.add_ignore(r'\s+')
+
+    tokens_to_parse = []
+
+    for string in strings_to_parse:
+        try:
+            tokens_to_parse.append(grammar.get_symbols_from_string(string))
+        except SyntaxError as e:
+            print(f"{e}")
+
+    # Construimos la tabla SLR
+    # Solo se construye el autómata LR(0) y se escribe slr_results.txt
+    # la primera vez, después se carga la tabla de la cache
+    slr_table = grammar.load_or_build_slr_table()
+
+    """for row,column in slr_table.items():
+        print(row, column)"""
+
+    # Procesamos las tokens
+    # Los pasos de los parsing correctos se guardan en
+    # parsing_slr_results.csv, el archivo se abre una sola vez
+    trace = ParseTrace(TRACE_FULL)
+    with grammar.open_slr_trace_sink('parsing_slr_results.csv') as sink:
+        for num, string_tokens in enumerate(tokens_to_parse):
+            try:
+                grammar.parse_slr_string(string_tokens, slr_table, trace)
+                sink.write(num, trace, True)
+            except Exception as e:
+                print(f"{e}")
+
+    # Evaluamos las expresiones mientras se parsean
+    # Las producciones sin acción regresan el valor de su primer símbolo
+    actions = SemanticActions().add_token_value('n', float)
+    actions.add_action('E := E + T', lambda e, _, t: e + t)
+    actions.add_action('E := E - T', lambda e, _, t: e - t)
+    actions.add_action('T := T * F', lambda t, _, f: t * f)
+    actions.add_action('T := T / F', lambda t, _, f: t / f)
+    actions.add_action('F := ( E )', lambda _, e, __: e)
+
+    parser = grammar.get_slr_parser(slr_table, actions=actions)
+    for string in strings_to_parse:
+        try:
+            parser.parse(grammar.tokenize(string))
+            print(f"{string} = {parser.value}")
+        except SyntaxError as e:
+            print(f"{e}")
@@ -0,0 +1,145 @@
+import sys
+from array import array
+from grammar_SLR import GrammarSLR
+from utils.parse_table import ParseTable
+
+# Bytes por línea de los arreglos en el módulo generado
+BYTES_PER_LINE = 48
+
+# Código del parser generado
+# No depende de Grammar, AutomatonLR0, State ni Item
+PARSER_TEMPLATE = '''# Parser SLR generado con parser_generator.py
+# No editar, volver a generar si cambia la gramática
+import sys
+from array import array
+
+# Tabla de símbolos, el índice es el id del símbolo
+SYMBOLS = {symbols!r}
+
+# Nombre de terminal -> id
+TERMINALS = {terminals!r}
+
+EOF_ID = {eof_id}
+NUM_TERMINALS = {num_terminals}
+NUM_NON_TERMINALS = {num_non_terminals}
+FIRST_NON_TERMINAL_ID = {first_non_terminal_id}
+
+# Tipos de acción en los 2 bits bajos de cada casilla
+SHIFT = 1
+REDUCE = 2
+ACCEPT = 3
+
+def _unpack(data):
+    values = array('i')
+    values.frombytes(data)
+    if sys.byteorder != {byteorder!r}:
+        values.byteswap()
+    return values
+
+# Tabla ACTION [estado][id de terminal]
+ACTION = _unpack(
+{action}
+)
+
+# Tabla GOTO [estado][id de no terminal - FIRST_NON_TERMINAL_ID]
+GOTO = _unpack(
+{goto}
+)
+
+# Longitud del lado derecho e id del lado izquierdo de cada producción
+PRODUCTION_LEN = {production_len!r}
+PRODUCTION_LHS = {production_lhs!r}
+
+# Parsea una secuencia de ids de terminales sin incluir $
+# Regresa True si la cadena pertenece al lenguaje
+# o lanza SyntaxError con la posición del error
+def parse(tokens):
+    action = ACTION
+    goto = GOTO
+    production_len = PRODUCTION_LEN
+    production_lhs = PRODUCTION_LHS
+    num_terminals = NUM_TERMINALS
+    num_non_terminals = NUM_NON_TERMINALS
+    first_non_terminal_id = FIRST_NON_TERMINAL_ID
+
+    states = [0]
+    position = 0
+    tokens = iter(tokens)
+
+    while True:
+        token = next(tokens, EOF_ID)
+
+        while True:
+            state = states[-1]
+            current = action[state * num_terminals + token]
+            kind = current & 3
+
+            if kind == SHIFT:
+                states.append(current >> 2)
+                if token == EOF_ID:
+                    continue
+                break
+
+            elif kind == REDUCE:
+                production_id = current >> 2
+                r_num = production_len[production_id]
+                if r_num:
+                    del states[-r_num:]
+                states.append(goto[states[-1] * num_non_terminals + production_lhs[production_id] - first_non_terminal_id])
+
+            elif kind == ACCEPT:
+                return True
+
+            else:
+                raise SyntaxError(f"Parsing incorrecto: no existe la producción para {{SYMBOLS[token]}} con el estado {{state}} en la posición {{position}}")
+
+        position += 1
+
+# Parsea una secuencia de nombres de terminales
+def parse_names(names):
+    return parse(TERMINALS[name] for name in names)
+'''
+
+# Convierte un arreglo de enteros en una literal de bytes
+# partida en varias líneas
+def format_bytes(values):
+    data = array('i', values).tobytes()
+    lines = []
+
+    for start in range(0, len(data), BYTES_PER_LINE):
+        lines.append('    ' + repr(data[start:start + BYTES_PER_LINE]))
+
+    return '\n'.join(lines) if lines else "    b''"
+
+# Genera el código de un módulo independiente con la tabla SLR
+def generate_slr_parser(grammar: GrammarSLR, table: ParseTable):
+    return PARSER_TEMPLATE.format(
+        symbols=tuple(symbol.name for symbol in grammar.symbols_by_id),
+        terminals={symbol.name: symbol.id for symbol in grammar.terminal_symbols},
+        eof_id=grammar.eof_symbol.id,
+        num_terminals=table.num_terminals,
+        num_non_terminals=table.num_non_terminals,
+        first_non_terminal_id=table.first_non_terminal_id,
+        byteorder=sys.byteorder,
+        action=format_bytes(table.action),
+        goto=format_bytes(table.goto),
+        production_len=tuple(table.production_len),
+        production_lhs=tuple(table.production_lhs),
+    )
+
+# Escribe el módulo generado en un archivo
+def write_slr_parser(grammar: GrammarSLR, table: ParseTable, file_name):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        file.write(generate_slr_parser(grammar, table))
+
+if __name__ == '__main__':
+    # Uso: python parser_generator.py [archivo de salida]
+    file_name = sys.argv[1] if len(sys.argv) > 1 else 'slr_parser_generated.py'
+
+    grammar = GrammarSLR(['+','*','-','/','n', '(', ')'], ['E','T','F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
+    grammar.augment_grammar()
+
+    table = grammar.load_or_build_slr_table()
+    write_slr_parser(grammar, table, file_name)
+
+    print(f"Parser generado en {file_name}")
@@ -0,0 +1,183 @@
+from utils.parse_table import SHIFT, REDUCE, ACCEPT, ACTION_BITS, ACTION_MASK
+from utils.parse_tree import ParseTree
+
+
+class SLRStreamParser:
+    # Parser SLR que conserva su estado entre llamadas
+    # - Modo push: se llama feed(token) o feed_many(tokens) conforme
+    #   llegan los tokens y al final finish()
+    # - Modo pull: parse(tokens) consume cualquier iterador, por
+    #   ejemplo el generador del analizador léxico
+    # Solo guarda la pila de estados, los tokens no se guardan
+    #
+    # Un token puede ser un Symbol, el id de un terminal o la tupla
+    # (id de terminal, posición, lexema) del analizador léxico
+    # table puede ser la tabla densa o la comprimida
+    # trace es opcional y registra las tuplas
+    # (estado, id de terminal, acción)
+    # Si build_tree es verdadero se construye el árbol de sintaxis
+    # concreta en self.tree a partir de los shift y reduce
+    # actions es un SemanticActions opcional, cada reduce llama a la
+    # acción de su producción con los valores de su lado derecho y el
+    # resultado queda en self.value
+    def __init__(self, grammar, table, trace=None, build_tree=False, actions=None):
+        self.grammar = grammar
+        self.trace = trace
+        self.build_tree = build_tree
+        self.eof_id = grammar.eof_symbol.id
+
+        # Consultas a las tablas de enteros
+        self.get_action = table.get_action
+        self.get_goto = table.get_goto
+        self.production_len = table.production_len
+        self.production_lhs = table.production_lhs
+
+        # Acciones indexadas por id de producción
+        self.dispatch = None
+        if actions is not None:
+            self.dispatch = actions.get_dispatch(grammar)
+            self.token_converters = actions.get_token_converters(grammar)
+
+        self.reset()
+
+    # Regresa el parser al estado inicial para otra cadena
+    def reset(self):
+        # Comenzamos en el estado inicial
+        self.states = [0]
+        # Número de tokens consumidos
+        self.position = 0
+        self.accepted = False
+        # Pila de valores paralela a la pila de estados
+        # y valor del símbolo inicial
+        self.values = []
+        self.value = None
+
+        # Árbol y pila de nodos paralela a la pila de estados
+        self.tree = ParseTree(self.grammar.symbols_by_id) if self.build_tree else None
+        self.nodes = []
+
+        if self.trace is not None:
+            self.trace.start()
+
+    # Obtiene el id de terminal de un token
+    def get_token_id(self, token):
+        if isinstance(token, int):
+            return token
+        if isinstance(token, tuple):
+            return token[0]
+        return token.id
+
+    # Obtiene el valor de un token para las acciones
+    # Es el lexema convertido con la función de su terminal,
+    # los tokens sin texto usan el nombre del terminal
+    def get_token_value(self, token, token_id):
+        if isinstance(token, tuple):
+            value = token[2]
+        else:
+            value = self.grammar.symbols_by_id[token_id].name
+
+        convert = self.token_converters[token_id]
+        return convert(value) if convert is not None else value
+
+    # Consume un token
+    def feed(self, token):
+        self.feed_many((token,))
+
+    # Consume una secuencia de tokens
+    # Si llega $ se termina el parsing
+    def feed_many(self, tokens):
+        if self.accepted:
+            raise SyntaxError("Error: el parser ya llegó al estado de aceptación")
+
+        states = self.states
+        get_action = self.get_action
+        get_goto = self.get_goto
+        get_token_id = self.get_token_id
+        production_len = self.production_len
+        production_lhs = self.production_lhs
+        eof_id = self.eof_id
+        # Registro de los pasos, None si está apagado
+        record = self.trace.get_recorder() if self.trace is not None else None
+        tree = self.tree
+        nodes = self.nodes
+        dispatch = self.dispatch
+        values = self.values
+
+        for token in tokens:
+            token_id = get_token_id(token)
+
+            # Operamos hasta que podamos pasar
+            # al siguiente token
+            while True:
+                action = get_action(states[-1], token_id)
+                kind = action & ACTION_MASK
+
+                if record is not None:
+                    record((states[-1], token_id, action))
+
+                # s -> shift
+                if kind == SHIFT:
+                    states.append(action >> ACTION_BITS)
+
+                    # Dejamos $ en la entrada para poder seguir transitando
+                    if token_id == eof_id:
+                        continue
+
+                    if tree is not None:
+                        nodes.append(tree.add_node(token_id, self.position, self.position + 1))
+                    if dispatch is not None:
+                        values.append(self.get_token_value(token, token_id))
+                    break
+
+                # r -> reduce
+                elif kind == REDUCE:
+                    production_id = action >> ACTION_BITS
+                    r_num = production_len[production_id]
+
+                    if r_num:
+                        del states[-r_num:]
+
+                    states.append(get_goto(states[-1], production_lhs[production_id]))
+
+                    if tree is not None:
+                        tree.reduce(nodes, production_lhs[production_id], r_num, self.position)
+
+                    # Aplicamos la acción a los valores del lado derecho
+                    if dispatch is not None:
+                        if r_num:
+                            args = values[-r_num:]
+                            del values[-r_num:]
+                            values.append(dispatch[production_id](*args))
+                        else:
+                            values.append(dispatch[production_id]())
+
+                # a -> accepts
+                elif kind == ACCEPT:
+                    self.accepted = True
+                    if dispatch is not None and values:
+                        self.value = values[-1]
+                    if tree is not None and nodes:
+                        tree.root_id = nodes[-1]
+                    return
+
+                # Si no encontramos una acción el parsing falló
+                else:
+                    raise SyntaxError(f"Parsing incorrrecto: no existe la producción para {self.grammar.symbols_by_id[token_id].name} con el estado {states[-1]} en la posición {self.position}")
+
+            self.position += 1
+
+    # Indica el final de la entrada
+    # Regresa True si la cadena pertenece al lenguaje
+    def finish(self):
+        if not self.accepted:
+            self.feed_many((self.eof_id,))
+
+        if self.trace is not None:
+            self.trace.finish(True)
+        return True
+
+    # Parsea una secuencia completa de tokens desde el estado inicial
+    def parse(self, tokens):
+        self.reset()
+        self.feed_many(tokens)
+        return self.finish()
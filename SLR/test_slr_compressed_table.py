@@ -0,0 +1,95 @@
+import random
+import itertools
+import pytest
+from grammar_SLR import GrammarSLR
+from grammar_LALR import GrammarLALR
+from utils.compressed_table import CompressedTable
+from utils.parse_table import ERROR, REDUCE, ACTION_MASK, NO_GOTO
+
+EXPRESSION_GRAMMAR = (['+', '*', '-', '/', 'n', '(', ')'], ['E', 'T', 'F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
+
+
+# Matriz con filas y columnas repetidas, valores >= 1 y 0 como vacío
+def random_rows(seed):
+    generator = random.Random(seed)
+    num_cols = generator.randint(1, 12)
+    rows = []
+    for _ in range(generator.randint(1, 15)):
+        if rows and generator.random() < 0.3:
+            rows.append(list(generator.choice(rows)))
+            continue
+        rows.append([generator.choice([0, 0, 0, 1, 2, 3]) for _ in range(num_cols)])
+
+    duplicate = generator.randrange(num_cols)
+    for row in rows:
+        row.append(row[duplicate])
+    return rows, num_cols + 1
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_compressed_table_cells(seed):
+    rows, num_cols = random_rows(seed)
+
+    table = CompressedTable(rows, num_cols, 0)
+    for num, row in enumerate(rows):
+        assert [table.get(num, col) for col in range(num_cols)] == row
+
+    # Con valor por defecto solo cambian las casillas vacías
+    table = CompressedTable(rows, num_cols, 0, use_defaults=True, can_default=lambda value: value != 3)
+    for num, row in enumerate(rows):
+        default = table.default[num]
+        assert default == 0 or (default in row and default != 3)
+        for col, value in enumerate(row):
+            assert table.get(num, col) == (value if value != 0 else default)
+
+
+# Las filas repetidas comparten su lugar en el arreglo
+def test_compressed_table_shared_rows():
+    rows = [[1, 0, 2], [0, 3, 0], [1, 0, 2], [0, 3, 0]]
+    table = CompressedTable(rows, 3, 0)
+
+    assert list(table.row_class) == [0, 1, 0, 1]
+    assert table.base[2] == table.base[0] and table.base[3] == table.base[1]
+    assert [[table.get(num, col) for col in range(3)] for num in range(4)] == rows
+
+
+def get_dense_rows(table):
+    action = [list(table.action[state * table.num_terminals:(state + 1) * table.num_terminals]) for state in range(table.num_states)]
+    goto = [list(table.goto[state * table.num_non_terminals:(state + 1) * table.num_non_terminals]) for state in range(table.num_states)]
+    return action, goto
+
+
+def accepts(grammar, table, names):
+    try:
+        grammar.parse_slr_string([grammar.symbols[name] for name in names], table)
+    except SyntaxError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize('grammar_class', [GrammarSLR, GrammarLALR])
+@pytest.mark.parametrize('default_reductions', [False, True])
+def test_compressed_parse_table(grammar_class, default_reductions, build_table):
+    grammar = grammar_class(*EXPRESSION_GRAMMAR)
+    table = build_table(grammar)
+    compressed = table.compress(default_reductions)
+    action, goto = get_dense_rows(table)
+
+    for state in range(table.num_states):
+        default = compressed.action.default[state]
+        assert default == ERROR or (default_reductions and default & ACTION_MASK == REDUCE and default in action[state])
+
+        for terminal_id, value in enumerate(action[state]):
+            # Las casillas vacías toman la reducción por defecto
+            assert compressed.get_action(state, terminal_id) == (value if value != ERROR else default)
+
+        for num, value in enumerate(goto[state]):
+            if value != NO_GOTO:
+                assert compressed.get_goto(state, num + table.first_non_terminal_id) == value
+
+    # La reducción por defecto solo retrasa el error, se aceptan
+    # las mismas cadenas
+    terminals = ['n', '+', '*', '(', ')']
+    for length in range(6):
+        for names in itertools.product(terminals, repeat=length):
+            assert accepts(grammar, compressed, names) == accepts(grammar, table, names), names
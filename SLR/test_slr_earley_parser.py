@@ -0,0 +1,85 @@
+import pytest
+from utils.grammar import Grammar
+
+# Gramáticas donde la cadena de Leo regresa a un par
+# (conjunto, símbolo) que ya se estaba recorriendo
+LEO_CYCLE_GRAMMARS = [
+    (['a', 'b'], ['S', 'A'], 'S', ['S := A S | a', 'A := epsilon | b']),
+    (['a'], ['S', 'B', 'A'], 'S', ['S := B', 'B := A S | a', 'A := epsilon']),
+    (['a'], ['S'], 'S', ['S := S | a']),
+    (['a'], ['S', 'A'], 'S', ['S := A | a', 'A := S']),
+]
+
+
+def get_tokens(grammar, string):
+    return [grammar.symbols[name] for name in string.split()]
+
+
+@pytest.mark.parametrize('grammar_args', LEO_CYCLE_GRAMMARS)
+def test_recognize_leo_cycles(grammar_args):
+    grammar = Grammar(*grammar_args)
+    parser = grammar.get_earley_parser()
+
+    assert parser.recognize(get_tokens(grammar, 'a'))
+    with pytest.raises(SyntaxError):
+        parser.recognize(get_tokens(grammar, 'a a'))
+
+
+# La cadena de Leo no puede pasar por el símbolo inicial en 0,
+# la aceptación también lo espera
+def test_recognize_leo_start_symbol():
+    grammar = Grammar(['a', 'b'], ['S', 'A', 'B'], 'S', ['S := B A | a | epsilon', 'A := b', 'B := S'])
+    parser = grammar.get_earley_parser()
+
+    assert parser.recognize(get_tokens(grammar, 'b b'))
+    assert parser.recognize(get_tokens(grammar, 'a b'))
+    with pytest.raises(SyntaxError):
+        parser.recognize(get_tokens(grammar, 'b a'))
+
+
+# Verifica que cada nodo del árbol use una producción de la gramática
+# y que los intervalos de los hijos cubran el del padre
+def check_tree(grammar, tree, tokens):
+    epsilon_id = grammar.epsilon_symbol.id
+    rules = {}
+    for production in grammar.productions:
+        rules.setdefault(production.lhs.id, set()).add(tuple(symbol.id for symbol in production.rhs if symbol.id != epsilon_id))
+
+    assert tree.start[tree.root_id] == 0
+    assert tree.end[tree.root_id] == len(tokens)
+
+    for _, node in tree.iter_preorder():
+        children = list(node.get_children())
+        if node.is_terminal():
+            assert not children
+            assert tokens[node.start] == node.symbol
+            assert node.end == node.start + 1
+            continue
+
+        assert tuple(child.symbol.id for child in children) in rules[node.symbol.id]
+        position = node.start
+        for child in children:
+            assert child.start == position
+            position = child.end
+        assert position == node.end
+
+
+@pytest.mark.parametrize('grammar_args, string', [
+    ((['a', 'b'], ['S', 'A', 'B'], 'S', ['S := S B B | A | epsilon', 'A := S B b', 'B := b S | a B S | epsilon']), 'b a'),
+    ((['a'], ['S', 'A', 'B'], 'S', ['S := A a | B S | A A A', 'A := S | B S a | epsilon', 'B := A S S | S S']), ''),
+    ((['a'], ['S', 'A', 'B'], 'S', ['S := A a | B S | A A A', 'A := S | B S a | epsilon', 'B := A S S | S S']), 'a a'),
+] + [(grammar_args, 'a') for grammar_args in LEO_CYCLE_GRAMMARS])
+def test_parse_tree(grammar_args, string):
+    grammar = Grammar(*grammar_args)
+    tokens = get_tokens(grammar, string)
+    tree = grammar.get_earley_parser().parse(tokens)
+    check_tree(grammar, tree, tokens)
+
+
+# La recursión derecha usa los items de Leo y el árbol expande sus cadenas
+def test_parse_right_recursion():
+    grammar = Grammar(['a', '+'], ['E'], 'E', ['E := a + E | a'])
+    tokens = get_tokens(grammar, ' '.join(['a +'] * 500 + ['a']))
+    tree = grammar.get_earley_parser().parse(tokens)
+    check_tree(grammar, tree, tokens)
+    assert len(tree) == 2 * len(tokens) - 500
@@ -0,0 +1,93 @@
+import pytest
+from grammar_SLR import GrammarSLR
+from grammar_LALR import GrammarLALR
+
+# Gramáticas con anulables donde un camino de reducción pasa por
+# un nodo de la pila que recibe una arista después
+NULLABLE_CASES = [
+    (['S := B B | b S S', 'B := epsilon | a'], ['b b', 'b', '', 'a', 'b a b', 'b b a a']),
+    (['S := epsilon | A B S', 'A := b a | S | epsilon', 'B := a S | epsilon'], ['a a a a', 'b a', 'a b']),
+    (['S := B A', 'A := epsilon', 'B := A A B | S A S | epsilon'], ['', 'a']),
+    (['S := B A', 'A := B | b S S | epsilon', 'B := epsilon | a B A'], ['b a b', 'a a', 'b b']),
+    (['S := A B | b', 'A := epsilon | a A', 'B := A | b B'], ['', 'a b', 'b b a', 'a a b b']),
+]
+
+
+# Cuenta las derivaciones de los tokens por fuerza bruta
+# Regresa None si hay una cantidad infinita
+def count_derivations(grammar, tokens):
+    epsilon_id = grammar.epsilon_symbol.id
+    rules = {}
+    for production in grammar.productions:
+        rules.setdefault(production.lhs.id, []).append(tuple(symbol.id for symbol in production.rhs if symbol.id != epsilon_id))
+
+    counts = {}
+    visiting = set()
+
+    def count_symbol(symbol_id, start, end):
+        if symbol_id < grammar.first_non_terminal_id:
+            return 1 if end == start + 1 and tokens[start] == symbol_id else 0
+
+        key = (symbol_id, start, end)
+        if key in counts:
+            return counts[key]
+        if key in visiting:
+            raise RecursionError
+        visiting.add(key)
+        counts[key] = sum(count_sequence(rhs, start, end) for rhs in rules[symbol_id])
+        visiting.discard(key)
+        return counts[key]
+
+    def count_sequence(rhs, start, end):
+        if not rhs:
+            return 1 if start == end else 0
+
+        total = 0
+        for middle in range(start, end + 1):
+            rest = count_sequence(rhs[1:], middle, end)
+            if rest:
+                total += rest * count_symbol(rhs[0], start, middle)
+        return total
+
+    try:
+        return count_symbol(grammar.symbols['S'].id, 0, len(tokens))
+    except RecursionError:
+        return None
+
+
+@pytest.mark.parametrize('grammar_class', [GrammarSLR, GrammarLALR])
+@pytest.mark.parametrize('productions, strings', NULLABLE_CASES)
+def test_glr_nullable_grammars(grammar_class, productions, strings, build_table):
+    grammar = grammar_class(['a', 'b'], ['S', 'A', 'B'], 'S', productions)
+    table = build_table(grammar)
+    parser = grammar.get_glr_parser(table)
+    recognizer = grammar.get_earley_parser()
+
+    for string in strings:
+        tokens = [grammar.symbols[name] for name in string.split()]
+
+        try:
+            expected = recognizer.recognize(tokens)
+        except SyntaxError:
+            expected = False
+
+        try:
+            forest = parser.parse(tokens)
+        except SyntaxError:
+            assert not expected, string
+            continue
+
+        assert expected, string
+        count = count_derivations(grammar, [token.id for token in tokens])
+        if count is not None:
+            assert forest.count_trees() == count, string
+
+
+def test_glr_ambiguous_expression(build_table):
+    grammar = GrammarSLR(['+', 'n'], ['E'], 'E', ['E := E + E | n'])
+    table = build_table(grammar)
+    tokens = [grammar.symbols[name] for name in 'n + n + n + n'.split()]
+
+    forest = grammar.get_glr_parser(table).parse(tokens)
+    assert forest.is_ambiguous()
+    assert forest.count_trees() == 5
@@ -0,0 +1,59 @@
+import itertools
+import pytest
+from grammar_SLR import GrammarSLR
+from grammar_LALR import GrammarLALR
+from grammar_LR1 import GrammarLR1
+
+# Gramáticas LALR(1) y los terminales de las cadenas que se prueban
+LALR_GRAMMARS = [
+    ((['+', '*', '-', '/', 'n', '(', ')'], ['E', 'T', 'F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n']), ['n', '+', '*', '(', ')']),
+    ((['=', '*', 'id'], ['S', 'L', 'R'], 'S', ['S := L = R | R', 'L := * R | id', 'R := L']), ['=', '*', 'id']),
+    ((['c', 'd'], ['S', 'C'], 'S', ['S := C C', 'C := c C | d']), ['c', 'd']),
+]
+
+
+def accepts(grammar, table, names):
+    try:
+        grammar.parse_slr_string([grammar.symbols[name] for name in names], table)
+    except SyntaxError:
+        return False
+    return True
+
+
+# La tabla LALR(1) no tiene conflictos y acepta las mismas cadenas
+# que la tabla LR(1), y que la SLR cuando esta no tiene conflictos
+@pytest.mark.parametrize('grammar_args, terminals', LALR_GRAMMARS)
+def test_lalr_accepts_same_strings(grammar_args, terminals, build_table):
+    grammar = GrammarLALR(*grammar_args)
+    table = build_table(grammar)
+    lr1_grammar = GrammarLR1(*grammar_args)
+    lr1_table = build_table(lr1_grammar)
+    slr_grammar = GrammarSLR(*grammar_args)
+    slr_table = build_table(slr_grammar)
+
+    assert not table.conflicts
+    assert not lr1_table.conflicts
+    assert table.num_states == slr_table.num_states
+
+    for length in range(7):
+        for names in itertools.product(terminals, repeat=length):
+            expected = accepts(lr1_grammar, lr1_table, names)
+            assert accepts(grammar, table, names) == expected, names
+            if not slr_table.conflicts:
+                assert accepts(slr_grammar, slr_table, names) == expected, names
+
+
+# = está en FOLLOW(R), SLR tiene un conflicto shift/reduce que
+# LALR(1) no tiene
+def test_lalr_fewer_conflicts_than_slr(build_table):
+    grammar_args = LALR_GRAMMARS[1][0]
+    assert build_table(GrammarSLR(*grammar_args)).conflicts
+    assert not build_table(GrammarLALR(*grammar_args)).conflicts
+
+
+# Gramática LR(1) que no es LALR(1), al unir A := c. y B := c.
+# LALR(1) tiene un conflicto reduce/reduce
+def test_lalr_reduce_reduce_conflict(build_table):
+    grammar_args = (['a', 'b', 'c', 'd', 'e'], ['S', 'A', 'B'], 'S', ['S := a A d | b B d | a B e | b A e', 'A := c', 'B := c'])
+    assert build_table(GrammarLALR(*grammar_args)).conflicts
+    assert not build_table(GrammarLR1(*grammar_args)).conflicts
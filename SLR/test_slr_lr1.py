@@ -0,0 +1,21 @@
+import grammar_SLR
+from grammar_LR1 import GrammarLR1
+
+
+# Sin la tabla en la cache se construye solo el autómata LR(1),
+# la segunda vez se carga sin construir nada
+def test_load_or_build_lr1_table(tmp_path, monkeypatch):
+    def fail(*args):
+        raise AssertionError("no se debe construir")
+    monkeypatch.setattr(grammar_SLR, 'AutomatonLR0', fail)
+
+    grammar = GrammarLR1(['=', '*', 'id'], ['S', 'L', 'R'], 'S', ['S := L = R | R', 'L := * R | id', 'R := L'])
+    grammar.augment_grammar()
+    table = grammar.load_or_build_lr1_table(cache_dir=tmp_path / 'cache')
+
+    monkeypatch.setattr(GrammarLR1, 'construct_lr1_table', fail)
+    cached = grammar.load_or_build_lr1_table(cache_dir=tmp_path / 'cache')
+
+    assert not table.conflicts
+    assert list(cached.action) == list(table.action)
+    assert list(cached.goto) == list(table.goto)
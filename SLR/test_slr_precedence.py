@@ -0,0 +1,93 @@
+import pytest
+from grammar_SLR import GrammarSLR, LEFT, RIGHT, NONASSOC
+from grammar_LALR import GrammarLALR
+from utils.parse_table import SHIFT, REDUCE, ACTION_BITS, ACTION_MASK
+from utils.semantic_actions import SemanticActions
+
+
+def add_number_lexer(grammar):
+    grammar.lexer.add_regex('n', r'\d+')
+    grammar.lexer.add_ignore(r'\s+')
+
+
+def evaluate(grammar, table, actions, string):
+    parser = grammar.get_slr_parser(table, actions=actions)
+    parser.parse(grammar.tokenize(string))
+    return parser.value
+
+
+@pytest.mark.parametrize('grammar_class', [GrammarSLR, GrammarLALR])
+def test_flat_expression_grammar(grammar_class, build_table):
+    grammar = grammar_class(['+', '-', '*', '^', 'n'], ['E'], 'E', ['E := E + E | E - E | E * E | E ^ E | n'])
+    grammar.add_precedence(LEFT, ['+', '-']).add_precedence(LEFT, ['*']).add_precedence(RIGHT, ['^'])
+    table = build_table(grammar)
+    add_number_lexer(grammar)
+
+    assert not table.conflicts
+
+    actions = SemanticActions().add_token_value('n', int)
+    actions.add_action('E := E + E', lambda a, _, b: a + b)
+    actions.add_action('E := E - E', lambda a, _, b: a - b)
+    actions.add_action('E := E * E', lambda a, _, b: a * b)
+    actions.add_action('E := E ^ E', lambda a, _, b: a ** b)
+
+    assert evaluate(grammar, table, actions, '1 + 2 * 3') == 7
+    assert evaluate(grammar, table, actions, '2 * 3 + 1') == 7
+    assert evaluate(grammar, table, actions, '10 - 2 - 3') == 5
+    assert evaluate(grammar, table, actions, '2 ^ 3 ^ 2') == 512
+    assert evaluate(grammar, table, actions, '2 * 3 ^ 2') == 18
+
+
+@pytest.mark.parametrize('grammar_class', [GrammarSLR, GrammarLALR])
+def test_nonassoc_chain(grammar_class, build_table):
+    grammar = grammar_class(['<', '+', 'n'], ['E'], 'E', ['E := E < E | E + E | n'])
+    grammar.add_precedence(NONASSOC, ['<']).add_precedence(LEFT, ['+'])
+    table = build_table(grammar)
+    add_number_lexer(grammar)
+    parser = grammar.get_slr_parser(table)
+
+    assert not table.conflicts
+    parser.parse(grammar.tokenize('1 < 2 + 3'))
+    with pytest.raises(SyntaxError):
+        parser.parse(grammar.tokenize('1 < 2 < 3'))
+
+
+# Dos reducciones en la misma casilla, como en yacc se queda la
+# producción declarada primero y el conflicto se registra
+@pytest.mark.parametrize('productions, kept', [
+    (['S := A | B', 'A := x', 'B := x'], 'A'),
+    (['S := B | A', 'B := x', 'A := x'], 'B'),
+])
+def test_reduce_reduce_keeps_first_production(productions, kept, build_table):
+    grammar = GrammarSLR(['x'], ['S', 'A', 'B'], 'S', productions)
+    grammar.add_precedence(LEFT, ['x'])
+    table = build_table(grammar)
+
+    assert len(table.conflicts) == 1
+    (state, terminal_id), actions = next(iter(table.conflicts.items()))
+    action = table.get_action(state, terminal_id)
+
+    assert action & ACTION_MASK == REDUCE
+    assert len(actions) == 2
+    assert grammar.productions[action >> ACTION_BITS].lhs.name == kept
+
+
+# if-then-else sin precedencias, como en yacc el conflicto se registra
+# y se queda el shift, el else va con el if más cercano
+@pytest.mark.parametrize('grammar_class', [GrammarSLR, GrammarLALR])
+def test_dangling_else_keeps_shift(grammar_class, build_table):
+    grammar = grammar_class(['if', 'else', 'x'], ['S'], 'S', ['S := if S | if S else S | x'])
+    table = build_table(grammar)
+    grammar.lexer.add_ignore(r'\s+')
+
+    assert len(table.conflicts) == 1
+    (state, terminal_id), cell = next(iter(table.conflicts.items()))
+    assert grammar.symbols_by_id[terminal_id].name == 'else'
+    assert sorted(action & ACTION_MASK for action in cell) == [SHIFT, REDUCE]
+    assert table.get_action(state, terminal_id) & ACTION_MASK == SHIFT
+
+    actions = SemanticActions()
+    actions.add_action('S := if S', lambda _, s: ('if', s))
+    actions.add_action('S := if S else S', lambda _, s, __, t: ('if', s, t))
+
+    assert evaluate(grammar, table, actions, 'if if x else x') == ('if', ('if', 'x', 'x'))
@@ -0,0 +1,86 @@
+import itertools
+import pytest
+from grammar_SLR import GrammarSLR
+from grammar_LALR import GrammarLALR
+from grammar_LR1 import GrammarLR1
+from utils.semantic_actions import SemanticActions
+
+EXPRESSION_GRAMMAR = (['+', '*', '-', '/', 'n', '(', ')'], ['E', 'T', 'F'], 'E', ['E := E + T | E - T | T', 'T := T * F | T / F | F', 'F := ( E ) | n'])
+
+
+def accepts(grammar, table, names):
+    try:
+        grammar.parse_slr_string([grammar.symbols[name] for name in names], table)
+    except SyntaxError:
+        return False
+    return True
+
+
+def get_actions():
+    actions = SemanticActions().add_token_value('n', int)
+    actions.add_action('E := E + T', lambda e, _, t: e + t)
+    actions.add_action('E := E - T', lambda e, _, t: e - t)
+    actions.add_action('T := T * F', lambda t, _, f: t * f)
+    actions.add_action('T := T / F', lambda t, _, f: t / f)
+    actions.add_action('F := ( E )', lambda _, e, __: e)
+    return actions
+
+
+def evaluate(grammar, table, actions, string):
+    parser = grammar.get_slr_parser(table, actions=actions)
+    parser.parse(grammar.tokenize(string))
+    return parser.value
+
+
+# La tabla sin reducciones unitarias acepta las mismas cadenas
+@pytest.mark.parametrize('grammar_class', [GrammarSLR, GrammarLALR, GrammarLR1])
+def test_bypass_accepts_same_strings(grammar_class, build_table):
+    grammar = grammar_class(*EXPRESSION_GRAMMAR)
+    table = build_table(grammar)
+    bypassed, changed = grammar.eliminate_unit_reductions(table)
+
+    assert changed > 0
+    terminals = ['n', '+', '*', '(', ')']
+    for length in range(6):
+        for names in itertools.product(terminals, repeat=length):
+            assert accepts(grammar, bypassed, names) == accepts(grammar, table, names), names
+
+
+# Las acciones dan el mismo resultado y las producciones unitarias
+# con acción se siguen reduciendo
+@pytest.mark.parametrize('grammar_class', [GrammarSLR, GrammarLALR, GrammarLR1])
+def test_bypass_keeps_actions(grammar_class, build_table):
+    grammar = grammar_class(*EXPRESSION_GRAMMAR)
+    table = build_table(grammar)
+    grammar.lexer.add_regex('n', r'\d+')
+    grammar.lexer.add_ignore(r'\s+')
+    strings = ['1+2*3-4/5+6*7', '(1+2)*3', '((4))', '8/2/2']
+
+    actions = get_actions()
+    bypassed, _ = grammar.eliminate_unit_reductions(table, actions)
+    for string in strings:
+        assert evaluate(grammar, bypassed, actions, string) == evaluate(grammar, table, actions, string)
+
+    # F := n con acción no se puede saltar
+    calls = []
+    actions = get_actions().add_action('F := n', lambda n: calls.append(n) or n)
+    bypassed, _ = grammar.eliminate_unit_reductions(table, actions)
+    assert evaluate(grammar, bypassed, actions, '1+2*3') == 7
+    assert calls == [1, 2, 3]
+
+
+# El árbol no tiene los nodos de las producciones unitarias
+def test_bypass_tree(build_table):
+    grammar = GrammarSLR(*EXPRESSION_GRAMMAR)
+    table = build_table(grammar)
+    bypassed, _ = grammar.eliminate_unit_reductions(table)
+    tokens = [grammar.symbols[name] for name in 'n + n * n'.split()]
+
+    tree = grammar.parse_slr_string(list(tokens), table, build_tree=True)
+    bypassed_tree = grammar.parse_slr_string(list(tokens), bypassed, build_tree=True)
+
+    names = [node.symbol.name for _, node in tree.iter_preorder()]
+    bypassed_names = [node.symbol.name for _, node in bypassed_tree.iter_preorder()]
+
+    assert names == ['E', 'E', 'T', 'F', 'n', '+', 'T', 'T', 'F', 'n', '*', 'F', 'n']
+    assert bypassed_names == ['E', 'E', 'n', '+', 'T', 'n', '*', 'n']
@@ -1,19 +1,32 @@
 from utils.production import Production
 
 class Item:
-    def __init__(self, production: Production, dot_position=0):
+    # Los items se crean una sola vez por gramática,
+    # evitamos el diccionario de atributos de cada objeto
+    __slots__ = ('production', 'dot_position', 'id')
+
+    def __init__(self, production: Production, dot_position=0, id=None):
         self.production = production
         self.dot_position = dot_position
+        # Identificador entero del item dentro de la gramática
+        self.id = id
 
     def __repr__(self):
         first_part = self.production.rhs[:self.dot_position]
         second_part = self.production.rhs[self.dot_position:]
         return f"{self.production.lhs.name} := {first_part if first_part != [] else ''} . {second_part if second_part != [] else ''}"
 
+    # Un item es el par (producción, punto)
+    def get_key(self):
+        return (self.production.id, self.dot_position)
+
+    def __eq__(self, item):
+        if not isinstance(item, Item):
+            return NotImplemented
+        return self.production.id == item.production.id and self.dot_position == item.dot_position
+
+    def __hash__(self):
+        return hash((self.production.id, self.dot_position))
+
     def is_equal(self, item):
-        if self.production.lhs.name == item.production.lhs.name:
-            if [symbol.name for symbol in self.production.rhs] == [symbol.name for symbol in item.production.rhs]:
-                if self.dot_position == item.dot_position:
-                    return True
-        return False
-        
\ No newline at end of file
+        return self == item
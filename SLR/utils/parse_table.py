@@ -0,0 +1,296 @@
+from array import array
+from utils.compressed_table import CompressedTable
+
+# NumPy es opcional, solo se usa si se pide
+# explícitamente con to_numpy
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Tipos de acción
+# Se guardan en los bits bajos de cada casilla y el resto
+# de los bits guardan el estado o la producción destino
+# s5 -> (5 << 2) | SHIFT
+ERROR = 0
+SHIFT = 1
+REDUCE = 2
+ACCEPT = 3
+
+ACTION_BITS = 2
+ACTION_MASK = (1 << ACTION_BITS) - 1
+
+# Casilla vacía en la tabla GOTO
+NO_GOTO = -1
+
+# Codifica una acción en un solo entero
+def encode_action(kind, target=0):
+    return (target << ACTION_BITS) | kind
+
+# Obtiene el tipo de una acción codificada
+def get_action_kind(action):
+    return action & ACTION_MASK
+
+# Obtiene el estado o producción de una acción codificada
+def get_action_target(action):
+    return action >> ACTION_BITS
+
+# Representación legible de una acción
+# s5, r3, a o {} para las casillas vacías
+def format_action(action):
+    kind = action & ACTION_MASK
+    target = action >> ACTION_BITS
+
+    if kind == SHIFT:
+        return "s" + str(target)
+    if kind == REDUCE:
+        return "r" + str(target)
+    if kind == ACCEPT:
+        return "a"
+    return {}
+
+
+class ParseTable:
+    # Tablas ACTION y GOTO de un parser LR como arreglos de enteros
+    # ACTION se indexa con [estado][id de terminal]
+    # GOTO se indexa con [estado][id de no terminal - primer id de no terminal]
+    def __init__(self, num_states, num_terminals, num_non_terminals, first_non_terminal_id):
+        self.num_states = num_states
+        self.num_terminals = num_terminals
+        self.num_non_terminals = num_non_terminals
+        self.first_non_terminal_id = first_non_terminal_id
+
+        self.action = array('i', [ERROR]) * (num_states * num_terminals)
+        self.goto = array('i', [NO_GOTO]) * (num_states * num_non_terminals)
+
+        # Datos de cada producción para reducir sin consultar la gramática
+        # Longitud del lado derecho sin contar epsilon e id del lado izquierdo
+        self.production_len = array('i')
+        self.production_lhs = array('i')
+
+        # Casillas con más de una acción
+        # (estado, id de terminal) -> acciones en el orden en que se agregaron
+        self.conflicts = {}
+
+    # Registra las producciones de la gramática en el orden de sus ids
+    def set_productions(self, productions, epsilon_symbol):
+        self.production_len = array('i', [sum(1 for symbol in production.rhs if symbol != epsilon_symbol) for production in productions])
+        self.production_lhs = array('i', [production.lhs.id for production in productions])
+
+    def get_action(self, state, terminal_id):
+        return self.action[state * self.num_terminals + terminal_id]
+
+    # Guarda una acción en la tabla ACTION
+    # Si la casilla ya tiene otra acción registramos el conflicto
+    # y se queda la última acción, como en la tabla original
+    def set_action(self, state, terminal_id, action):
+        index = state * self.num_terminals + terminal_id
+        current = self.action[index]
+
+        if current != ERROR and current != action:
+            cell = self.conflicts.setdefault((state, terminal_id), [current])
+            if action not in cell:
+                cell.append(action)
+
+        self.action[index] = action
+
+    # Sustituye la acción de una casilla sin registrar conflicto
+    # Se usa al resolver conflictos con precedencias
+    def replace_action(self, state, terminal_id, action):
+        self.action[state * self.num_terminals + terminal_id] = action
+
+    def get_goto(self, state, non_terminal_id):
+        return self.goto[state * self.num_non_terminals + non_terminal_id - self.first_non_terminal_id]
+
+    def set_goto(self, state, non_terminal_id, to_state):
+        self.goto[state * self.num_non_terminals + non_terminal_id - self.first_non_terminal_id] = to_state
+
+    # Cambia los arreglos por arreglos de NumPy que comparten
+    # la misma memoria
+    def to_numpy(self):
+        if numpy is None:
+            raise ImportError("Error: NumPy no está instalado")
+
+        self.action = numpy.frombuffer(self.action, dtype=numpy.int32)
+        self.goto = numpy.frombuffer(self.goto, dtype=numpy.int32)
+        return self
+
+    # Obtiene una fila de la tabla en forma legible
+    # {nombre de símbolo: acción}
+    def get_readable_row(self, state, terminals, non_terminals):
+        row = {}
+
+        for symbol in terminals:
+            row[symbol.name] = format_action(int(self.get_action(state, symbol.id)))
+
+        for symbol in non_terminals:
+            to_state = int(self.get_goto(state, symbol.id))
+            row[symbol.name] = "g" + str(to_state) if to_state != NO_GOTO else {}
+
+        return row
+
+    # Datos de la tabla para guardarla en la cache
+    # Regresa (arreglos, valores)
+    def get_cache_data(self):
+        arrays = {
+            'action': self.action,
+            'goto': self.goto,
+            'production_len': self.production_len,
+            'production_lhs': self.production_lhs,
+        }
+        values = {
+            'num_states': self.num_states,
+            'num_terminals': self.num_terminals,
+            'num_non_terminals': self.num_non_terminals,
+            'first_non_terminal_id': self.first_non_terminal_id,
+            'conflicts': [[state, terminal_id, actions] for (state, terminal_id), actions in self.conflicts.items()],
+        }
+        return arrays, values
+
+    # Reconstruye la tabla con los datos de la cache
+    # Los arreglos pueden ser vistas de solo lectura sobre el archivo
+    @classmethod
+    def from_cache_data(cls, arrays, values):
+        table = cls(0, values['num_terminals'], values['num_non_terminals'], values['first_non_terminal_id'])
+        table.num_states = values['num_states']
+        table.action = arrays['action']
+        table.goto = arrays['goto']
+        table.production_len = arrays['production_len']
+        table.production_lhs = arrays['production_lhs']
+        table.conflicts = {(state, terminal_id): actions for state, terminal_id, actions in values['conflicts']}
+        return table
+
+    # Copia de la tabla con arreglos propios
+    # Las tablas de la cache pueden ser de solo lectura
+    def copy(self):
+        table = ParseTable(0, self.num_terminals, self.num_non_terminals, self.first_non_terminal_id)
+        table.num_states = self.num_states
+        table.action = array('i', self.action)
+        table.goto = array('i', self.goto)
+        table.production_len = array('i', self.production_len)
+        table.production_lhs = array('i', self.production_lhs)
+        table.conflicts = dict(self.conflicts)
+        return table
+
+    # Producción unitaria que es la única acción de un estado o None
+    # El estado no tiene shift, GOTO ni conflictos y todas sus casillas
+    # son vacías o reducen la misma producción de un símbolo
+    def get_unit_reduction(self, state, keep):
+        production_id = None
+
+        for terminal_id in range(self.num_terminals):
+            action = self.action[state * self.num_terminals + terminal_id]
+            if action == ERROR:
+                continue
+            if action & ACTION_MASK != REDUCE or (state, terminal_id) in self.conflicts:
+                return None
+
+            target = action >> ACTION_BITS
+            if production_id is None:
+                production_id = target
+            elif production_id != target:
+                return None
+
+        if production_id is None or self.production_len[production_id] != 1 or production_id in keep:
+            return None
+
+        offset = state * self.num_non_terminals
+        if any(to_state != NO_GOTO for to_state in self.goto[offset:offset + self.num_non_terminals]):
+            return None
+
+        return production_id
+
+    # Elimina las reducciones de producciones unitarias E := T
+    # Si un shift o GOTO lleva a un estado que solo reduce E := T,
+    # la transición se cambia por GOTO(estado, E), así se evita la
+    # reducción y se siguen las cadenas F -> T -> E hasta el final
+    # Los estados que solo se alcanzaban así quedan sin usar
+    # keep son los ids de producciones que se deben seguir reduciendo,
+    # como las que tienen acción semántica
+    # Regresa una tabla nueva y el número de transiciones cambiadas
+    def bypass_unit_reductions(self, keep=()):
+        table = self.copy()
+        keep = frozenset(keep)
+        unit = [table.get_unit_reduction(state, keep) for state in range(table.num_states)]
+        changed = 0
+
+        # Sigue la cadena de reducciones unitarias desde un estado
+        def resolve(state, to_state):
+            visited = set()
+            while unit[to_state] is not None and to_state not in visited:
+                visited.add(to_state)
+                to_state = table.get_goto(state, table.production_lhs[unit[to_state]])
+            return to_state
+
+        for state in range(table.num_states):
+            for terminal_id in range(table.num_terminals):
+                index = state * table.num_terminals + terminal_id
+                action = table.action[index]
+                if action & ACTION_MASK == SHIFT and (state, terminal_id) not in table.conflicts:
+                    to_state = resolve(state, action >> ACTION_BITS)
+                    if to_state != action >> ACTION_BITS:
+                        table.action[index] = encode_action(SHIFT, to_state)
+                        changed += 1
+
+            for offset in range(table.num_non_terminals):
+                index = state * table.num_non_terminals + offset
+                to_state = table.goto[index]
+                if to_state != NO_GOTO:
+                    new_state = resolve(state, to_state)
+                    if new_state != to_state:
+                        table.goto[index] = new_state
+                        changed += 1
+
+        return table, changed
+
+    # Obtiene la versión comprimida de la tabla
+    def compress(self, default_reductions=True):
+        return CompressedParseTable(self, default_reductions)
+
+    # Memoria usada por los arreglos en bytes
+    def get_size(self):
+        arrays = (self.action, self.goto, self.production_len, self.production_lhs)
+        return sum(len(values) * values.itemsize for values in arrays)
+
+
+class CompressedParseTable:
+    # Tablas ACTION y GOTO comprimidas
+    # - Los terminales con columnas idénticas comparten columna
+    # - Las filas se empalman con desplazamiento por fila
+    # - Cada estado tiene una reducción por defecto que ocupa sus
+    #   casillas vacías, el error se detecta antes del siguiente shift
+    # Tiene la misma interfaz de consulta que ParseTable
+    def __init__(self, table: ParseTable, default_reductions=True):
+        self.num_states = table.num_states
+        self.num_terminals = table.num_terminals
+        self.num_non_terminals = table.num_non_terminals
+        self.first_non_terminal_id = table.first_non_terminal_id
+        self.production_len = table.production_len
+        self.production_lhs = table.production_lhs
+        self.conflicts = table.conflicts
+
+        action_rows = [table.action[state * table.num_terminals:(state + 1) * table.num_terminals] for state in range(table.num_states)]
+        goto_rows = [table.goto[state * table.num_non_terminals:(state + 1) * table.num_non_terminals] for state in range(table.num_states)]
+
+        # Solo las reducciones pueden ser acción por defecto
+        self.action = CompressedTable(
+            action_rows,
+            table.num_terminals,
+            ERROR,
+            use_defaults=default_reductions,
+            can_default=lambda action: action & ACTION_MASK == REDUCE
+        )
+        # GOTO solo se consulta en casillas válidas
+        # así que siempre podemos usar valor por defecto
+        self.goto = CompressedTable(goto_rows, table.num_non_terminals, NO_GOTO, use_defaults=True)
+
+    def get_action(self, state, terminal_id):
+        return self.action.get(state, terminal_id)
+
+    def get_goto(self, state, non_terminal_id):
+        return self.goto.get(state, non_terminal_id - self.first_non_terminal_id)
+
+    # Memoria usada por los arreglos en bytes
+    def get_size(self):
+        arrays = (self.production_len, self.production_lhs)
+        return self.action.get_size() + self.goto.get_size() + sum(len(values) * values.itemsize for values in arrays)
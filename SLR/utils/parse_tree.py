@@ -0,0 +1,191 @@
+from array import array
+
+# Valor de las ligas a nodos que no existen
+NO_NODE = -1
+
+
+class ParseTree:
+    # Árbol de sintaxis concreta guardado en columnas paralelas
+    # Cada nodo es un índice en los arreglos:
+    # - symbol: id del símbolo de la gramática
+    # - first_child: primer hijo o NO_NODE
+    # - next_sibling: siguiente hermano o NO_NODE
+    # - start, end: tokens que cubre el nodo [start, end)
+    # No hay un objeto por nodo, los nodos se recorren con ParseNode
+    def __init__(self, symbols_by_id):
+        self.symbols_by_id = symbols_by_id
+        self.symbol = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.start = array('i')
+        self.end = array('i')
+        self.root_id = NO_NODE
+
+    def __len__(self):
+        return len(self.symbol)
+
+    # Agrega un nodo sin hijos y regresa su id
+    def add_node(self, symbol_id, start=0, end=0):
+        id = len(self.symbol)
+        self.symbol.append(symbol_id)
+        self.first_child.append(NO_NODE)
+        self.next_sibling.append(NO_NODE)
+        self.start.append(start)
+        self.end.append(end)
+        return id
+
+    # Liga los hijos de un nodo en el orden dado
+    def set_children(self, parent, children):
+        next_sibling = self.next_sibling
+        previous = NO_NODE
+
+        for child in children:
+            if previous == NO_NODE:
+                self.first_child[parent] = child
+            else:
+                next_sibling[previous] = child
+            previous = child
+
+    # Reduce en un parser LR: los últimos num_children nodos de la pila
+    # se vuelven hijos de un nuevo nodo que se agrega a la pila
+    # position es el token actual, se usa para las producciones vacías
+    def reduce(self, nodes, symbol_id, num_children, position):
+        if num_children:
+            children = nodes[-num_children:]
+            del nodes[-num_children:]
+            parent = self.add_node(symbol_id, self.start[children[0]], self.end[children[-1]])
+            self.set_children(parent, children)
+        else:
+            parent = self.add_node(symbol_id, position, position)
+
+        nodes.append(parent)
+        return parent
+
+    # Expansión en un parser LL: agrega los hijos de parent con los
+    # símbolos dados y regresa sus ids en orden
+    # Si no hay símbolos el nodo cubre un intervalo vacío en position
+    def expand(self, parent, symbol_ids, position):
+        if not symbol_ids:
+            self.start[parent] = position
+            self.end[parent] = position
+            return []
+
+        children = [self.add_node(symbol_id, position, position) for symbol_id in symbol_ids]
+        self.set_children(parent, children)
+        return children
+
+    # Calcula los tokens que cubre cada nodo interno a partir de sus hijos
+    # Los hijos deben tener ids mayores que su padre, como en los árboles
+    # construidos de arriba hacia abajo
+    # Los nodos sin hijos conservan su intervalo
+    def compute_spans(self):
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        start = self.start
+        end = self.end
+
+        for id in range(len(self.symbol) - 1, -1, -1):
+            child = first_child[id]
+            if child == NO_NODE:
+                continue
+
+            start[id] = start[child]
+            while next_sibling[child] != NO_NODE:
+                child = next_sibling[child]
+            end[id] = end[child]
+
+    # Vista de un nodo
+    def get_node(self, id):
+        return ParseNode(self, id)
+
+    # Vista de la raíz o None si el árbol está vacío
+    def get_root(self):
+        if self.root_id == NO_NODE:
+            return None
+        return ParseNode(self, self.root_id)
+
+    # Recorre los nodos en preorden sin recursión
+    # Regresa tuplas (profundidad, nodo)
+    def iter_preorder(self, id=None):
+        if id is None:
+            id = self.root_id
+        if id == NO_NODE:
+            return
+
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        pending = [(0, id)]
+
+        while pending:
+            depth, id = pending.pop()
+            yield depth, ParseNode(self, id)
+
+            # Agregamos los hijos invertidos para visitarlos en orden
+            children = []
+            child = first_child[id]
+            while child != NO_NODE:
+                children.append(child)
+                child = next_sibling[child]
+            pending.extend((depth + 1, child) for child in reversed(children))
+
+    # Memoria usada por los arreglos en bytes
+    def get_size(self):
+        arrays = (self.symbol, self.first_child, self.next_sibling, self.start, self.end)
+        return sum(len(values) * values.itemsize for values in arrays)
+
+    def __str__(self) -> str:
+        return '\n'.join('  ' * depth + repr(node) for depth, node in self.iter_preorder())
+
+
+class ParseNode:
+    # Vista de un nodo del árbol, solo guarda el árbol y el id
+    # Los datos se leen de las columnas cuando se piden
+    __slots__ = ('tree', 'id')
+
+    def __init__(self, tree, id):
+        self.tree = tree
+        self.id = id
+
+    @property
+    def symbol(self):
+        return self.tree.symbols_by_id[self.tree.symbol[self.id]]
+
+    @property
+    def start(self):
+        return self.tree.start[self.id]
+
+    @property
+    def end(self):
+        return self.tree.end[self.id]
+
+    def is_terminal(self):
+        return self.symbol.is_terminal
+
+    # Primer hijo o None
+    def get_first_child(self):
+        child = self.tree.first_child[self.id]
+        return ParseNode(self.tree, child) if child != NO_NODE else None
+
+    # Siguiente hermano o None
+    def get_next_sibling(self):
+        sibling = self.tree.next_sibling[self.id]
+        return ParseNode(self.tree, sibling) if sibling != NO_NODE else None
+
+    # Genera los hijos en orden
+    def get_children(self):
+        first_child = self.tree.first_child
+        next_sibling = self.tree.next_sibling
+        child = first_child[self.id]
+
+        while child != NO_NODE:
+            yield ParseNode(self.tree, child)
+            child = next_sibling[child]
+
+    def __eq__(self, other):
+        return isinstance(other, ParseNode) and self.tree is other.tree and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"{self.symbol.name}[{self.start}:{self.end}]"
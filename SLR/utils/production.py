@@ -1,7 +1,9 @@
 class Production:
-    def __init__(self, lhs, rhs):
+    def __init__(self, lhs, rhs, id=None):
         self.lhs = lhs
         self.rhs = rhs
+        # Número de la producción dentro de la gramática
+        self.id = id
 
     def is_equal(self, production):
 
@@ -0,0 +1,119 @@
+from array import array
+
+class SPPF:
+    # Bosque de parsing compartido y empacado
+    # Cada nodo de símbolo se identifica por (id de símbolo, inicio, fin)
+    # y se crea una sola vez, así los sub-árboles iguales se comparten
+    # Cada nodo tiene una lista de alternativas empacadas
+    # (id de producción, ids de los hijos), más de una alternativa
+    # indica que esa parte de la entrada es ambigua
+    # Los terminales no tienen alternativas
+    def __init__(self, symbols_by_id):
+        self.symbols_by_id = symbols_by_id
+        self.symbol = array('i')
+        self.start = array('i')
+        self.end = array('i')
+        self.packed = []
+        # (id de símbolo, inicio, fin) -> id de nodo
+        self.index = {}
+        self.root_id = None
+
+    def __len__(self):
+        return len(self.symbol)
+
+    # Obtiene el nodo de un símbolo en un intervalo o lo crea
+    def get_node(self, symbol_id, start, end):
+        key = (symbol_id, start, end)
+        id = self.index.get(key)
+
+        if id is None:
+            id = len(self.symbol)
+            self.symbol.append(symbol_id)
+            self.start.append(start)
+            self.end.append(end)
+            self.packed.append([])
+            self.index[key] = id
+
+        return id
+
+    # Busca el nodo de un símbolo en un intervalo, None si no existe
+    def find_node(self, symbol_id, start, end):
+        return self.index.get((symbol_id, start, end))
+
+    # Agrega una alternativa a un nodo si no la tiene
+    def add_packed(self, id, production_id, children):
+        alternative = (production_id, children)
+        packed = self.packed[id]
+        if alternative not in packed:
+            packed.append(alternative)
+
+    # Indica si algún nodo alcanzable tiene más de una alternativa
+    def is_ambiguous(self):
+        return any(len(self.packed[id]) > 1 for id in self.iter_reachable())
+
+    # Recorre los ids de los nodos alcanzables desde la raíz
+    def iter_reachable(self):
+        if self.root_id is None:
+            return
+
+        seen = {self.root_id}
+        pending = [self.root_id]
+
+        while pending:
+            id = pending.pop()
+            yield id
+
+            for _, children in self.packed[id]:
+                for child in children:
+                    if child not in seen:
+                        seen.add(child)
+                        pending.append(child)
+
+    # Cuenta los árboles de derivación del bosque
+    # Se calcula de las hojas a la raíz sin recursión
+    def count_trees(self):
+        if self.root_id is None:
+            return 0
+
+        counts = {}
+        # Nodos con hijos pendientes, evita ciclos
+        visiting = set()
+        pending = [(self.root_id, False)]
+
+        while pending:
+            id, expanded = pending.pop()
+            if id in counts or (not expanded and id in visiting):
+                continue
+
+            packed = self.packed[id]
+            if not packed:
+                counts[id] = 1
+                continue
+
+            if not expanded:
+                visiting.add(id)
+                pending.append((id, True))
+                pending.extend((child, False) for _, children in packed for child in children if child not in counts)
+                continue
+
+            total = 0
+            for _, children in packed:
+                product = 1
+                for child in children:
+                    # Los ciclos de producciones unitarias no suman árboles
+                    product *= counts.get(child, 0)
+                total += product
+            counts[id] = total
+
+        return counts[self.root_id]
+
+    # Representación legible de un nodo
+    def get_label(self, id):
+        return f"{self.symbols_by_id[self.symbol[id]].name}[{self.start[id]}:{self.end[id]}]"
+
+    def __str__(self) -> str:
+        lines = []
+        for id in sorted(self.iter_reachable()):
+            for production_id, children in self.packed[id]:
+                lines.append(f"{self.get_label(id)} -> r{production_id} {' '.join(self.get_label(child) for child in children)}")
+        return '\n'.join(lines)
@@ -1,8 +1,11 @@
 from utils.canonical_item import Item
 
 class State:
-    def __init__(self, items: set[Item], id: int, is_final=False):
-        self.items = set(items)
+    def __init__(self, items: set[Item], id: int, is_final=False, kernel=None):
+        self.items = frozenset(items)
+        # El estado se identifica por los ids de los items de su kernel
+        # Si no se indica el kernel usamos todos los items
+        self.kernel = frozenset(item.id for item in (self.items if kernel is None else kernel))
         self.transitions = {}
         self.id = id
         self.is_final = is_final
@@ -10,22 +13,34 @@ class State:
     def __repr__(self):
         return f"Estado {self.id}\nEs terminal {self.is_final}\nItems canónicos:\n{self.items}\n Transiciones:\n{self.transitions}\n"
     
+    # Llave para evitar estados duplicados
     def get_items(self):
-        item_strings = sorted([str(item) for item in self.items])
-        return " | ".join(item_strings)
+        return self.kernel
     
     # Devuelve los items con producción
     # E -> EdR.
+    # Incluye los items E -> .epsilon
     def get_dot_end_items(self):
         items = []
 
         for item in self.items:
             rhs = item.production.rhs
-            if len(rhs) == item.dot_position:
+            if len(rhs) == item.dot_position or rhs[item.dot_position].name == 'epsilon':
                 items.append(item)
                 
         return items
 
 
     def contains(self, item):
-        return any(curr_item.is_equal(item) for curr_item in self.items)
\ No newline at end of file
+        return item in self.items
+
+
+class StateLR1(State):
+    # Estado LR(1), cada item tiene un bitset de terminales
+    # lookaheads: id de item -> bitset de ids de terminales
+    def __init__(self, items: set[Item], id: int, lookaheads: dict[int, int], is_final=False, kernel=None):
+        super().__init__(items, id, is_final, kernel)
+        self.lookaheads = lookaheads
+
+    def __repr__(self):
+        return f"Estado {self.id}\nEs terminal {self.is_final}\nItems canónicos:\n{self.items}\nLookaheads:\n{self.lookaheads}\n Transiciones:\n{self.transitions}\n"
@@ -0,0 +1,161 @@
+import hashlib, json, mmap, os, struct, sys
+from array import array
+from utils.production import Production
+
+# Formato del archivo de tablas compiladas
+# - Encabezado: magic, versión, huella de la gramática y tamaño de los metadatos
+# - Metadatos en JSON: motor, símbolos, producciones, dimensiones y
+#   la posición de cada arreglo dentro del archivo
+# - Arreglos de enteros de 32 bits alineados a 8 bytes
+CACHE_MAGIC = b'PTBL'
+CACHE_VERSION = 3
+HEADER_FORMAT = '<4sI32sI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+ALIGNMENT = 8
+
+# Obtiene la huella de la gramática
+# Depende de la tabla de símbolos en el orden de sus ids, del símbolo
+# inicial, de las producciones, de las precedencias y del tipo de parser
+def get_grammar_fingerprint(grammar, engine):
+    content = {
+        'version': CACHE_VERSION,
+        'engine': engine,
+        'symbols': [[symbol.name, symbol.is_terminal] for symbol in grammar.symbols_by_id],
+        'terminals': [symbol.id for symbol in grammar.terminal_symbols],
+        'non_terminals': [symbol.id for symbol in grammar.non_terminal_symbols],
+        'start_symbol': grammar.start_symbol.id,
+        'productions': [[production.lhs.id, [symbol.id for symbol in production.rhs]] for production in grammar.productions],
+    }
+    # Las precedencias cambian la tabla, solo se incluyen si hay
+    # para conservar las huellas de las gramáticas sin precedencias
+    precedence = getattr(grammar, 'precedence', None)
+    if precedence:
+        content['precedence'] = sorted([name, level, associativity] for name, (level, associativity) in precedence.items())
+        content['production_precedence'] = sorted([lhs, list(rhs), name] for (lhs, rhs), name in grammar.production_precedence.items())
+    canonical = json.dumps(content, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).digest()
+
+# Ruta del archivo de tablas de una gramática
+def get_cache_path(cache_dir, engine, fingerprint):
+    return os.path.join(cache_dir, f"{engine}_{fingerprint.hex()[:16]}.tbl")
+
+# Describe los símbolos y producciones de la gramática
+# para poder reconstruirla al cargar las tablas
+def get_grammar_metadata(grammar):
+    return {
+        'symbols': [[symbol.name, symbol.is_terminal] for symbol in grammar.symbols_by_id],
+        'terminals': [symbol.id for symbol in grammar.terminal_symbols],
+        'non_terminals': [symbol.id for symbol in grammar.non_terminal_symbols],
+        'start_symbol': grammar.start_symbol.id,
+        'productions': [[production.lhs.id, [symbol.id for symbol in production.rhs]] for production in grammar.productions],
+    }
+
+# Guarda las tablas en un archivo binario
+# arrays es un diccionario nombre -> arreglo de enteros
+# values es un diccionario con los demás datos, debe poder
+# convertirse a JSON
+def save_tables(path, fingerprint, engine, grammar, arrays, values):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    layout = {}
+    blobs = []
+    offset = 0
+
+    for name, values_array in arrays.items():
+        data = array('i', values_array).tobytes()
+        layout[name] = [offset, len(values_array)]
+        padding = -len(data) % ALIGNMENT
+        blobs.append(data + b'\0' * padding)
+        offset += len(data) + padding
+
+    meta = {
+        'engine': engine,
+        'byteorder': sys.byteorder,
+        'grammar': get_grammar_metadata(grammar),
+        'values': values,
+        'arrays': layout,
+    }
+    meta_bytes = json.dumps(meta, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    meta_bytes += b' ' * (-(HEADER_SIZE + len(meta_bytes)) % ALIGNMENT)
+
+    # Escribimos en un archivo temporal y lo renombramos
+    # para no dejar archivos a medias
+    # El temporal lleva el pid por si varios procesos guardan a la vez
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(struct.pack(HEADER_FORMAT, CACHE_MAGIC, CACHE_VERSION, fingerprint, len(meta_bytes)))
+        file.write(meta_bytes)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temporary_path, path)
+
+# Carga las tablas de un archivo binario
+# Regresa (metadatos, arreglos) o None si el archivo no existe, es de
+# otra versión o pertenece a otra gramática
+# Si es posible los arreglos son vistas de solo lectura sobre el
+# archivo mapeado en memoria
+def load_tables(path, fingerprint):
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            buffer = file.read()
+
+    if len(buffer) < HEADER_SIZE:
+        return None
+
+    magic, version, file_fingerprint, meta_size = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or file_fingerprint != fingerprint:
+        return None
+
+    meta = json.loads(bytes(buffer[HEADER_SIZE:HEADER_SIZE + meta_size]).decode('utf-8'))
+    data_start = HEADER_SIZE + meta_size
+    view = memoryview(buffer)
+
+    arrays = {}
+    for name, (offset, length) in meta['arrays'].items():
+        start = data_start + offset
+        data = view[start:start + length * 4]
+
+        if meta['byteorder'] == sys.byteorder:
+            arrays[name] = data.cast('i')
+        else:
+            # Si el archivo viene de otra arquitectura copiamos
+            values_array = array('i')
+            values_array.frombytes(data)
+            values_array.byteswap()
+            arrays[name] = values_array
+
+    return meta, arrays
+
+# Reemplaza los símbolos y producciones de la gramática por los
+# guardados en los metadatos
+# Útil cuando la construcción de la tabla transforma la gramática,
+# como al eliminar recursión izquierda
+def restore_grammar(grammar, grammar_meta):
+    for name, is_terminal in grammar_meta['symbols']:
+        symbol = grammar.find_in_simbols(name)
+        if symbol is None:
+            grammar.add_symbol(name, is_terminal)
+
+    symbols = [grammar.find_in_simbols(name) for name, _ in grammar_meta['symbols']]
+
+    # Los ids deben coincidir con los de las tablas
+    for id, symbol in enumerate(symbols):
+        if symbol.id != id:
+            raise ValueError(f"Error: el símbolo {symbol.name} no coincide con la tabla guardada")
+
+    grammar.terminal_symbols = [symbols[id] for id in grammar_meta['terminals']]
+    grammar.non_terminal_symbols = [symbols[id] for id in grammar_meta['non_terminals']]
+    grammar.start_symbol = symbols[grammar_meta['start_symbol']]
+    grammar.productions = [
+        Production(symbols[lhs], [symbols[id] for id in rhs])
+        for lhs, rhs in grammar_meta['productions']
+    ]
+    grammar.index_productions()
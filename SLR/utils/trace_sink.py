@@ -0,0 +1,159 @@
+import csv, mmap, struct, sys
+from array import array
+from utils.parse_trace import ParseTrace
+
+# Tamaño del buffer de escritura de los archivos de pasos
+SINK_BUFFER_SIZE = 1 << 20
+
+# Formato binario de los pasos registrados
+# - Encabezado: magic, versión, enteros por paso y huella de la gramática
+# - Pasos de todos los documentos uno tras otro, cada paso son
+#   STEP_FIELDS enteros de 32 bits little endian
+# - Índice con una entrada por documento en el orden en que se
+#   escribieron: primer paso, número de pasos y banderas
+# - Pie: posición del índice, número de documentos y magic del índice
+TRACE_MAGIC = b'PTRC'
+TRACE_INDEX_MAGIC = b'PTRX'
+TRACE_VERSION = 1
+STEP_FIELDS = 3
+HEADER_FORMAT = '<4sII32s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+INDEX_FORMAT = '<QII'
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+FOOTER_FORMAT = '<QQ4s'
+FOOTER_SIZE = struct.calcsize(FOOTER_FORMAT)
+
+# Banderas de cada documento en el índice
+TRACE_ACCEPTED = 1
+TRACE_COMPLETE = 2
+
+
+class TraceSink:
+    # Destino de los pasos registrados de muchos documentos
+    # El archivo se abre una sola vez y las escrituras pasan por un buffer
+    def __init__(self, file):
+        self.file = file
+        self.num_documents = 0
+
+    # Escribe los pasos de un documento
+    def write(self, document_id, trace: ParseTrace, accepted):
+        raise NotImplementedError
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class CsvTraceSink(TraceSink):
+    # Escribe los pasos como filas de texto con el id del documento
+    # en la primera columna
+    # get_header(trace) y get_rows(trace) convierten los pasos en texto
+    # El encabezado se escribe una sola vez
+    def __init__(self, file_name, get_header, get_rows):
+        super().__init__(open(file_name, 'w', buffering=SINK_BUFFER_SIZE, newline='', encoding='utf-8'))
+        self.writer = csv.writer(self.file, delimiter=',', quoting=csv.QUOTE_MINIMAL)
+        self.get_header = get_header
+        self.get_rows = get_rows
+        self.header_written = False
+
+    def write(self, document_id, trace: ParseTrace, accepted):
+        if not self.header_written:
+            self.writer.writerow(['Documento'] + self.get_header(trace))
+            self.header_written = True
+
+        self.writer.writerows([document_id] + row for row in self.get_rows(trace))
+        self.num_documents += 1
+
+
+class BinaryTraceSink(TraceSink):
+    # Escribe los pasos como enteros empacados
+    # fingerprint es la huella de la gramática, el lector la usa para
+    # verificar que los ids correspondan a la misma gramática
+    # Los documentos se identifican por su orden de escritura
+    def __init__(self, file_name, fingerprint):
+        super().__init__(open(file_name, 'wb', buffering=SINK_BUFFER_SIZE))
+        self.file.write(struct.pack(HEADER_FORMAT, TRACE_MAGIC, TRACE_VERSION, STEP_FIELDS, fingerprint))
+        self.num_steps = 0
+
+        # Índice de los documentos, se escribe al cerrar
+        self.first_steps = array('Q')
+        self.step_counts = array('I')
+        self.flags = array('I')
+
+    def write(self, document_id, trace: ParseTrace, accepted):
+        values = array('i')
+        for step in trace.steps:
+            values.extend(step)
+
+        if sys.byteorder != 'little':
+            values.byteswap()
+
+        self.file.write(values.tobytes())
+
+        self.first_steps.append(self.num_steps)
+        self.step_counts.append(len(trace.steps))
+        self.flags.append((TRACE_ACCEPTED if accepted else 0) | (TRACE_COMPLETE if trace.is_complete() else 0))
+        self.num_steps += len(trace.steps)
+        self.num_documents += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+
+        index_offset = HEADER_SIZE + self.num_steps * STEP_FIELDS * 4
+        pack = struct.Struct(INDEX_FORMAT).pack
+
+        for first_step, step_count, flags in zip(self.first_steps, self.step_counts, self.flags):
+            self.file.write(pack(first_step, step_count, flags))
+
+        self.file.write(struct.pack(FOOTER_FORMAT, index_offset, self.num_documents, TRACE_INDEX_MAGIC))
+        super().close()
+
+
+class BinaryTraceReader:
+    # Lee un archivo de pasos en formato binario mapeado en memoria
+    # Solo se decodifican los pasos del documento que se pide
+    def __init__(self, file_name):
+        with open(file_name, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.buffer) < HEADER_SIZE + FOOTER_SIZE:
+            raise ValueError(f"Error: {file_name} no es un archivo de pasos")
+
+        magic, version, self.step_fields, self.fingerprint = struct.unpack_from(HEADER_FORMAT, self.buffer, 0)
+        self.index_offset, self.num_documents, index_magic = struct.unpack_from(FOOTER_FORMAT, self.buffer, len(self.buffer) - FOOTER_SIZE)
+
+        if magic != TRACE_MAGIC or index_magic != TRACE_INDEX_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f"Error: {file_name} no es un archivo de pasos o está incompleto")
+
+    # Regresa (pasos, aceptado, completo) del documento con el número dado
+    def get_document(self, num):
+        if not 0 <= num < self.num_documents:
+            raise IndexError(f"Error: el documento {num} no existe, hay {self.num_documents}")
+
+        first_step, step_count, flags = struct.unpack_from(INDEX_FORMAT, self.buffer, self.index_offset + num * INDEX_SIZE)
+        start = HEADER_SIZE + first_step * self.step_fields * 4
+        end = start + step_count * self.step_fields * 4
+
+        values = array('i')
+        values.frombytes(self.buffer[start:end])
+        if sys.byteorder != 'little':
+            values.byteswap()
+
+        fields = self.step_fields
+        steps = [tuple(values[index:index + fields]) for index in range(0, len(values), fields)]
+        return steps, bool(flags & TRACE_ACCEPTED), bool(flags & TRACE_COMPLETE)
+
+    # Regresa los pasos de un documento como ParseTrace
+    # para convertirlos en texto con la gramática
+    def get_trace(self, num):
+        steps, _, complete = self.get_document(num)
+        return ParseTrace.from_steps(steps, complete)
+
+    def close(self):
+        self.buffer.close()